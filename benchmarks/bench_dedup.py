@@ -0,0 +1,95 @@
+"""Benchmark question deduplication.
+
+Generates a bank of random-word questions, injects exact duplicates (choices
+shuffled, case and punctuation changed) and near duplicates (one prompt word
+replaced), then times ``find_duplicates`` and reports how many injected
+duplicates were found and how many reported groups contain no injected duplicate.
+
+Usage:
+    python -m benchmarks.bench_dedup --sizes 10000,100000 --dup-rate 0.02
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from typing import List, Set, Tuple
+from engine.dedup import find_duplicates
+from game.models import Question
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def make_bank(count: int, dup_rate: float, seed: int = 0) -> Tuple[List[Question], Set[str], Set[str]]:
+    """Build a shuffled bank with injected duplicates.
+
+    Returns:
+        Tuple of (questions, ids of exact duplicates, ids of near duplicates).
+    """
+    rng = random.Random(seed)
+    vocabulary = [_word(rng) for _ in range(5000)]
+    questions = []
+    for i in range(count):
+        prompt = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 14))) + "?"
+        choices = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))) for _ in range(4)]
+        questions.append(Question(f"Q-{i}", "bench", "easy", prompt, choices, 0, ""))
+
+    exact, near = set(), set()
+    for i in range(int(count * dup_rate)):
+        original = questions[rng.randrange(count)]
+        choices = original.choices[:]
+        rng.shuffle(choices)
+        words = original.prompt.split()
+        if i % 2 == 0:
+            prompt = " ".join(words).upper().replace("?", " ?!")
+            exact.add(f"D-{i}")
+        else:
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            prompt = " ".join(words)
+            near.add(f"D-{i}")
+        questions.append(Question(f"D-{i}", "bench", "easy", prompt, choices, 0, ""))
+
+    # Duplicates must be found wherever they land, not just at the end
+    rng.shuffle(questions)
+    return questions, exact, near
+
+
+def run(count: int, dup_rate: float, threshold: float) -> dict:
+    """Time one deduplication pass and score it against the injected duplicates."""
+    questions, exact, near = make_bank(count, dup_rate)
+    start = time.perf_counter()
+    groups = find_duplicates(questions, threshold=threshold)
+    elapsed = time.perf_counter() - start
+
+    # Either copy of a pair may be the one kept, so compare on whole groups
+    found = {q.id for g in groups for q in [g.kept] + g.duplicates}
+    injected = exact | near
+    return {
+        "questions": len(questions),
+        "seconds": round(elapsed, 3),
+        "questions_per_second": round(len(questions) / elapsed, 1),
+        "groups": len(groups),
+        "exact_recall": round(len(exact & found) / max(len(exact), 1), 4),
+        "near_recall": round(len(near & found) / max(len(near), 1), 4),
+        "unexpected_groups": sum(
+            1 for g in groups if not injected & {q.id for q in [g.kept] + g.duplicates}
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated bank sizes")
+    parser.add_argument("--dup-rate", type=float, default=0.02, help="Injected duplicates per question")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Near-duplicate Jaccard threshold")
+    args = parser.parse_args()
+
+    for size in args.sizes.split(","):
+        print(json.dumps(run(int(size), args.dup_rate, args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark memory used by question and result representations.
+
+Builds COUNT synthetic questions and results in each representation and
+reports the memory they retain (via tracemalloc) in bytes per item:
+
+* ``Question`` / ``Result`` - the plain dataclasses.
+* ``CompactQuestion`` - slotted, frozen, interned.
+* ``QuestionTable`` - columnar container for a whole bank.
+
+Usage:
+    python -m benchmarks.bench_memory --count 1000000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from game.models import (
+    Question, Result, QuestionTable,
+    compact_question,
+)
+
+CATEGORIES = ["general", "science", "history", "geography"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def _question_fields(i: int) -> tuple:
+    # Rebuild category/difficulty strings per row, as JSON parsing does
+    return (
+        f"Q-{i:07d}",
+        "".join(CATEGORIES[i % 4]),
+        "".join(DIFFICULTIES[i % 3]),
+        f"What is the answer to synthetic question number {i}?",
+        [f"Choice {i}-A", f"Choice {i}-B", f"Choice {i}-C", f"Choice {i}-D"],
+        i % 4,
+        f"Hint for question {i}",
+    )
+
+
+def _result_fields(i: int) -> tuple:
+    return (
+        f"Player{i % 5000}",
+        float(i % 11),
+        10,
+        i % 7,
+        30.0 + i % 13,
+        "".join(CATEGORIES[i % 4]),
+        f"2025-11-03T12:{i // 60 % 60:02d}:{i % 60:02d}Z",
+        i % 3,
+    )
+
+
+def measure(label: str, build, count: int) -> dict:
+    """Build a container of ``count`` items and report retained memory."""
+    gc.collect()
+    tracemalloc.start()
+    container = build(count)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return {
+        "representation": label,
+        "items": count,
+        "retained_mb": round(current / 2**20, 1),
+        "peak_mb": round(peak / 2**20, 1),
+        "bytes_per_item": round(current / count, 1),
+    }
+
+
+BUILDERS = {
+    "Question": lambda n: [Question(*_question_fields(i)) for i in range(n)],
+    "CompactQuestion": lambda n: [compact_question(*_question_fields(i)) for i in range(n)],
+    "QuestionTable": lambda n: QuestionTable.from_columns(list(zip(*(_question_fields(i) for i in range(n))))),
+    "Result": lambda n: [Result(*_result_fields(i)) for i in range(n)],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="Items per representation")
+    parser.add_argument("--only", default=",".join(BUILDERS), help="Comma-separated representations")
+    args = parser.parse_args()
+
+    for label in args.only.split(","):
+        print(json.dumps(measure(label, BUILDERS[label], args.count)))
+
+
+if __name__ == "__main__":
+    main()
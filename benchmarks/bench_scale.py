@@ -0,0 +1,278 @@
+"""Benchmark the core operations as data grows.
+
+For every size in ``--sizes`` (10^3..10^7 are sensible), a synthetic
+question bank and leaderboard of that many entries are generated in a
+temporary directory, and these operations are timed against them:
+
+* ``load_questions`` - load the whole bank (compiled cache warm).
+* ``select_questions`` - pick 10 easy questions from the loaded bank.
+* ``score_answer`` - score one answer per question in the bank.
+* ``top_n`` - top 10 from the leaderboard (ranking index warm).
+* ``rank_result`` - rank of one result among all stored (index warm).
+* ``format_table`` - format every result as a table.
+* ``save_result`` - durably append one result to the leaderboard.
+
+Each operation reports throughput (items per second), latency percentiles
+per call, and the peak memory allocated by one call (via tracemalloc). The
+report is written as JSON; ``--compare`` diffs two reports and exits with
+status 1 if any operation's median latency regressed past ``--threshold``.
+
+Usage:
+    python -m benchmarks.bench_scale --sizes 1000,100000 --output new.json
+    python -m benchmarks.bench_scale --compare base.json new.json --threshold 0.1
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+import game.io_manager
+import game.leaderboard
+from benchmarks.synthetic import iter_results, write_leaderboard, write_question_bank
+from engine.question_bank import select_questions
+from engine.scoring import score_answer
+from game.io_manager import load_questions, save_result
+from game.leaderboard import format_table, rank_result, rebuild_index, rebuild_views, top_n
+from game.models import result_from_dict
+
+CATEGORY = "synthetic"
+
+
+@contextlib.contextmanager
+def configured(config: dict):
+    """Point the public I/O functions at a benchmark configuration."""
+    saved = game.io_manager.load_config, game.leaderboard.load_config
+    game.io_manager.load_config = game.leaderboard.load_config = lambda: config
+    try:
+        yield
+    finally:
+        game.io_manager.load_config, game.leaderboard.load_config = saved
+
+
+class Workload:
+    """The synthetic data for one size, built lazily and shared by operations."""
+
+    def __init__(self, root: Path, size: int, seed: int):
+        self.size = size
+        self.seed = seed
+        self.config = {
+            "data_folder": root / "data",
+            "leaderboard_path": root / "leaderboard.jsonl",
+        }
+        self.config["data_folder"].mkdir()
+        write_question_bank(self.config["data_folder"], size, CATEGORY, seed)
+        write_leaderboard(self.config["leaderboard_path"], size, seed)
+        self._questions = None
+
+    @property
+    def questions(self):
+        if self._questions is None:
+            self._questions = load_questions(CATEGORY)
+        return self._questions
+
+
+def _load_questions(w: Workload) -> Tuple[Callable, int]:
+    load_questions(CATEGORY)  # compile the cache
+    return (lambda: load_questions(CATEGORY)), w.size
+
+
+def _select_questions(w: Workload) -> Tuple[Callable, int]:
+    questions = w.questions
+    return (lambda: select_questions(questions, 10, "easy")), 1
+
+
+def _score_answer(w: Workload) -> Tuple[Callable, int]:
+    questions = w.questions
+    choices = [i % 4 for i in range(len(questions))]
+
+    def call():
+        for question, choice in zip(questions, choices):
+            score_answer(question, choice)
+    return call, len(questions)
+
+
+def _top_n(w: Workload) -> Tuple[Callable, int]:
+    rebuild_index()  # the workload writes leaderboard.jsonl directly
+    return (lambda: top_n(10)), 1
+
+
+def _rank_result(w: Workload) -> Tuple[Callable, int]:
+    rebuild_index()  # the workload writes leaderboard.jsonl directly
+    records = iter_results(10 ** 9, w.seed + 1)
+    return (lambda: rank_result(result_from_dict(next(records)))), 1
+
+
+def _format_table(w: Workload) -> Tuple[Callable, int]:
+    results = [result_from_dict(record) for record in iter_results(w.size, w.seed)]
+    return (lambda: format_table(results)), len(results)
+
+
+def _save_result(w: Workload) -> Tuple[Callable, int]:
+    # Index the workload's rows and build the views, as a running game would have
+    rebuild_index()
+    rebuild_views()
+    records = iter_results(10 ** 9, w.seed + 1)
+    return (lambda: save_result(result_from_dict(next(records)))), 1
+
+
+OPERATIONS: Dict[str, Callable[[Workload], Tuple[Callable, int]]] = {
+    "load_questions": _load_questions,
+    "select_questions": _select_questions,
+    "score_answer": _score_answer,
+    "top_n": _top_n,
+    "rank_result": _rank_result,
+    "format_table": _format_table,
+    "save_result": _save_result,
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Return the nearest-rank percentile ``q`` (0-100) of sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def measure(name: str, workload: Workload, repeat: int, max_seconds: float, memory: bool) -> dict:
+    """Time one operation against a workload and summarize it."""
+    call, items = OPERATIONS[name](workload)
+
+    samples = []
+    budget_start = time.perf_counter()
+    while len(samples) < repeat:
+        start = time.perf_counter_ns()
+        call()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+        if time.perf_counter() - budget_start > max_seconds:
+            break
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        call()
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        "operation": name,
+        "size": workload.size,
+        "calls": len(samples),
+        "items_per_call": items,
+        "throughput_per_s": round(items / (median / 1000), 1) if median else None,
+        "latency_ms": {
+            "min": round(samples[0], 4),
+            "p50": round(median, 4),
+            "p90": round(percentile(samples, 90), 4),
+            "p99": round(percentile(samples, 99), 4),
+            "max": round(samples[-1], 4),
+            "mean": round(statistics.fmean(samples), 4),
+        },
+        "peak_memory_mb": peak_mb,
+    }
+
+
+def run(sizes: List[int], operations: List[str], repeat: int, max_seconds: float, memory: bool, seed: int) -> dict:
+    """Run every operation at every size and return the report."""
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            workload = Workload(Path(tmp), size, seed)
+            with configured(workload.config):
+                for name in operations:
+                    row = measure(name, workload, repeat, max_seconds, memory)
+                    print(json.dumps(row), file=sys.stderr)
+                    results.append(row)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(base: dict, new: dict, threshold: float) -> List[dict]:
+    """Compare median latencies of the operations two reports share.
+
+    Args:
+        base: Baseline report.
+        new: Report to check.
+        threshold: Allowed relative slowdown, e.g. 0.1 for 10%.
+
+    Returns:
+        One row per shared (operation, size) with the ratio new/base and
+        whether it counts as a regression.
+    """
+    baseline = {(r["operation"], r["size"]): r for r in base["results"]}
+    rows = []
+    for row in new["results"]:
+        old = baseline.get((row["operation"], row["size"]))
+        if old is None:
+            continue
+        before, after = old["latency_ms"]["p50"], row["latency_ms"]["p50"]
+        ratio = after / before if before else float("inf") if after else 1.0
+        rows.append({
+            "operation": row["operation"],
+            "size": row["size"],
+            "base_p50_ms": before,
+            "new_p50_ms": after,
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _parse_sizes(text: str) -> List[int]:
+    return [int(float(size)) for size in text.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_parse_sizes, default=[1000, 10000, 100000],
+                        help="Comma-separated sizes, e.g. 1e3,1e5,1e7")
+    parser.add_argument("--only", default=",".join(OPERATIONS), help="Comma-separated operations")
+    parser.add_argument("--repeat", type=int, default=20, help="Maximum calls per operation and size")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Stop sampling an operation after this long")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASE", "NEW"), help="Compare two reports")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed median slowdown for --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        base, new = (json.loads(path.read_text()) for path in args.compare)
+        rows = compare_reports(base, new, args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['operation']:<18} {row['size']:>10} {row['base_p50_ms']:>12.4f} ms "
+                  f"-> {row['new_p50_ms']:>12.4f} ms  x{row['ratio']:<7} {flag}")
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+    report = run(args.sizes, args.only.split(","), args.repeat, args.max_seconds, not args.no_memory, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
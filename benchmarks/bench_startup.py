@@ -0,0 +1,88 @@
+"""Benchmark CLI startup time per code path.
+
+Runs each command in a fresh interpreter with ``python -X importtime`` and
+reports, per path, the median wall-clock time, the total import time, how
+many modules were imported and which imports cost the most:
+
+* ``import`` - ``import game.app`` alone.
+* ``leaderboard`` - ``--leaderboard 10`` (fast path, no Typer).
+* ``help`` - ``--help`` (Typer, but no engine).
+* ``categories`` - the ``categories`` subcommand.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 10
+    python -m benchmarks.bench_startup --only leaderboard --max-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PATHS = {
+    "import": ["-c", "import game.app"],
+    "leaderboard": ["-m", "game.app", "--leaderboard", "10"],
+    "help": ["-m", "game.app", "--help"],
+    "categories": ["-m", "game.app", "categories"],
+}
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Parse ``-X importtime`` output into {module: (self_us, cumulative_us)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure(label: str, args: list, repeat: int, top: int) -> dict:
+    """Run one code path ``repeat`` times and summarize its startup cost."""
+    walls = []
+    modules = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            cwd=ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL
+        )
+        walls.append(time.perf_counter() - start)
+        modules = parse_importtime(proc.stderr)
+
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {
+        "path": label,
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(sum(s for s, _ in modules.values()) / 1000, 1),
+        "modules": len(modules),
+        "slowest": {name: round(s / 1000, 1) for name, (s, _) in slowest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (median is reported)")
+    parser.add_argument("--only", default=",".join(PATHS), help="Comma-separated code paths")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list per path")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if any path's median exceeds this")
+    args = parser.parse_args()
+
+    failed = False
+    for label in args.only.split(","):
+        report = measure(label, PATHS[label], args.repeat, args.top)
+        print(json.dumps(report))
+        if args.max_ms is not None and report["wall_ms"] > args.max_ms:
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark concurrent leaderboard writes.
+
+Compares results/second and line integrity for three ways of saving:
+
+* ``legacy`` - the original save_result: open in append mode, write, close,
+  with no lock and no fsync.
+* ``locked`` - ResultWriter from one thread per process: every result takes
+  the file lock and its own fsync.
+* ``group`` - ResultWriter shared by several threads per process, so queued
+  results are group committed under one lock and one fsync.
+
+Usage:
+    python -m benchmarks.bench_writes --writers 4 --threads 8 --results 200
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from game.models import Result, result_to_dict
+from game.result_writer import ResultWriter
+from game.segments import SegmentedLeaderboard
+
+
+def _make_result(writer: int, i: int) -> Result:
+    return Result(f"W{writer}-{i}", float(i % 11), 10, 3, 30.0 + i % 7, "bench", "2025-11-03T12:00:00Z")
+
+
+def _legacy_worker(path: Path, writer: int, threads: int, count: int) -> None:
+    for i in range(count * threads):
+        with open(path, "a") as f:
+            f.write(json.dumps(result_to_dict(_make_result(writer, i))) + "\n")
+
+
+def _writer_worker(path: Path, writer: int, threads: int, count: int) -> None:
+    result_writer = ResultWriter(SegmentedLeaderboard(path))
+
+    def run(thread: int) -> None:
+        for i in range(count):
+            result_writer.write(_make_result(writer, thread * count + i))
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def _count_valid(path: Path) -> int:
+    valid = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                json.loads(line)["player"]
+                valid += 1
+            except (ValueError, KeyError, TypeError):
+                pass
+    return valid
+
+
+def run_mode(mode: str, writers: int, threads: int, count: int) -> dict:
+    """Run one benchmark mode and return its measurements."""
+    worker = _legacy_worker if mode == "legacy" else _writer_worker
+    per_process_threads = 1 if mode == "locked" else threads
+    per_thread = count if mode != "locked" else count * threads
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "leaderboard.jsonl"
+        with ProcessPoolExecutor(max_workers=writers) as pool:
+            start = time.perf_counter()
+            futures = [pool.submit(worker, path, w, per_process_threads, per_thread) for w in range(writers)]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+
+        expected = writers * threads * count
+        return {
+            "mode": mode,
+            "results": expected,
+            "seconds": round(elapsed, 3),
+            "results_per_second": round(expected / elapsed, 1),
+            "valid_lines": _count_valid(path),
+            "durable": mode != "legacy",
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent writer processes")
+    parser.add_argument("--threads", type=int, default=8, help="Saving threads per process (group mode)")
+    parser.add_argument("--results", type=int, default=100, help="Results per thread")
+    parser.add_argument("--modes", default="legacy,locked,group", help="Comma-separated modes to run")
+    args = parser.parse_args()
+
+    for mode in args.modes.split(","):
+        print(json.dumps(run_mode(mode, args.writers, args.threads, args.results)))
+
+
+if __name__ == "__main__":
+    main()
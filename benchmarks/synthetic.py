@@ -0,0 +1,92 @@
+"""Synthetic question banks and leaderboards for benchmarks.
+
+Files are written in a streaming fashion, so banks and leaderboards with
+10^7 entries can be generated without holding them in memory. The same seed
+always produces the same files.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Iterator
+
+CATEGORIES = ["general", "science", "history", "geography"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def iter_questions(count: int, category: str = "synthetic", seed: int = 0) -> Iterator[dict]:
+    """Yield ``count`` question dictionaries in the question file format."""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "id": f"S-{i:08d}",
+            "category": category,
+            "difficulty": DIFFICULTIES[rng.randrange(3)],
+            "prompt": f"What is the answer to synthetic question number {i}?",
+            "choices": [f"Choice {i}-{c}" for c in "ABCD"],
+            "answer_index": rng.randrange(4),
+            "hint": f"Hint for question {i}",
+        }
+
+
+def iter_results(count: int, seed: int = 0) -> Iterator[dict]:
+    """Yield ``count`` leaderboard records with plausible scores and times."""
+    rng = random.Random(seed)
+    for i in range(count):
+        total = 10
+        hints = rng.randrange(3)
+        yield {
+            "player": f"Player{rng.randrange(max(count // 10, 1))}",
+            "score": rng.randrange(total * 2 + 1) / 2,
+            "total": total,
+            "streak_max": rng.randrange(total + 1),
+            "seconds": round(rng.uniform(10, 300), 2),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "timestamp": f"2025-11-03T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z",
+            "hints_used": hints,
+        }
+
+
+def write_question_bank(folder: Path, count: int, category: str = "synthetic", seed: int = 0, jsonl: bool = False) -> Path:
+    """Write ``questions_<category>.json`` (or ``.jsonl``) with ``count`` questions.
+
+    Args:
+        folder: Data folder to write into.
+        count: Number of questions.
+        category: Category name used in the file name and records.
+        seed: Random seed.
+        jsonl: Write one question per line instead of a JSON array.
+
+    Returns:
+        Path of the written file.
+    """
+    path = Path(folder) / f"questions_{category}.{'jsonl' if jsonl else 'json'}"
+    with open(path, "w") as f:
+        if not jsonl:
+            f.write("[\n")
+        for i, item in enumerate(iter_questions(count, category, seed)):
+            if jsonl:
+                f.write(json.dumps(item) + "\n")
+            else:
+                f.write((",\n" if i else "") + json.dumps(item))
+        if not jsonl:
+            f.write("\n]\n")
+    return path
+
+
+def write_leaderboard(path: Path, count: int, seed: int = 0) -> Path:
+    """Write a leaderboard JSONL file with ``count`` results.
+
+    Args:
+        path: Leaderboard file to create (overwritten if present).
+        count: Number of results.
+        seed: Random seed.
+
+    Returns:
+        The path written.
+    """
+    path = Path(path)
+    with open(path, "w") as f:
+        for record in iter_results(count, seed):
+            f.write(json.dumps(record) + "\n")
+    return path
@@ -0,0 +1,243 @@
+"""Exact and near-duplicate question detection in roughly linear time.
+
+Questions are compared on their normalized prompt and choices (see
+``utils.text.normalize_text``), so the same question imported twice under
+different ids, in another category file or with its choices shuffled is
+still found.
+
+* Exact duplicates share the same normalized prompt and sorted choices;
+  one dictionary pass finds them all.
+* Near duplicates are found with MinHash-LSH over byte shingles: each
+  question gets a ``bands * rows`` MinHash signature, questions sharing any
+  band become candidates, and candidates are confirmed with their exact
+  Jaccard similarity. A pair with similarity s is a candidate with
+  probability ``1 - (1 - s**rows) ** bands``, about 99.97% at s = 0.8 with
+  the defaults, while dissimilar questions rarely meet.
+
+Near-duplicate detection requires NumPy (``pip install numpy``).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from game.models import Question
+from utils.metrics import inc, span
+from utils.text import normalize_text, shingles
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_BANDS = 20
+DEFAULT_ROWS = 5
+SHINGLE_SIZE = 4
+CHUNK_SHINGLES = 1 << 12  # shingles hashed per NumPy batch
+DEFAULT_WINDOW = 16
+
+
+@dataclass
+class DuplicateGroup:
+    """A kept question and the questions found to duplicate it.
+
+    Attributes:
+        kept: The first occurrence, which a cleaned bank keeps.
+        duplicates: Later occurrences, in input order.
+        exact: Whether every duplicate matches ``kept`` exactly after
+            normalization (otherwise at least one is a near duplicate).
+    """
+    kept: Question
+    duplicates: List[Question] = field(default_factory=list)
+    exact: bool = True
+
+
+def question_text(question: Question) -> str:
+    """Return the normalized text a question is compared on.
+
+    The prompt is followed by the choices in sorted order, so shuffling the
+    choices does not hide a duplicate.
+    """
+    choices = sorted(normalize_text(choice) for choice in question.choices)
+    return " | ".join([normalize_text(question.prompt)] + choices)
+
+
+def jaccard(a: str, b: str) -> float:
+    """Return the Jaccard similarity of two strings' shingle sets."""
+    sa, sb = shingles(a, SHINGLE_SIZE), shingles(b, SHINGLE_SIZE)
+    return len(sa & sb) / len(sa | sb)
+
+
+class _DisjointSet:
+    """Union-find over indices; the smallest index is each set's root."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return False
+        if rj < ri:
+            ri, rj = rj, ri
+        self.parent[rj] = ri
+        return True
+
+
+def minhash_signatures(texts: Sequence[str], num_perm: int, seed: int = 0):
+    """Compute MinHash signatures for normalized texts.
+
+    Shingles are the UTF-8 byte 4-grams of each text, exactly as
+    ``utils.text.shingles`` (and so ``jaccard``) builds them, read as 32-bit
+    integers and permuted with ``a * x + b mod 2**32`` for odd ``a`` (a
+    bijection per row). Everything is vectorized over batches of about ``CHUNK_SHINGLES``
+    shingles, small enough for the working set to stay in cache.
+
+    Args:
+        texts: Normalized texts.
+        num_perm: Signature length.
+        seed: Seed for the hash functions.
+
+    Returns:
+        A ``(len(texts), num_perm)`` NumPy array of uint32.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2**32, size=(num_perm, 1), dtype=np.uint32) | np.uint32(1)
+    b = rng.integers(0, 2**32, size=(num_perm, 1), dtype=np.uint32)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+
+    start = 0
+    while start < len(texts):
+        encoded, total, end = [], 0, start
+        while end < len(texts) and (end == start or total < CHUNK_SHINGLES):
+            data = texts[end].encode().ljust(SHINGLE_SIZE)
+            encoded.append(data)
+            total += len(data)
+            end += 1
+
+        lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=len(encoded))
+        buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint32)
+        grams = buf[:-3] << 24 | buf[1:-2] << 16 | buf[2:-1] << 8 | buf[3:]
+        # Keep only the 4-grams that start and end inside one text
+        counts = lengths - (SHINGLE_SIZE - 1)
+        offsets = np.r_[0, np.cumsum(counts)[:-1]]
+        text_starts = np.r_[0, np.cumsum(lengths)[:-1]]
+        positions = np.arange(counts.sum()) + np.repeat(text_starts - offsets, counts)
+
+        permuted = a * grams[positions]
+        permuted += b
+        signatures[start:end] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        start = end
+    return signatures
+
+
+def _lsh_buckets(signatures, bands: int, rows: int) -> Iterable[List[int]]:
+    """Yield the indices sharing each LSH band, for buckets of two or more."""
+    import numpy as np
+
+    weights = np.random.default_rng(1).integers(1, 2**63, size=rows, dtype=np.uint64) | np.uint64(1)
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * weights).sum(axis=1)  # wraps mod 2**64
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # Runs of equal keys in sorted order are the buckets
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        shared = ends - starts > 1
+        for start, end in zip(starts[shared], ends[shared]):
+            yield order[start:end].tolist()
+
+
+def find_duplicates(
+    questions: Sequence[Question],
+    threshold: Optional[float] = DEFAULT_THRESHOLD,
+    bands: int = DEFAULT_BANDS,
+    rows: int = DEFAULT_ROWS,
+    window: int = DEFAULT_WINDOW,
+    seed: int = 0
+) -> List[DuplicateGroup]:
+    """Group questions that duplicate an earlier question.
+
+    Args:
+        questions: Questions in priority order; the first of each group is
+            the one kept.
+        threshold: Minimum Jaccard similarity of shingle sets for a near
+            duplicate, or None to find exact duplicates only.
+        bands: LSH bands (more finds lower similarities, with more candidates).
+        rows: Signature rows per band (more makes candidates stricter).
+        window: Earlier bucket members each question is compared with.
+            Buckets only grow large for heavily templated banks; the window
+            keeps the work linear there at some cost in recall.
+        seed: Seed for the MinHash functions.
+
+    Returns:
+        Duplicate groups ordered by their kept question's position.
+
+    Raises:
+        ImportError: If near duplicates are requested and NumPy is missing.
+    """
+    with span("questions.dedup"):
+        texts = [question_text(question) for question in questions]
+        sets = _DisjointSet(len(questions))
+        first_seen: Dict[str, int] = {}
+
+        for idx, text in enumerate(texts):
+            first = first_seen.setdefault(text, idx)
+            if first != idx:
+                sets.union(first, idx)
+
+        if threshold is not None:
+            import numpy as np
+
+            # Only the first occurrence of each exact group needs a signature
+            unique = list(first_seen.values())
+            signatures = minhash_signatures([texts[i] for i in unique], bands * rows, seed)
+            # Pairs whose signatures agree this little are not worth verifying
+            min_agreement = max(threshold - 0.2, 0.0) * bands * rows
+            for bucket in _lsh_buckets(signatures, bands, rows):
+                bucket.sort()
+                # Join each member to the nearest earlier member it matches
+                for j in range(1, len(bucket)):
+                    b = unique[bucket[j]]
+                    for i in reversed(bucket[max(0, j - window):j]):
+                        a = unique[i]
+                        if sets.find(a) == sets.find(b):
+                            break
+                        if np.count_nonzero(signatures[i] == signatures[bucket[j]]) < min_agreement:
+                            continue
+                        inc("questions.dedup_candidates")
+                        if jaccard(texts[a], texts[b]) >= threshold:
+                            sets.union(a, b)
+                            break
+
+        groups: Dict[int, DuplicateGroup] = {}
+        for idx, question in enumerate(questions):
+            root = sets.find(idx)
+            if root == idx:
+                continue
+            group = groups.get(root)
+            if group is None:
+                group = groups[root] = DuplicateGroup(questions[root])
+            group.duplicates.append(question)
+            group.exact = group.exact and texts[idx] == texts[root]
+
+        return [groups[root] for root in sorted(groups)]
+
+
+def dedupe(questions: Sequence[Question], **options) -> Tuple[List[Question], List[DuplicateGroup]]:
+    """Drop every question that duplicates an earlier one.
+
+    Args:
+        questions: Questions in priority order.
+        **options: Passed to find_duplicates.
+
+    Returns:
+        Tuple of (questions kept, in input order; duplicate groups).
+    """
+    groups = find_duplicates(questions, **options)
+    dropped = {id(question) for group in groups for question in group.duplicates}
+    return [question for question in questions if id(question) not in dropped], groups
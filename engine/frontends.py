@@ -0,0 +1,348 @@
+"""Quiz front-ends: how questions are shown and answers are read.
+
+``run_quiz`` talks to a QuizFrontend instead of calling ``print`` and
+``input``, so the same engine can run in a terminal, behind a machine
+protocol or fully in memory. Stream front-ends buffer everything shown
+between two prompts and write it, together with the prompt, in a single
+write, so each frame costs one write instead of one per line.
+
+* TerminalFrontend - human-readable text, as the CLI has always shown.
+* JsonLinesFrontend - one JSON event per line, for scripts and pipes.
+* MemoryFrontend - answers from a list, events collected in a list.
+"""
+
+import json
+import sys
+from typing import Iterable, List, Optional, TextIO
+from game.models import Question, Rank, Result, result_to_dict
+
+
+def format_welcome() -> str:
+    """Return the banner shown at the start of a quiz."""
+    return "\n" + "=" * 60 + "\nWELCOME TO THE AI QUIZ GAME!\n" + "=" * 60 + "\n"
+
+
+def format_question(question: Question, question_num: int, total: int) -> str:
+    """Render a quiz question with its choices.
+
+    Args:
+        question: The Question object to display.
+        question_num: Current question number (1-indexed).
+        total: Total number of questions in the quiz.
+
+    Returns:
+        The rendered question text.
+    """
+    lines = [
+        f"\nQuestion {question_num}/{total}",
+        "-" * 60,
+        f"Category: {question.category.upper()} | Difficulty: {question.difficulty.upper()}",
+        f"\n{question.prompt}\n",
+    ]
+
+    for idx, choice in enumerate(question.choices):
+        lines.append(f"  {idx + 1}. {choice}")
+
+    return "\n".join(lines)
+
+
+def format_answer_prompt(hint_available: bool) -> str:
+    """Return the answer prompt, offering a hint when one is available."""
+    if hint_available:
+        return "\nYour answer (1-4, or 'h' for hint): "
+    return "\nYour answer (1-4): "
+
+
+def format_hint(hint: str) -> str:
+    """Render a hint."""
+    return f"\nHint: {hint}"
+
+
+def format_feedback(correct: bool, points: float, correct_answer: str = None) -> str:
+    """Render feedback for the user's answer.
+
+    Args:
+        correct: Whether the answer was correct.
+        points: Points earned for the answer.
+        correct_answer: The correct answer text (shown if incorrect).
+
+    Returns:
+        The rendered feedback text.
+    """
+    if correct:
+        return f"\n✓ Correct! +{points} points"
+    return f"\n✗ Wrong! The correct answer was: {correct_answer}"
+
+
+def format_timeout(correct_answer: str) -> str:
+    """Render the message shown when a question's time runs out."""
+    return f"\n⏱ Time's up! The correct answer was: {correct_answer}"
+
+
+def format_rank(rank: Rank) -> str:
+    """Render a leaderboard rank, e.g. ``#4,213 of 1,200,000 (top 0.4%)``."""
+    return f"#{rank.position:,} of {rank.total:,} (top {rank.top_percent:.1f}%)"
+
+
+def format_result_summary(result: Result, rank: Optional[Rank] = None) -> str:
+    """Render the final quiz results.
+
+    Args:
+        result: The Result object containing quiz statistics.
+        rank: Where the result ranks on the leaderboard, if known.
+
+    Returns:
+        The rendered summary text.
+    """
+    lines = [
+        "\n" + "=" * 60,
+        "QUIZ COMPLETE!",
+        "=" * 60,
+        f"Player: {result.player}",
+        f"Score: {result.score}/{result.total} ({100*result.score/result.total:.1f}%)",
+        f"Best Streak: {result.streak_max}",
+    ]
+    if result.hints_used > 0:
+        lines.append(f"Hints Used: {result.hints_used}")
+    lines.append(f"Time: {result.seconds:.1f} seconds")
+    if rank is not None:
+        lines.append(f"Rank: {format_rank(rank)}")
+    lines.append("=" * 60 + "\n")
+    return "\n".join(lines)
+
+
+class QuizFrontend:
+    """Interface between the quiz loop and the player.
+
+    ``ask_*`` methods return the player's raw reply, or None once input has
+    ended. ``interactive`` tells the engine whether a person is watching, so
+    pauses meant for reading can be skipped otherwise.
+    """
+
+    interactive = False
+
+    def welcome(self) -> None:
+        """Show the start-of-quiz banner."""
+        raise NotImplementedError
+
+    def ask_name(self) -> Optional[str]:
+        """Ask for the player's name."""
+        raise NotImplementedError
+
+    def question(self, question: Question, number: int, total: int) -> None:
+        """Show a question and its choices."""
+        raise NotImplementedError
+
+    def ask_answer(self, num_choices: int, hint_available: bool) -> Optional[str]:
+        """Ask for an answer: a 1-based choice number, or ``h`` for a hint."""
+        raise NotImplementedError
+
+    def hint(self, text: str) -> None:
+        """Show the hint for the current question."""
+        raise NotImplementedError
+
+    def error(self, message: str) -> None:
+        """Tell the player their input was rejected."""
+        raise NotImplementedError
+
+    def feedback(self, correct: bool, points: float, correct_answer: str) -> None:
+        """Show whether the answer was right."""
+        raise NotImplementedError
+
+    def timeout(self, correct_answer: str) -> None:
+        """Tell the player the question's time ran out."""
+        raise NotImplementedError
+
+    def summary(self, result: Result, rank: Optional[Rank] = None) -> None:
+        """Show the final result and, if known, its leaderboard rank."""
+        raise NotImplementedError
+
+    def message(self, text: str) -> None:
+        """Show a status message."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Write out anything still buffered."""
+
+
+class _StreamFrontend(QuizFrontend):
+    """Front-end over text streams that writes one buffered chunk per frame."""
+
+    def __init__(self, input: Optional[TextIO] = None, output: Optional[TextIO] = None):
+        """Initialize the front-end.
+
+        Args:
+            input: Stream to read replies from (default: sys.stdin).
+            output: Stream to write to (default: sys.stdout).
+        """
+        self.input = input if input is not None else sys.stdin
+        self.output = output if output is not None else sys.stdout
+        self._buffer: List[str] = []
+
+    def _write(self, text: str) -> None:
+        self._buffer.append(text)
+
+    def _read(self, prompt: str) -> Optional[str]:
+        """Write the buffered frame and prompt at once, then read one line."""
+        self._buffer.append(prompt)
+        self.flush()
+        line = self.input.readline()
+        if not line:
+            return None
+        return line.rstrip("\r\n")
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.output.write("".join(self._buffer))
+            self._buffer = []
+        self.output.flush()
+
+
+class TerminalFrontend(_StreamFrontend):
+    """Human-readable text front-end."""
+
+    @property
+    def interactive(self) -> bool:
+        """Whether input comes from a terminal."""
+        isatty = getattr(self.input, "isatty", None)
+        return bool(isatty and isatty())
+
+    def welcome(self) -> None:
+        self._write(format_welcome() + "\n")
+
+    def ask_name(self) -> Optional[str]:
+        return self._read("Enter your name: ")
+
+    def question(self, question: Question, number: int, total: int) -> None:
+        self._write(format_question(question, number, total) + "\n")
+
+    def ask_answer(self, num_choices: int, hint_available: bool) -> Optional[str]:
+        return self._read(format_answer_prompt(hint_available))
+
+    def hint(self, text: str) -> None:
+        self._write(format_hint(text) + "\n")
+
+    def error(self, message: str) -> None:
+        self._write(message + "\n")
+
+    def feedback(self, correct: bool, points: float, correct_answer: str) -> None:
+        self._write(format_feedback(correct, points, correct_answer) + "\n")
+
+    def timeout(self, correct_answer: str) -> None:
+        self._write(format_timeout(correct_answer) + "\n")
+
+    def summary(self, result: Result, rank: Optional[Rank] = None) -> None:
+        self._write(format_result_summary(result, rank) + "\n")
+
+    def message(self, text: str) -> None:
+        self._write(text + "\n")
+
+
+class _EventFrontend(QuizFrontend):
+    """Front-end that represents everything shown as event dictionaries."""
+
+    def _emit(self, event: dict) -> None:
+        raise NotImplementedError
+
+    def _ask(self, event: dict) -> Optional[str]:
+        raise NotImplementedError
+
+    def welcome(self) -> None:
+        self._emit({"event": "welcome"})
+
+    def ask_name(self) -> Optional[str]:
+        return self._ask({"event": "prompt", "expect": "name"})
+
+    def question(self, question: Question, number: int, total: int) -> None:
+        self._emit({
+            "event": "question",
+            "number": number,
+            "total": total,
+            "id": question.id,
+            "category": question.category,
+            "difficulty": question.difficulty,
+            "prompt": question.prompt,
+            "choices": list(question.choices),
+        })
+
+    def ask_answer(self, num_choices: int, hint_available: bool) -> Optional[str]:
+        return self._ask({"event": "prompt", "expect": "answer", "choices": num_choices, "hint_available": hint_available})
+
+    def hint(self, text: str) -> None:
+        self._emit({"event": "hint", "text": text})
+
+    def error(self, message: str) -> None:
+        self._emit({"event": "error", "message": message})
+
+    def feedback(self, correct: bool, points: float, correct_answer: str) -> None:
+        self._emit({"event": "feedback", "correct": correct, "points": points, "correct_answer": correct_answer})
+
+    def timeout(self, correct_answer: str) -> None:
+        self._emit({"event": "timeout", "correct_answer": correct_answer})
+
+    def summary(self, result: Result, rank: Optional[Rank] = None) -> None:
+        event = {"event": "result", **result_to_dict(result)}
+        if rank is not None:
+            event.update(rank=rank.position, ranked_results=rank.total)
+        self._emit(event)
+
+    def message(self, text: str) -> None:
+        self._emit({"event": "message", "text": text})
+
+
+class JsonLinesFrontend(_EventFrontend, _StreamFrontend):
+    """Machine protocol: one JSON event per output line, one reply per input line.
+
+    Every ``prompt`` event expects one line back: the player's name, or an
+    answer (``1``-``N``, or ``h`` for a hint).
+    """
+
+    def _emit(self, event: dict) -> None:
+        self._write(json.dumps(event) + "\n")
+
+    def _ask(self, event: dict) -> Optional[str]:
+        return self._read(json.dumps(event) + "\n")
+
+
+class MemoryFrontend(_EventFrontend):
+    """In-memory front-end: replies come from an iterable, events go to a list."""
+
+    def __init__(self, replies: Iterable[str]):
+        """Initialize the front-end.
+
+        Args:
+            replies: Replies in order: the player's name, then answers.
+        """
+        self._replies = iter(replies)
+        self.events: List[dict] = []
+
+    def _emit(self, event: dict) -> None:
+        self.events.append(event)
+
+    def _ask(self, event: dict) -> Optional[str]:
+        self.events.append(event)
+        return next(self._replies, None)
+
+
+FRONTENDS = {
+    "terminal": TerminalFrontend,
+    "jsonl": JsonLinesFrontend,
+}
+
+
+def make_frontend(name: str, input: Optional[TextIO] = None, output: Optional[TextIO] = None) -> QuizFrontend:
+    """Build a stream front-end by name.
+
+    Args:
+        name: One of ``terminal`` or ``jsonl``.
+        input: Stream to read replies from (default: sys.stdin).
+        output: Stream to write to (default: sys.stdout).
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    try:
+        frontend_class = FRONTENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown frontend: {name} (expected terminal or jsonl)") from None
+    return frontend_class(input, output)
@@ -0,0 +1,84 @@
+"""Pacing between questions and per-question time limits."""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+PACING_MODES = ("off", "fixed", "timed")
+DEFAULT_PACING = "fixed"
+DEFAULT_PACING_DELAY = 0.5
+DEFAULT_QUESTION_TIME_LIMIT = 30.0
+
+
+@dataclass(frozen=True)
+class Pacing:
+    """How a quiz is paced.
+
+    Modes:
+        off: no pauses and no time limit.
+        fixed: pause ``delay`` seconds after each answer.
+        timed: as fixed, and each question must be answered within
+            ``time_limit`` seconds; a late answer counts as a miss.
+
+    Attributes:
+        mode: One of ``off``, ``fixed`` or ``timed``.
+        delay: Seconds to pause after each answer's feedback.
+        time_limit: Seconds allowed per question in timed mode.
+    """
+    mode: str = DEFAULT_PACING
+    delay: float = DEFAULT_PACING_DELAY
+    time_limit: Optional[float] = None
+
+    def __post_init__(self):
+        if self.mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing: {self.mode} (expected off, fixed or timed)")
+        if self.delay < 0:
+            raise ValueError("Pacing delay cannot be negative.")
+        if self.mode == "timed" and not (self.time_limit and self.time_limit > 0):
+            raise ValueError("Timed pacing needs a positive time limit.")
+
+    @property
+    def pause_seconds(self) -> float:
+        """Seconds to pause after each answer."""
+        return 0.0 if self.mode == "off" else self.delay
+
+    def deadline(self, clock: Callable[[], float] = time.monotonic) -> Optional[float]:
+        """Return the deadline for a question shown now, or None if untimed."""
+        if self.mode != "timed":
+            return None
+        return clock() + self.time_limit
+
+    def pause(self) -> None:
+        """Block for the pause between questions."""
+        if self.pause_seconds:
+            time.sleep(self.pause_seconds)
+
+    async def pause_async(self) -> None:
+        """Wait for the pause between questions without blocking the event loop."""
+        if self.pause_seconds:
+            import asyncio
+            await asyncio.sleep(self.pause_seconds)
+
+
+def pacing_from_config(
+    config: dict,
+    mode: Optional[str] = None,
+    delay: Optional[float] = None,
+    time_limit: Optional[float] = None
+) -> Pacing:
+    """Build the Pacing described by the configuration, with overrides.
+
+    Args:
+        config: Configuration dictionary from load_config().
+        mode: Overrides ``config["pacing"]``.
+        delay: Overrides ``config["pacing_delay"]``.
+        time_limit: Overrides ``config["question_time_limit"]``.
+
+    Raises:
+        ValueError: If the resulting pacing is invalid.
+    """
+    return Pacing(
+        mode if mode is not None else config.get("pacing", DEFAULT_PACING),
+        delay if delay is not None else config.get("pacing_delay", DEFAULT_PACING_DELAY),
+        time_limit if time_limit is not None else config.get("question_time_limit", DEFAULT_QUESTION_TIME_LIMIT),
+    )
@@ -1,13 +1,387 @@
 """Question selection and filtering."""
 
-from typing import List, Optional
-from game.models import Question
+import json
+import mmap
+import os
+import random
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+from game.models import Question, question_from_dict
+from utils.metrics import span
 from utils.rng import get_rng
 
 
+class QuestionBank:
+    """A loaded set of questions bucketed by category and difficulty.
+
+    Buckets hold question indices for every (category, difficulty) pair, with
+    ``None`` acting as a wildcard, so selecting ``limit`` questions samples a
+    precomputed index array instead of scanning the whole bank.
+    """
+
+    def __init__(self, questions: Sequence[Question]):
+        """Build the buckets for a list of questions.
+
+        Args:
+            questions: All available questions: a list, or a QuestionTable.
+        """
+        self.questions = questions
+        self._buckets: Dict[Tuple[Optional[str], Optional[str]], array] = {}
+
+        for idx, question in enumerate(questions):
+            category = question.category.lower()
+            difficulty = question.difficulty.lower()
+            for key in ((category, None), (None, difficulty), (category, difficulty)):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = array("I")
+                bucket.append(idx)
+
+    def __len__(self) -> int:
+        """Return the number of questions in the bank."""
+        return len(self.questions)
+
+    def _bucket(self, category: Optional[str], difficulty: Optional[str]) -> Sequence[int]:
+        """Return the question indices matching the given filters."""
+        if category is None and difficulty is None:
+            return range(len(self.questions))
+        key = (category.lower() if category else None, difficulty.lower() if difficulty else None)
+        return self._buckets.get(key, ())
+
+    def count(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> int:
+        """Return how many questions match the given filters.
+
+        Args:
+            category: Optional category filter.
+            difficulty: Optional difficulty filter (easy, medium, hard).
+
+        Returns:
+            Number of matching questions.
+        """
+        return len(self._bucket(category, difficulty))
+
+    def difficulty_counts(self) -> Dict[str, int]:
+        """Return the number of questions per (lower-cased) difficulty."""
+        return {key[1]: len(bucket) for key, bucket in self._buckets.items() if key[0] is None}
+
+    def select(
+        self,
+        limit: int,
+        difficulty: Optional[str] = None,
+        category: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[Question]:
+        """Choose up to ``limit`` questions matching the filters.
+
+        Runs in O(limit) time regardless of bank size. When no more than
+        ``limit`` questions match, all of them are returned in bank order.
+
+        Args:
+            limit: Maximum number of questions to select.
+            difficulty: Optional difficulty filter (easy, medium, hard).
+            category: Optional category filter.
+            rng: Optional Random instance, for reproducible selection.
+
+        Returns:
+            List of selected questions.
+        """
+        with span("questions.select"):
+            bucket = self._bucket(category, difficulty)
+
+            if len(bucket) > limit:
+                rng = rng or get_rng()
+                bucket = rng.sample(bucket, limit)
+
+            return [self.questions[idx] for idx in bucket]
+
+
+class LazyQuestionBank:
+    """A JSON Lines question bank that parses only the questions it returns.
+
+    Construction scans the file once for line offsets without decoding any
+    JSON. Selecting ``limit`` questions then seeks to and parses about
+    ``limit`` lines, so sampling from a multi-GB bank stays cheap. Filters
+    are checked on parsed questions, so a rare difficulty may need many more
+    lines parsed (all of them in the worst case).
+    """
+
+    def __init__(self, path: Path):
+        """Index the line offsets of a JSONL question file.
+
+        Args:
+            path: Path to a ``questions_<category>.jsonl`` file.
+        """
+        self.path = Path(path)
+        self.offsets = array("Q")
+
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = 0
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    if end == -1:
+                        end = size
+                    # Only very short lines can be blank
+                    if end - pos > 2 or mm[pos:end].strip():
+                        self.offsets.append(pos)
+                    pos = end + 1
+
+    def __len__(self) -> int:
+        """Return the number of questions in the bank."""
+        return len(self.offsets)
+
+    def __getitem__(self, idx: int) -> Question:
+        """Parse and return the question at ``idx``."""
+        with open(self.path, "rb") as f:
+            return self._read(f, idx)
+
+    def _read(self, f: BinaryIO, idx: int) -> Question:
+        """Parse the question at line ``idx`` from an open file."""
+        f.seek(self.offsets[idx])
+        return question_from_dict(json.loads(f.readline()))
+
+    @staticmethod
+    def _matches(question: Question, category: Optional[str], difficulty: Optional[str]) -> bool:
+        """Whether a question passes the optional filters."""
+        return ((category is None or question.category.lower() == category.lower())
+                and (difficulty is None or question.difficulty.lower() == difficulty.lower()))
+
+    def _scan(self, category: Optional[str], difficulty: Optional[str]) -> List[Question]:
+        """Parse every line and return the matching questions in bank order."""
+        with open(self.path, "rb") as f:
+            return [question for question in (self._read(f, idx) for idx in range(len(self.offsets)))
+                    if self._matches(question, category, difficulty)]
+
+    def count(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> int:
+        """Return how many questions match the given filters.
+
+        Without filters this is O(1); with filters every line is parsed.
+        """
+        if category is None and difficulty is None:
+            return len(self.offsets)
+        return len(self._scan(category, difficulty))
+
+    def difficulty_counts(self) -> Dict[str, int]:
+        """Return the number of questions per (lower-cased) difficulty.
+
+        Parses every line; prefer the catalog's counts where available.
+        """
+        counts: Dict[str, int] = {}
+        for question in self._scan(None, None):
+            difficulty = question.difficulty.lower()
+            counts[difficulty] = counts.get(difficulty, 0) + 1
+        return counts
+
+    def select(
+        self,
+        limit: int,
+        difficulty: Optional[str] = None,
+        category: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[Question]:
+        """Choose up to ``limit`` questions matching the filters.
+
+        Behaves like QuestionBank.select: when no more than ``limit`` questions
+        match, all of them are returned in bank order.
+
+        Args:
+            limit: Maximum number of questions to select.
+            difficulty: Optional difficulty filter (easy, medium, hard).
+            category: Optional category filter.
+            rng: Optional Random instance, for reproducible selection.
+
+        Returns:
+            List of selected questions.
+        """
+        with span("questions.select"):
+            return self._select(limit, difficulty, category, rng)
+
+    def _select(self, limit, difficulty, category, rng) -> List[Question]:
+        """Select as documented on select, without the metrics span."""
+        n = len(self.offsets)
+        rng = rng or get_rng()
+
+        if category is None and difficulty is None:
+            indices = range(n) if n <= limit else rng.sample(range(n), limit)
+            with open(self.path, "rb") as f:
+                return [self._read(f, idx) for idx in indices]
+
+        # Probe random lines until enough match or half the bank was tried
+        selected = []
+        seen = set()
+        with open(self.path, "rb") as f:
+            while len(selected) < limit and len(seen) < n // 2:
+                idx = rng.randrange(n)
+                if idx not in seen:
+                    seen.add(idx)
+                    question = self._read(f, idx)
+                    if self._matches(question, category, difficulty):
+                        selected.append(question)
+        if len(selected) >= limit:
+            return selected
+
+        # Matches are scarce: fall back to a full pass
+        matching = self._scan(category, difficulty)
+        if len(matching) > limit:
+            return rng.sample(matching, limit)
+        return matching
+
+
+def _allocate(limit: int, weights: Dict[tuple, float], capacity: Dict[tuple, int]) -> Dict[tuple, int]:
+    """Split ``limit`` across strata in proportion to their weights.
+
+    Strata whose share exceeds their capacity are filled and the rest is
+    divided again among the others; the final split uses largest-remainder
+    rounding (ties go to the earlier stratum).
+    """
+    quotas = {key: 0 for key in weights}
+    open_keys = [key for key in weights if capacity[key] > 0 and weights[key] > 0]
+    remaining = min(limit, sum(capacity[key] for key in open_keys))
+
+    while remaining > 0:
+        total = sum(weights[key] for key in open_keys)
+        shares = {key: remaining * weights[key] / total for key in open_keys}
+        full = [key for key in open_keys if shares[key] >= capacity[key]]
+        if full:
+            for key in full:
+                quotas[key] = capacity[key]
+                remaining -= capacity[key]
+            open_keys = [key for key in open_keys if key not in full]
+            continue
+
+        for key in open_keys:
+            quotas[key] = int(shares[key])
+        leftover = remaining - sum(quotas[key] for key in open_keys)
+        for key in sorted(open_keys, key=lambda k: shares[k] - int(shares[k]), reverse=True)[:leftover]:
+            quotas[key] += 1
+        break
+    return quotas
+
+
+class MixedQuestionBank:
+    """Several category banks sampled together without merging them.
+
+    Each category keeps its own QuestionBank or LazyQuestionBank. Selecting
+    ``limit`` questions splits the limit across (category, difficulty)
+    strata, draws each stratum's share from its own bank and shuffles the
+    result, so only the chosen questions are ever copied.
+
+    A category's share is proportional to its weight (equal by default).
+    Within a category, each difficulty's share is proportional to its weight
+    when difficulty weights are given, otherwise to how many questions it
+    has. Shares a stratum cannot fill go to the others.
+
+    Example:
+        MixedQuestionBank({"science": science, "general": general},
+                          difficulty_weights={"easy": 2, "hard": 1}).select(9)
+        gives 4 or 5 questions per category, twice as many easy as hard.
+    """
+
+    def __init__(
+        self,
+        banks: Dict[str, object],
+        counts: Optional[Dict[str, Dict[str, int]]] = None,
+        category_weights: Optional[Dict[str, float]] = None,
+        difficulty_weights: Optional[Dict[str, float]] = None
+    ):
+        """Initialize the mixed bank.
+
+        Args:
+            banks: QuestionBank or LazyQuestionBank per category name.
+            counts: Questions per lower-cased difficulty for each category
+                (e.g. from the catalog); computed from the banks if omitted.
+            category_weights: Relative weight per category (default 1.0).
+            difficulty_weights: Relative weight per difficulty (default:
+                proportional to each difficulty's question count).
+        """
+        self.banks = {category.lower(): bank for category, bank in banks.items()}
+        counts = {category.lower(): n for category, n in (counts or {}).items()}
+        self.counts = {
+            category: counts[category] if category in counts else bank.difficulty_counts()
+            for category, bank in self.banks.items()
+        }
+        self.category_weights = {k.lower(): v for k, v in (category_weights or {}).items()}
+        self.difficulty_weights = {k.lower(): v for k, v in (difficulty_weights or {}).items()} or None
+
+    def __len__(self) -> int:
+        """Return the number of questions across all categories."""
+        return sum(sum(counts.values()) for counts in self.counts.values())
+
+    def count(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> int:
+        """Return how many questions match the given filters.
+
+        Args:
+            category: Optional category filter.
+            difficulty: Optional difficulty filter (easy, medium, hard).
+
+        Returns:
+            Number of matching questions.
+        """
+        categories = [category.lower()] if category else list(self.counts)
+        return sum(
+            n for c in categories for d, n in self.counts.get(c, {}).items()
+            if difficulty is None or d == difficulty.lower()
+        )
+
+    def _weights(self, difficulty: Optional[str]) -> Tuple[Dict[tuple, float], Dict[tuple, int]]:
+        """Return the weight and capacity of every (category, difficulty) stratum."""
+        weights, capacity = {}, {}
+        for category, counts in self.counts.items():
+            strata = {d: n for d, n in counts.items() if n > 0 and (difficulty is None or d == difficulty.lower())}
+            if not strata:
+                continue
+            raw = {d: self.difficulty_weights.get(d, 0.0) for d in strata} if self.difficulty_weights else {}
+            if not sum(raw.values()):
+                raw = strata  # no weighted difficulty left: keep the category's own mix
+            total = sum(raw.values())
+            for d, n in strata.items():
+                weights[(category, d)] = self.category_weights.get(category, 1.0) * raw[d] / total
+                capacity[(category, d)] = n
+        return weights, capacity
+
+    def select(
+        self,
+        limit: int,
+        difficulty: Optional[str] = None,
+        category: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[Question]:
+        """Choose up to ``limit`` questions, stratified by category and difficulty.
+
+        Args:
+            limit: Maximum number of questions to select.
+            difficulty: Optional difficulty filter (easy, medium, hard).
+            category: Optional category filter (selects from that bank only).
+            rng: Optional Random instance, for reproducible selection.
+
+        Returns:
+            List of selected questions in random order.
+        """
+        rng = rng or get_rng()
+        if category is not None:
+            bank = self.banks.get(category.lower())
+            return bank.select(limit, difficulty, rng=rng) if bank is not None else []
+
+        with span("questions.select"):
+            quotas = _allocate(limit, *self._weights(difficulty))
+            selected = []
+            for (category, stratum), quota in quotas.items():
+                if quota:
+                    selected.extend(self.banks[category].select(quota, stratum, rng=rng))
+            rng.shuffle(selected)
+            return selected
+
+
 def select_questions(questions: List[Question], limit: int, difficulty: Optional[str] = None) -> List[Question]:
     """Choose a subset of questions based on limit and difficulty.
 
+    Thin wrapper over QuestionBank for one-off selections. Callers that select
+    repeatedly from the same questions should build a QuestionBank once.
+
     Args:
         questions: List of all available questions.
         limit: Maximum number of questions to select.
@@ -16,20 +390,4 @@ def select_questions(questions: List[Question], limit: int, difficulty: Optional
     Returns:
         List of selected questions.
     """
-    # INTENTIONAL BUG: Variable shadowing
-    questions = questions  # Shadows parameter unnecessarily
-
-    # Filter by difficulty if specified
-    if difficulty:
-        filtered = []
-        for q in questions:
-            if q.difficulty.lower() == difficulty.lower():
-                filtered.append(q)
-        questions = filtered
-
-    # Limit the number of questions
-    if len(questions) > limit:
-        rng = get_rng()
-        questions = rng.sample(questions, limit)
-
-    return questions
+    return QuestionBank(questions).select(limit, difficulty)
@@ -1,184 +1,131 @@
 """Quiz engine for running interactive quiz sessions."""
 
 import time
-from datetime import datetime
-from typing import List
-from game.models import Question, Result
-from engine.scoring import score_answer
+from typing import Callable, List, Optional
+from game.models import AnswerEvent, Question, Rank, Result
+from engine.frontends import QuizFrontend, TerminalFrontend
+from engine.pacing import Pacing
+from engine.session import AnswerOutcome, QuizSession
 
 
-def get_player_name() -> str:
-    """Prompt for and return the player's name.
+def _read_reply(reply: Optional[str]) -> str:
+    """Return a front-end reply, raising EOFError once input has ended."""
+    if reply is None:
+        raise EOFError("Input ended before the quiz finished.")
+    return reply.strip()
 
-    Returns:
-        The player's name, or "Anonymous" if no name provided.
-    """
-    player = input("Enter your name: ").strip()
-    if not player:
-        player = "Anonymous"
-    return player
 
+def apply_reply(frontend: QuizFrontend, session: QuizSession, reply: str) -> Optional[AnswerOutcome]:
+    """Act on one reply to the current question.
 
-def display_question(question: Question, question_num: int, total: int) -> None:
-    """Display a quiz question with its choices.
+    Shared by ``run_quiz`` and the asyncio server, which read replies
+    differently but treat them the same way.
 
     Args:
-        question: The Question object to display.
-        question_num: Current question number (1-indexed).
-        total: Total number of questions in the quiz.
+        frontend: Where hints and input errors are shown.
+        session: The session whose current question is being answered.
+        reply: The player's stripped reply.
+
+    Returns:
+        The outcome if the reply answered the question, or None if it was a
+        hint request or was rejected and another reply is needed.
     """
-    print(f"\nQuestion {question_num}/{total}")
-    print("-" * 60)
-    print(f"Category: {question.category.upper()} | Difficulty: {question.difficulty.upper()}")
-    print(f"\n{question.prompt}\n")
+    num_choices = len(session.current_question.choices)
+    answer = reply.lower()
 
-    for idx, choice in enumerate(question.choices):
-        print(f"  {idx + 1}. {choice}")
+    if answer == "h" and session.hint_available:
+        frontend.hint(session.request_hint())
+        return None
 
+    try:
+        choice = int(answer) - 1
+    except ValueError:
+        frontend.error(f"Invalid input. Please enter a number between 1 and {num_choices}.")
+        return None
 
-def get_user_answer(num_choices: int, hints_enabled: bool = False, hint_text: str = None) -> tuple[int, bool]:
-    """Prompt user for their answer choice with validation.
+    try:
+        return session.submit_answer(choice)
+    except ValueError as e:
+        frontend.error(str(e))
+        return None
 
-    Args:
-        num_choices: Number of available choices.
-        hints_enabled: Whether hints are enabled for this quiz.
-        hint_text: The hint text to display if user requests it.
 
-    Returns:
-        Tuple of (zero-indexed choice, whether hint was requested).
+def _answer_question(frontend: QuizFrontend, session: QuizSession, deadline: Optional[float] = None) -> AnswerOutcome:
+    """Read replies until the current question is answered validly.
+
+    A blocking read cannot be interrupted portably, so the deadline is
+    checked as each reply arrives: a late reply times the question out.
     """
-    hint_requested = False
+    num_choices = len(session.current_question.choices)
 
     while True:
-        try:
-            if hints_enabled and not hint_requested:
-                answer = input("\nYour answer (1-4, or 'h' for hint): ").strip().lower()
-            else:
-                answer = input("\nYour answer (1-4): ").strip()
-
-            if hints_enabled and answer == 'h' and not hint_requested:
-                hint_requested = True
-                if hint_text:
-                    print(f"\nHint: {hint_text}")
-                continue
-
-            user_choice = int(answer) - 1
-            if 0 <= user_choice < num_choices:
-                return user_choice, hint_requested
-            else:
-                print(f"Please enter a number between 1 and {num_choices}.")
-        except ValueError:
-            print(f"Invalid input. Please enter a number between 1 and {num_choices}.")
-
-
-def display_feedback(correct: bool, points: float, correct_answer: str = None) -> None:
-    """Display feedback for the user's answer.
-
-    Args:
-        correct: Whether the answer was correct.
-        points: Points earned for the answer.
-        correct_answer: The correct answer text (shown if incorrect).
-    """
-    if correct:
-        print(f"\n✓ Correct! +{points} points")
-    else:
-        print(f"\n✗ Wrong! The correct answer was: {correct_answer}")
+        answer = _read_reply(frontend.ask_answer(num_choices, session.hint_available))
 
+        if deadline is not None and time.monotonic() > deadline:
+            return session.timeout()
 
-def display_result_summary(result: Result) -> None:
-    """Display the final quiz results.
+        outcome = apply_reply(frontend, session, answer)
+        if outcome is not None:
+            return outcome
 
-    Args:
-        result: The Result object containing quiz statistics.
-    """
-    print("\n" + "=" * 60)
-    print("QUIZ COMPLETE!")
-    print("=" * 60)
-    print(f"Player: {result.player}")
-    print(f"Score: {result.score}/{result.total} ({100*result.score/result.total:.1f}%)")
-    print(f"Best Streak: {result.streak_max}")
-    if result.hints_used > 0:
-        print(f"Hints Used: {result.hints_used}")
-    print(f"Time: {result.seconds:.1f} seconds")
-    print("=" * 60 + "\n")
 
+def run_quiz(
+    questions: List[Question],
+    hints_enabled: bool = False,
+    frontend: Optional[QuizFrontend] = None,
+    pacing: Optional[Pacing] = None,
+    ranker: Optional[Callable[[Result], Rank]] = None,
+    on_answer: Optional[Callable[[AnswerEvent], None]] = None
+) -> Result:
+    """Run a quiz session through a front-end.
 
-def run_quiz(questions: List[Question], hints_enabled: bool = False) -> Result:
-    """Run an interactive quiz session.
+    A client of QuizSession: the front-end shows each step and supplies the
+    player's replies.
 
     Args:
         questions: List of Question objects to ask the user.
         hints_enabled: Whether to allow users to request hints.
+        frontend: Where to show questions and read answers (default: the
+            terminal, via stdin/stdout).
+        pacing: Pause and time limit per question (default: a fixed half
+            second pause). Pauses are skipped for non-interactive front-ends.
+        ranker: Returns the leaderboard rank of the finished result, which
+            is then shown in the summary (default: no rank shown).
+        on_answer: Receives an AnswerEvent per answered question, with the
+            response time measured from when the question was shown.
 
     Returns:
         Result object containing quiz statistics and score.
-    """
-    print("\n" + "=" * 60)
-    print("WELCOME TO THE AI QUIZ GAME!")
-    print("=" * 60 + "\n")
-
-    player = get_player_name()
-
-    score = 0.0
-    total_questions = len(questions)
-    streak = 0
-    max_streak = 0
-    hints_used = 0
-    asked_ids = set()  # Use set for O(1) duplicate checking
-
-    start_time = time.time()
-
-    for i, question in enumerate(questions):
-        # Skip duplicate questions using O(1) set lookup
-        if question.id in asked_ids:
-            continue
-
-        asked_ids.add(question.id)
 
-        # Display the question
-        display_question(question, len(asked_ids), total_questions)
-
-        # Get user's answer (and check if hint was requested)
-        user_choice, hint_used = get_user_answer(len(question.choices), hints_enabled, question.hint)
-
-        # Track hints used
-        if hint_used:
-            hints_used += 1
+    Raises:
+        EOFError: If the front-end's input ends before the quiz finishes.
+    """
+    frontend = frontend or TerminalFrontend()
+    pacing = pacing or Pacing()
+    frontend.welcome()
+    if pacing.mode == "timed":
+        frontend.message(f"You have {pacing.time_limit:g} seconds per question.")
+
+    player = _read_reply(frontend.ask_name()) or "Anonymous"
+    session = QuizSession(questions, player, hints_enabled, on_answer=on_answer)
+
+    while not session.is_finished:
+        question = session.current_question
+        frontend.question(question, session.question_number, session.total)
+        session.question_shown()
+
+        outcome = _answer_question(frontend, session, pacing.deadline())
+        if outcome.timed_out:
+            frontend.timeout(outcome.correct_answer)
+        else:
+            frontend.feedback(outcome.correct, outcome.points, outcome.correct_answer)
 
-        # Score the answer
-        correct, points = score_answer(question, user_choice, hint_used)
+        # Pause so a person can read the feedback (yields CPU)
+        if frontend.interactive:
+            pacing.pause()
 
-        # Update score and streak
-        if correct:
-            score += points
-            streak += 1
-            if streak > max_streak:
-                max_streak = streak
-            display_feedback(True, points)
-        else:
-            streak = 0
-            correct_answer = question.choices[question.answer_index]
-            display_feedback(False, points, correct_answer)
-
-        # Brief delay between questions (yields CPU)
-        time.sleep(0.5)
-
-    end_time = time.time()
-    elapsed = end_time - start_time
-
-    # Create result
-    result = Result(
-        player=player,
-        score=score,
-        total=total_questions,
-        streak_max=max_streak,
-        seconds=elapsed,
-        category=questions[0].category if questions else "general",
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        hints_used=hints_used
-    )
-
-    # Display summary
-    display_result_summary(result)
+    result = session.finish()
+    frontend.summary(result, ranker(result) if ranker else None)
+    frontend.flush()
 
     return result
@@ -1,6 +1,7 @@
 """Scoring logic for quiz answers."""
 
 from game.models import Question
+from utils.metrics import inc, span
 
 
 def score_answer(question: Question, user_choice: int, hint_used: bool = False) -> tuple[bool, float]:
@@ -25,3 +26,58 @@ def score_answer(question: Question, user_choice: int, hint_used: bool = False)
         points = 1.0
 
     return correct, points
+
+
+def score_answers_batch(chosen, correct_index, hints_used=None, session_ids=None):
+    """Score many answers at once with NumPy.
+
+    Gives exactly the same correctness and points as calling score_answer on
+    each answer, and the best streak per session as QuizSession tracks it.
+    Requires NumPy (``pip install numpy``).
+
+    Args:
+        chosen: Array-like of chosen answer indices.
+        correct_index: Array-like of correct answer indices.
+        hints_used: Optional array-like of hint flags (default: no hints).
+        session_ids: Optional array-like of session ids. Answers of one session
+            must be consecutive and in question order; a new session starts
+            wherever the id changes. Defaults to a single session.
+
+    Returns:
+        Tuple of (correct mask, points, streak maxima). Streak maxima has one
+        entry per session, in the order sessions appear.
+    """
+    import numpy as np
+
+    with span("answers.score_batch"):
+        chosen = np.asarray(chosen)
+        correct = chosen == np.asarray(correct_index)
+        n = correct.shape[0]
+        inc("answers.scored", n)
+
+        if hints_used is None:
+            hints = np.zeros(n, dtype=bool)
+        else:
+            hints = np.asarray(hints_used, dtype=bool)
+        points = np.where(correct, np.where(hints, 0.5, 1.0), 0.0)
+
+        if n == 0:
+            return correct, points, np.zeros(0, dtype=np.int64)
+
+        # Mark where each session starts
+        session_start = np.zeros(n, dtype=bool)
+        session_start[0] = True
+        if session_ids is not None:
+            session_ids = np.asarray(session_ids)
+            session_start[1:] = session_ids[1:] != session_ids[:-1]
+
+        # A run of correct answers starts at a session start or after a miss
+        run_start = correct.copy()
+        run_start[1:] &= session_start[1:] | ~correct[:-1]
+
+        positions = np.arange(n)
+        start_pos = np.maximum.accumulate(np.where(run_start, positions, 0))
+        run_length = np.where(correct, positions - start_pos + 1, 0)
+
+        streak_max = np.maximum.reduceat(run_length, np.flatnonzero(session_start))
+        return correct, points, streak_max
@@ -0,0 +1,209 @@
+"""Non-blocking quiz session state machine."""
+
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+from game.models import AnswerEvent, Question, Result
+from engine.scoring import score_answer
+from utils.metrics import inc, span
+
+
+@dataclass
+class AnswerOutcome:
+    """Outcome of submitting an answer to the current question."""
+    correct: bool
+    points: float
+    correct_answer: str
+    timed_out: bool = False
+
+
+class QuizSession:
+    """State of one player's quiz, advanced by explicit calls.
+
+    The session never reads input, prints or sleeps, so the same logic can be
+    driven by the interactive CLI, a network server or a simulation. Callers
+    loop on ``current_question``, optionally call ``request_hint()``, then
+    ``submit_answer()``, and call ``finish()`` once ``is_finished`` is true.
+    """
+
+    def __init__(
+        self,
+        questions: List[Question],
+        player: str = "Anonymous",
+        hints_enabled: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        on_answer: Optional[Callable[[AnswerEvent], None]] = None
+    ):
+        """Start a session.
+
+        Args:
+            questions: Questions to ask; duplicate ids are asked only once.
+            player: The player's name.
+            hints_enabled: Whether the player may request hints.
+            clock: Time source used to measure the session and response times.
+            on_answer: Called with an AnswerEvent for every answered or
+                timed-out question (e.g. ``AnswerLog.record``).
+        """
+        self.session_id = secrets.randbits(64)
+        self.player = player
+        self.hints_enabled = hints_enabled
+        self.total = len(questions)
+        categories = {question.category for question in questions}
+        if len(categories) > 1:
+            # A quiz drawn from several categories is ranked as its own category
+            self.category = "mixed"
+        else:
+            self.category = categories.pop() if categories else "general"
+        self.score = 0.0
+        self.streak = 0
+        self.max_streak = 0
+        self.hints_used = 0
+
+        # Skip duplicate questions using O(1) set lookup
+        asked_ids = set()
+        self._questions = []
+        for question in questions:
+            if question.id not in asked_ids:
+                asked_ids.add(question.id)
+                self._questions.append(question)
+
+        self._position = 0
+        self._hint_used = False
+        self._clock = clock
+        self._on_answer = on_answer
+        self._start_time = clock()
+        self._shown_at = self._start_time
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether every question has been answered."""
+        return self._position >= len(self._questions)
+
+    @property
+    def current_question(self) -> Optional[Question]:
+        """The question awaiting an answer, or None when finished."""
+        if self.is_finished:
+            return None
+        return self._questions[self._position]
+
+    @property
+    def question_number(self) -> int:
+        """1-indexed number of the current question."""
+        return self._position + 1
+
+    @property
+    def hint_available(self) -> bool:
+        """Whether a hint may be requested for the current question."""
+        return self.hints_enabled and not self._hint_used and not self.is_finished
+
+    def question_shown(self) -> None:
+        """Note that the current question was just shown to the player.
+
+        Response times are measured from here. Without this call they run
+        from when the question became current, including any pause after the
+        previous answer.
+        """
+        self._shown_at = self._clock()
+
+    def _advance(self, question: Question, choice: int, correct: bool) -> None:
+        """Emit the answer event for the current question and move on."""
+        now = self._clock()
+        if self._on_answer is not None:
+            self._on_answer(AnswerEvent(
+                self.session_id, question.id, choice, correct, self._hint_used,
+                now - self._shown_at, time.time()
+            ))
+        self._shown_at = now
+        self._position += 1
+        self._hint_used = False
+
+    def request_hint(self) -> str:
+        """Use the hint for the current question.
+
+        Returns:
+            The hint text.
+
+        Raises:
+            ValueError: If hints are disabled or already used for this question.
+        """
+        if not self.hint_available:
+            raise ValueError("No hint available for this question.")
+        self._hint_used = True
+        return self.current_question.hint
+
+    def submit_answer(self, choice: int) -> AnswerOutcome:
+        """Score an answer to the current question and advance.
+
+        Args:
+            choice: Zero-indexed choice.
+
+        Returns:
+            AnswerOutcome with correctness, points and the correct answer text.
+
+        Raises:
+            ValueError: If the choice is out of range.
+            RuntimeError: If the session is already finished.
+        """
+        question = self.current_question
+        if question is None:
+            raise RuntimeError("Quiz session is already finished.")
+
+        num_choices = len(question.choices)
+        if not 0 <= choice < num_choices:
+            raise ValueError(f"Please enter a number between 1 and {num_choices}.")
+
+        if self._hint_used:
+            self.hints_used += 1
+
+        with span("answers.score"):
+            correct, points = score_answer(question, choice, self._hint_used)
+        inc("answers.scored")
+
+        if correct:
+            self.score += points
+            self.streak += 1
+            if self.streak > self.max_streak:
+                self.max_streak = self.streak
+        else:
+            self.streak = 0
+
+        self._advance(question, choice, correct)
+        return AnswerOutcome(correct, points, question.choices[question.answer_index])
+
+    def timeout(self) -> AnswerOutcome:
+        """Record the current question as missed because its time ran out.
+
+        Returns:
+            AnswerOutcome with no points and the correct answer text.
+
+        Raises:
+            RuntimeError: If the session is already finished.
+        """
+        question = self.current_question
+        if question is None:
+            raise RuntimeError("Quiz session is already finished.")
+
+        if self._hint_used:
+            self.hints_used += 1
+        self.streak = 0
+        self._advance(question, -1, False)
+        return AnswerOutcome(False, 0.0, question.choices[question.answer_index], timed_out=True)
+
+    def finish(self) -> Result:
+        """Build the Result for this session.
+
+        Returns:
+            Result object containing quiz statistics and score.
+        """
+        return Result(
+            player=self.player,
+            score=self.score,
+            total=self.total,
+            streak_max=self.max_streak,
+            seconds=self._clock() - self._start_time,
+            category=self.category,
+            timestamp=datetime.utcnow().isoformat() + "Z",
+            hints_used=self.hints_used
+        )
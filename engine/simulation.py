@@ -0,0 +1,274 @@
+"""Headless batch simulation of scripted quiz sessions.
+
+Sessions are simulated a chunk at a time with NumPy: questions, choices and
+hints are drawn for a ``sessions x limit`` matrix and scored with
+``score_answers_batch``, which applies the same points, streak and hint rules
+as QuizSession. There are no prompts, printing, sleeps or Result objects, so
+a single core plays hundreds of thousands of sessions per second. Answers
+come from pluggable policies and statistics are aggregated per chunk, then
+merged across worker processes.
+
+Requires NumPy (``pip install numpy``).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from game.models import Question
+from engine.scoring import score_answers_batch
+
+BATCH_ANSWERS = 1 << 20  # answers drawn and scored per NumPy batch
+
+
+class AnswerPolicy:
+    """Scripted player: answers correctly with some probability and may use hints.
+
+    Subclass and override ``choose_batch`` for other behaviours.
+    """
+
+    def __init__(self, accuracy: Optional[float] = None, hint_rate: float = 0.0):
+        """Initialize the policy.
+
+        Args:
+            accuracy: Probability of choosing the correct answer, or None to
+                pick uniformly at random among all choices.
+            hint_rate: Probability of requesting a hint on each question.
+        """
+        self.accuracy = accuracy
+        self.hint_rate = hint_rate
+
+    def choose_batch(self, correct_index, num_choices, rng):
+        """Pick answers for a matrix of questions.
+
+        Args:
+            correct_index: Integer array of correct answer indices.
+            num_choices: Integer array of choice counts, same shape.
+            rng: numpy.random.Generator for this simulation chunk.
+
+        Returns:
+            Tuple of (zero-indexed choices, hint flags), arrays of the same shape.
+        """
+        import numpy as np
+
+        shape = correct_index.shape
+        if self.hint_rate > 0.0:
+            hints = rng.random(shape) < self.hint_rate
+        else:
+            hints = np.zeros(shape, dtype=bool)
+
+        if self.accuracy is None:
+            return (rng.random(shape) * num_choices).astype(np.int64), hints
+
+        # Pick uniformly among the wrong choices when not answering correctly;
+        # a question with a single choice has none, so it is always answered correctly
+        wrong = (rng.random(shape) * (num_choices - 1)).astype(np.int64)
+        wrong += wrong >= correct_index
+        correct = (rng.random(shape) < self.accuracy) | (num_choices <= 1)
+        return np.where(correct, correct_index, wrong), hints
+
+
+def make_policy(name: str, accuracy: float = 0.5, hint_rate: float = 0.0) -> AnswerPolicy:
+    """Build a named answer policy.
+
+    Args:
+        name: One of "random", "correct" or "accuracy".
+        accuracy: Correct-answer probability for the "accuracy" policy.
+        hint_rate: Probability of using a hint on each question.
+
+    Returns:
+        The configured AnswerPolicy.
+
+    Raises:
+        ValueError: If the policy name is unknown.
+    """
+    if name == "random":
+        return AnswerPolicy(None, hint_rate)
+    if name == "correct":
+        return AnswerPolicy(1.0, hint_rate)
+    if name == "accuracy":
+        return AnswerPolicy(accuracy, hint_rate)
+    raise ValueError(f"Unknown policy: {name} (expected random, correct or accuracy)")
+
+
+@dataclass
+class SimulationStats:
+    """Aggregated Result statistics over many simulated sessions."""
+    sessions: int = 0
+    questions: int = 0
+    total_score: float = 0.0
+    total_score_sq: float = 0.0
+    total_streak: int = 0
+    max_streak: int = 0
+    hints_used: int = 0
+    perfect_sessions: int = 0
+    score_counts: Dict[float, int] = field(default_factory=dict)
+
+    def merge(self, other: "SimulationStats") -> None:
+        """Add another chunk's statistics into this one."""
+        self.sessions += other.sessions
+        self.questions += other.questions
+        self.total_score += other.total_score
+        self.total_score_sq += other.total_score_sq
+        self.total_streak += other.total_streak
+        self.max_streak = max(self.max_streak, other.max_streak)
+        self.hints_used += other.hints_used
+        self.perfect_sessions += other.perfect_sessions
+        for score, count in other.score_counts.items():
+            self.score_counts[score] = self.score_counts.get(score, 0) + count
+
+    def summary(self) -> dict:
+        """Return headline statistics as a JSON-serializable dict."""
+        sessions = self.sessions or 1
+        mean = self.total_score / sessions
+        variance = max(self.total_score_sq / sessions - mean * mean, 0.0)
+        return {
+            "sessions": self.sessions,
+            "questions": self.questions,
+            "mean_score": mean,
+            "stdev_score": variance ** 0.5,
+            "mean_points_per_question": self.total_score / (self.questions or 1),
+            "mean_streak_max": self.total_streak / sessions,
+            "max_streak": self.max_streak,
+            "hints_per_session": self.hints_used / sessions,
+            "perfect_sessions": self.perfect_sessions,
+            "score_distribution": {str(k): v for k, v in sorted(self.score_counts.items())},
+        }
+
+
+def score_sessions(chosen, correct_index, hints):
+    """Score a matrix of answers, one row per session.
+
+    Args:
+        chosen: ``sessions x limit`` array of chosen answer indices.
+        correct_index: Correct answer indices, same shape.
+        hints: Hint flags, same shape.
+
+    Returns:
+        Tuple of per-session arrays (score, best streak, hints used), as
+        QuizSession would report them.
+    """
+    import numpy as np
+
+    sessions, limit = chosen.shape
+    _, points, streak_max = score_answers_batch(
+        chosen.ravel(), correct_index.ravel(), hints.ravel(), np.repeat(np.arange(sessions), limit)
+    )
+    return points.reshape(sessions, limit).sum(axis=1), streak_max, hints.sum(axis=1)
+
+
+def _deal(rng, pool_size: int, sessions: int, limit: int):
+    """Deal each session ``limit`` distinct question indices.
+
+    Like dealing from a shuffled deck that is reshuffled when exhausted:
+    each pass over the pool is a fresh permutation, cut into sessions.
+    """
+    import numpy as np
+
+    per_pass = pool_size // limit
+    passes = -(-sessions // per_pass)
+    decks = rng.permuted(np.tile(np.arange(pool_size), (passes, 1)), axis=1)
+    return decks[:, :per_pass * limit].reshape(-1, limit)[:sessions]
+
+
+def simulate_chunk(questions: List[Question], policy: AnswerPolicy, sessions: int, limit: int, seed: Optional[int] = None) -> SimulationStats:
+    """Simulate sessions in the current process.
+
+    Each session is dealt ``limit`` distinct questions, sampling like
+    QuestionBank.select. Sessions are drawn and scored in NumPy batches of
+    about ``BATCH_ANSWERS`` answers.
+
+    Args:
+        questions: Pool of questions to draw sessions from.
+        policy: Policy producing each answer.
+        sessions: Number of sessions to play.
+        limit: Questions per session.
+        seed: Optional seed for reproducibility.
+
+    Returns:
+        SimulationStats for the chunk.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    stats = SimulationStats()
+    limit = min(limit, len(questions))
+    if limit <= 0 or sessions <= 0:
+        return stats
+
+    answers = np.array([q.answer_index for q in questions], dtype=np.int64)
+    num_choices = np.array([len(q.choices) for q in questions], dtype=np.int64)
+    batch_sessions = max(BATCH_ANSWERS // limit, 1)
+
+    for start in range(0, sessions, batch_sessions):
+        count = min(batch_sessions, sessions - start)
+        dealt = _deal(rng, len(questions), count, limit)
+        correct_index = answers[dealt]
+        chosen, hints = policy.choose_batch(correct_index, num_choices[dealt], rng)
+        scores, streak_max, hints_used = score_sessions(chosen, correct_index, hints)
+
+        stats.total_score += float(scores.sum())
+        stats.total_score_sq += float(np.square(scores).sum())
+        stats.total_streak += int(streak_max.sum())
+        stats.max_streak = max(stats.max_streak, int(streak_max.max()))
+        stats.hints_used += int(hints_used.sum())
+        stats.perfect_sessions += int((scores == limit).sum())
+        values, counts = np.unique(scores, return_counts=True)
+        for score, score_count in zip(values.tolist(), counts.tolist()):
+            stats.score_counts[score] = stats.score_counts.get(score, 0) + score_count
+
+    stats.sessions = sessions
+    stats.questions = sessions * limit
+    return stats
+
+
+_worker_state: dict = {}
+
+
+def _init_worker(questions: List[Question], policy: AnswerPolicy) -> None:
+    """Receive the question pool and policy once per worker process."""
+    _worker_state["questions"] = questions
+    _worker_state["policy"] = policy
+
+
+def _simulate_task(task: tuple) -> SimulationStats:
+    """Process pool entry point for one chunk of (sessions, limit, seed)."""
+    return simulate_chunk(_worker_state["questions"], _worker_state["policy"], *task)
+
+
+def run_simulation(
+    questions: List[Question],
+    policy: AnswerPolicy,
+    sessions: int,
+    limit: int = 10,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    chunk_size: int = 50000
+) -> SimulationStats:
+    """Simulate many sessions, optionally across a process pool.
+
+    Args:
+        questions: Pool of questions to draw sessions from.
+        policy: Policy producing each answer (must be picklable for workers > 1).
+        sessions: Total number of sessions to play.
+        limit: Questions per session.
+        workers: Number of worker processes; 1 runs in-process.
+        seed: Optional base seed; chunk i uses seed + i.
+        chunk_size: Sessions per task handed to a worker.
+
+    Returns:
+        SimulationStats merged over all sessions.
+    """
+    tasks = []
+    for idx, start in enumerate(range(0, sessions, chunk_size)):
+        chunk_seed = None if seed is None else seed + idx
+        tasks.append((min(chunk_size, sessions - start), limit, chunk_seed))
+
+    stats = SimulationStats()
+    if workers <= 1:
+        for task in tasks:
+            stats.merge(simulate_chunk(questions, policy, *task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(questions, policy)) as pool:
+            for chunk_stats in pool.map(_simulate_task, tasks):
+                stats.merge(chunk_stats)
+    return stats
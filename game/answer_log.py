@@ -0,0 +1,447 @@
+"""Append-only binary log of per-answer events.
+
+Every answered or timed-out question is appended to ``answers.bin`` (next
+to the leaderboard by default) as one fixed-width record:
+
+* session id (random 64-bit, shared by a session's answers),
+* wall-clock timestamp,
+* question id (UTF-8, up to 40 bytes; see below),
+* response time in milliseconds,
+* chosen index (-1 for a timeout) and flags (correct, hint used, timed out),
+* a marker byte, the last one written.
+
+Question ids longer than 40 bytes are stored as ``0xff`` followed by a hex
+digest of the id (a byte UTF-8 never starts with, so they cannot clash with
+short ids) and the full id is appended once to a side table,
+``answers.bin.ids``, which readers use to report it.
+
+Records are buffered in memory and appended under a file lock with one write
+per flush, so writers in several processes never interleave within a record.
+The log is analytics data and is not fsynced; a record torn by a crash is
+padded out with zeros by the next writer, so it lacks its marker and readers
+skip it.
+
+Aggregation maps the file with NumPy and computes per-question accuracy,
+hint rate and response-time statistics column-wise, so millions of events are
+summarized without building a Python object per event.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from game.models import AnswerEvent
+from utils.filelock import FileLock
+from utils.metrics import inc, span
+
+HEADER = struct.Struct("<4sHH")  # magic, version, record size
+RECORD = struct.Struct("<Qd40sIbBBx")  # session, timestamp, question id, ms, choice, flags, marker
+MAGIC = b"QANS"
+VERSION = 2
+MARKER = 0xA5
+QUESTION_ID_BYTES = 40
+LONG_ID_PREFIX = b"\xff"
+FLAG_CORRECT = 1
+FLAG_HINT = 2
+FLAG_TIMEOUT = 4
+FLUSH_BYTES = 64 * 1024
+CHUNK_RECORDS = 1 << 20  # records decoded per NumPy batch when aggregating
+MAX_MS = 2**32 - 1
+
+
+def answer_log_path(config: dict) -> Path:
+    """Return the configured answer log, defaulting to one next to the leaderboard."""
+    path = config.get("answer_log_path")
+    return Path(path) if path else Path(config["leaderboard_path"]).with_name("answers.bin")
+
+
+def long_ids_path(path: Path) -> Path:
+    """Return the side table of question ids too long for a record."""
+    return Path(f"{path}.ids")
+
+
+def stored_question_id(question_id: str) -> bytes:
+    """Return the bytes stored for a question id: the id, or a digest if it is too long."""
+    raw = question_id.encode()
+    if len(raw) <= QUESTION_ID_BYTES:
+        return raw
+    return LONG_ID_PREFIX + hashlib.blake2b(raw, digest_size=16).hexdigest().encode()
+
+
+def read_long_ids(path: Path) -> Dict[bytes, str]:
+    """Map stored digests back to the long question ids of a log.
+
+    Args:
+        path: Log file.
+
+    Returns:
+        Stored id to full question id; empty if there is no side table.
+    """
+    long_ids = {}
+    try:
+        with open(long_ids_path(path), "rb") as f:
+            for line in f:
+                try:
+                    question_id = json.loads(line)
+                except ValueError:
+                    continue  # torn by a crash
+                long_ids[stored_question_id(question_id)] = question_id
+    except FileNotFoundError:
+        pass
+    return long_ids
+
+
+def _question_id(stored: bytes, long_ids: Optional[Dict[bytes, str]] = None) -> str:
+    """Decode a stored question id, resolving digests through the side table."""
+    stored = stored.rstrip(b"\0")
+    if stored.startswith(LONG_ID_PREFIX):
+        return (long_ids or {}).get(stored, "#" + stored[1:].decode())
+    return stored.decode(errors="ignore")
+
+
+def encode_event(event: AnswerEvent) -> bytes:
+    """Pack an AnswerEvent into one log record."""
+    flags = (FLAG_CORRECT if event.correct else 0) | (FLAG_HINT if event.hint_used else 0)
+    if event.choice < 0:
+        flags |= FLAG_TIMEOUT
+    ms = min(max(round(event.seconds * 1000), 0), MAX_MS)
+    return RECORD.pack(
+        event.session, event.timestamp, stored_question_id(event.question_id),
+        ms, max(min(event.choice, 127), -1), flags, MARKER
+    )
+
+
+def decode_event(record: bytes, long_ids: Optional[Dict[bytes, str]] = None) -> AnswerEvent:
+    """Unpack one log record into an AnswerEvent.
+
+    Args:
+        record: One record's bytes.
+        long_ids: Side table from ``read_long_ids``, to report long ids in full.
+
+    Raises:
+        ValueError: If the record was torn by a crash.
+    """
+    session, timestamp, question_id, ms, choice, flags, marker = RECORD.unpack(record)
+    if marker != MARKER:
+        raise ValueError("Torn answer log record")
+    return AnswerEvent(
+        session=session,
+        question_id=_question_id(question_id, long_ids),
+        choice=choice,
+        correct=bool(flags & FLAG_CORRECT),
+        hint_used=bool(flags & FLAG_HINT),
+        seconds=ms / 1000,
+        timestamp=timestamp
+    )
+
+
+class AnswerLog:
+    """Buffered appender for the answer log, safe to share between threads."""
+
+    def __init__(self, path: Path):
+        """Initialize the log.
+
+        Args:
+            path: Log file; created with a header on first flush.
+        """
+        self.path = Path(path)
+        self._buffer = bytearray()
+        self._long_ids: List[str] = []  # long ids not yet in the side table
+        self._known_long_ids = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "AnswerLog":
+        """Build the log at the configured path."""
+        return cls(answer_log_path(config))
+
+    def buffer(self, event: AnswerEvent) -> bool:
+        """Buffer one event without writing anything.
+
+        Args:
+            event: The answer to log.
+
+        Returns:
+            Whether the buffer is large enough to be flushed.
+        """
+        with self._lock:
+            self._buffer += encode_event(event)
+            if len(event.question_id.encode()) > QUESTION_ID_BYTES and event.question_id not in self._known_long_ids:
+                self._known_long_ids.add(event.question_id)
+                self._long_ids.append(event.question_id)
+            return len(self._buffer) >= FLUSH_BYTES
+
+    def record(self, event: AnswerEvent) -> None:
+        """Buffer one event, flushing once the buffer is large.
+
+        The flush takes a file lock and writes, so callers on an event loop
+        should use ``buffer`` and run ``flush`` in a thread instead.
+
+        Args:
+            event: The answer to log.
+        """
+        if self.buffer(event):
+            self.flush()
+
+    def flush(self) -> int:
+        """Append the buffered events to the log.
+
+        Returns:
+            Number of events written.
+
+        Raises:
+            ValueError: If the file is not an answer log of this version.
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            data, self._buffer = bytes(self._buffer), bytearray()
+            long_ids, self._long_ids = self._long_ids, []
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with FileLock(Path(f"{self.path}.lock")):
+                if long_ids:
+                    # Before the records, so readers can always resolve them
+                    with open(long_ids_path(self.path), "ab") as f:
+                        f.write(b"".join(json.dumps(question_id).encode() + b"\n" for question_id in long_ids))
+                fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    size = os.fstat(fd).st_size
+                    if size == 0:
+                        os.write(fd, HEADER.pack(MAGIC, VERSION, RECORD.size))
+                    else:
+                        header = os.pread(fd, HEADER.size, 0)
+                        if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION, RECORD.size):
+                            raise ValueError(f"{self.path} is not a version {VERSION} answer log")
+                        if (size - HEADER.size) % RECORD.size:
+                            # Realign after a record torn by a crash; it has no marker, so readers skip it
+                            os.write(fd, bytes(RECORD.size - (size - HEADER.size) % RECORD.size))
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+        count = len(data) // RECORD.size
+        inc("answers.logged", count)
+        return count
+
+
+def _event_dtype():
+    """NumPy dtype matching RECORD."""
+    import numpy as np
+
+    dtype = np.dtype([
+        ("session", "<u8"),
+        ("timestamp", "<f8"),
+        ("question", f"S{QUESTION_ID_BYTES}"),
+        ("ms", "<u4"),
+        ("choice", "i1"),
+        ("flags", "u1"),
+        ("marker", "u1"),
+        ("pad", "V1"),
+    ])
+    assert dtype.itemsize == RECORD.size
+    return dtype
+
+
+def read_events(path: Path):
+    """Map the answer log as a NumPy structured array (read-only).
+
+    Requires NumPy (``pip install numpy``).
+
+    Args:
+        path: Log file.
+
+    Returns:
+        Structured array with ``session``, ``timestamp``, ``question``,
+        ``ms``, ``choice``, ``flags`` and ``marker`` fields; empty if the log
+        is missing. Records torn by a crash lack ``MARKER``.
+
+    Raises:
+        ValueError: If the file is not an answer log of this version.
+    """
+    import numpy as np
+
+    dtype = _event_dtype()
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+    except FileNotFoundError:
+        return np.empty(0, dtype=dtype)
+    if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION, RECORD.size):
+        raise ValueError(f"{path} is not a version {VERSION} answer log")
+
+    count = (size - HEADER.size) // RECORD.size  # a torn last record is ignored
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+
+
+@dataclass
+class QuestionStats:
+    """Aggregated answers to one question."""
+    question_id: str
+    answers: int
+    accuracy: float
+    hint_rate: float
+    timeout_rate: float
+    mean_seconds: float
+    median_seconds: float
+    p90_seconds: float
+
+
+def _question_keys(question_ids):
+    """Hash an array of 40-byte question ids to 64-bit keys (multiply-xor per word)."""
+    import numpy as np
+
+    words = QUESTION_ID_BYTES // 8
+    mix = np.random.default_rng(0).integers(1, 2**63, size=words, dtype=np.uint64) | np.uint64(1)
+    ids = np.ascontiguousarray(question_ids).view(np.uint64).reshape(-1, words)
+    key = np.zeros(len(ids), dtype=np.uint64)
+    for word in range(words):  # wraps mod 2**64
+        key = (key ^ ids[:, word]) * mix[word]
+    return key
+
+
+def question_stats(path: Path, min_answers: int = 1) -> List[QuestionStats]:
+    """Aggregate the answer log into per-question statistics.
+
+    Question ids are reduced to 64-bit keys chunk by chunk, so the 64-byte
+    records are never loaded whole; only the key, response time and flags
+    columns are. Each event's id is then checked against its group's, and
+    events whose ids merely collided with it are split into groups of their
+    own, so every group holds exactly one question. Records torn by a crash
+    (no marker) are left out. Response-time percentiles are exact and
+    include timeouts.
+
+    Requires NumPy (``pip install numpy``).
+
+    Args:
+        path: Log file.
+        min_answers: Leave out questions answered fewer times than this.
+
+    Returns:
+        Statistics per question, in question id order.
+
+    Raises:
+        ValueError: If the file is not an answer log of this version.
+    """
+    import numpy as np
+
+    with span("answers.aggregate"):
+        events = read_events(path)
+        count = len(events)
+        keys = np.empty(count, dtype=np.uint64)
+        ms = np.empty(count, dtype=np.uint32)
+        flags = np.empty(count, dtype=np.uint8)
+        complete = np.empty(count, dtype=bool)
+
+        for start in range(0, count, CHUNK_RECORDS):
+            chunk = events[start:start + CHUNK_RECORDS]
+            keys[start:start + len(chunk)] = _question_keys(chunk["question"])
+            ms[start:start + len(chunk)] = chunk["ms"]
+            flags[start:start + len(chunk)] = chunk["flags"]
+            complete[start:start + len(chunk)] = chunk["marker"] == MARKER
+
+        # Drop torn records; rows maps what is left back to log positions
+        rows = None
+        if not complete.all():
+            rows = np.flatnonzero(complete)
+            keys, ms, flags = keys[rows], ms[rows], flags[rows]
+            count = len(rows)
+
+        def question_column(select):
+            return events["question"][select] if rows is None else events["question"][rows[select]]
+
+        if count == 0:
+            return []
+
+        # Group equal keys
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        boundary = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        inverse = np.empty(count, dtype=np.int64)
+        inverse[order] = np.cumsum(boundary) - 1
+        question_ids = question_column(order[boundary])
+
+        # Split off events whose ids only share their group's key
+        collided = []
+        for start in range(0, count, CHUNK_RECORDS):
+            chunk_ids = question_column(slice(start, start + CHUNK_RECORDS))
+            mismatch = np.flatnonzero(chunk_ids != question_ids[inverse[start:start + len(chunk_ids)]])
+            collided.append(mismatch + start)
+        collided = np.concatenate(collided)
+        if len(collided):
+            extra_ids, extra_groups = np.unique(question_column(collided), return_inverse=True)
+            inverse[collided] = len(question_ids) + extra_groups.ravel()
+            question_ids = np.concatenate([question_ids, extra_ids])
+
+        groups = len(question_ids)
+        answers = np.bincount(inverse, minlength=groups)
+        starts = np.r_[0, np.cumsum(answers)[:-1]]
+        correct = np.bincount(inverse, weights=flags & FLAG_CORRECT, minlength=groups)
+        hinted = np.bincount(inverse, weights=(flags & FLAG_HINT) > 0, minlength=groups)
+        timeouts = np.bincount(inverse, weights=(flags & FLAG_TIMEOUT) > 0, minlength=groups)
+        total_ms = np.bincount(inverse, weights=ms, minlength=groups)
+
+        # One sort of (group << 32 | ms) puts each question's times in a sorted run
+        runs = inverse.astype(np.uint64) << np.uint64(32) | ms
+        runs.sort()
+        sorted_ms = (runs & np.uint64(MAX_MS)).astype(np.uint32)
+        median = sorted_ms[starts + (answers - 1) // 2]
+        p90 = sorted_ms[starts + ((answers - 1) * 9) // 10]
+
+        shown = np.flatnonzero(answers >= min_answers)
+        counts = answers[shown]
+        columns = zip(
+            question_ids[shown].tolist(),
+            counts.tolist(),
+            (correct[shown] / counts).tolist(),
+            (hinted[shown] / counts).tolist(),
+            (timeouts[shown] / counts).tolist(),
+            (total_ms[shown] / counts / 1000).tolist(),
+            (median[shown] / 1000).tolist(),
+            (p90[shown] / 1000).tolist()
+        )
+        long_ids = read_long_ids(path)
+        stats = [QuestionStats(_question_id(qid, long_ids), *rest) for qid, *rest in columns]
+        return sorted(stats, key=lambda s: s.question_id)
+
+
+SORT_KEYS = {
+    "accuracy": lambda s: (s.accuracy, -s.answers),
+    "hints": lambda s: (-s.hint_rate, -s.answers),
+    "latency": lambda s: (-s.median_seconds, -s.answers),
+    "answers": lambda s: (-s.answers, s.question_id),
+}
+
+
+def format_question_stats(stats: List[QuestionStats]) -> str:
+    """Format per-question statistics as a printable table.
+
+    Args:
+        stats: Statistics to show, in display order.
+
+    Returns:
+        Formatted table string.
+    """
+    if not stats:
+        return "No answers logged yet!"
+
+    lines = []
+    lines.append("=" * 78)
+    lines.append(f"{'Question':<16} {'Answers':<9} {'Correct':<9} {'Hints':<9} {'Timeouts':<9} "
+                 f"{'Median (s)':<11} {'P90 (s)':<8}")
+    lines.append("=" * 78)
+
+    for s in stats:
+        lines.append(
+            f"{s.question_id:<16} {s.answers:<9} {s.accuracy:<9.1%} {s.hint_rate:<9.1%} {s.timeout_rate:<9.1%} "
+            f"{s.median_seconds:<11.1f} {s.p90_seconds:<8.1f}"
+        )
+
+    lines.append("=" * 78)
+    return "\n".join(lines)
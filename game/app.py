@@ -1,75 +1,128 @@
-"""CLI entry point for the AI Quiz Game."""
+"""CLI entry point for the AI Quiz Game.
+
+This module is kept cheap to import. Showing the leaderboard
+(``--leaderboard N`` or ``leaderboard N``) is answered directly, without
+importing Typer or the quiz engine; every other invocation is handed to the
+Typer app in ``game.cli``, whose commands import only what they use.
+
+Setting ``QUIZ_METRICS=<file>`` or ``QUIZ_PROFILE=<file>`` instruments any
+invocation (see ``utils.metrics``).
+"""
 
 import sys
-from pathlib import Path
-from typing import Optional
-import typer
+from typing import List, Optional
 from game.config import load_config
-from game.io_manager import load_questions, save_result
-from game.leaderboard import top_n, format_table
-from engine.question_bank import select_questions
-from engine.quiz_engine import run_quiz
 
 
-app = typer.Typer()
+def get_available_categories():
+    """Get list of available question categories from the catalog manifest."""
+    from game.catalog import load_catalog
 
+    return load_catalog(load_config()["data_folder"]).categories()
 
-def get_available_categories():
-    """Get list of available question categories from data folder."""
-    config = load_config()
-    data_folder = config["data_folder"]
-    category_files = list(data_folder.glob("questions_*.json"))
-    categories = [f.stem.replace("questions_", "") for f in category_files]
-    return sorted(categories)
-
-
-@app.command()
-def main(
-    category: str = typer.Option("general", "--category", "-c", help="Question category (general, science)"),
-    limit: int = typer.Option(10, "--limit", "-l", help="Number of questions"),
-    difficulty: Optional[str] = typer.Option(None, "--difficulty", "-d", help="Filter by difficulty (easy/medium/hard)"),
-    hints: bool = typer.Option(False, "--hints", "-h", help="Enable hints (halves points when used)"),
-    leaderboard: Optional[int] = typer.Option(None, "--leaderboard", "-b", help="Show top N scores and exit")
-):
-    """Run the AI Quiz Game.
-
-    Examples:
-        python -m game.app
-        python -m game.app --category science --limit 5
-        python -m game.app --hints
-        python -m game.app --leaderboard 10
+
+def load_bank(category: str):
+    """Load a category as a QuestionBank, or a LazyQuestionBank for JSONL files.
+
+    A QuestionBank holds its questions in a columnar QuestionTable, so a
+    loaded bank costs far less memory than a list of Question objects.
+
+    Raises:
+        FileNotFoundError: If the category has no question file.
     """
+    from engine.question_bank import QuestionBank, LazyQuestionBank
+    from game.io_manager import load_question_table, question_file
+
+    file_path = question_file(category)
+    if file_path.suffix == ".jsonl":
+        return LazyQuestionBank(file_path)
+    return QuestionBank(load_question_table(category))
+
+
+def load_mixed_bank(categories: List[str], max_workers: Optional[int] = None):
+    """Load several categories concurrently as one MixedQuestionBank.
+
+    Each bank is loaded on a thread pool, so reading one file overlaps with
+    reading and decoding the others. Question counts come from the catalog,
+    and category and difficulty weights from the configuration.
+
+    Args:
+        categories: Category names.
+        max_workers: Loader threads (default: one per category, at most 8).
+
+    Raises:
+        FileNotFoundError: If a category has no question file.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from engine.question_bank import MixedQuestionBank
+    from game.catalog import load_catalog
+
     config = load_config()
+    catalog = load_catalog(config["data_folder"])
+    counts = {category: catalog.difficulties(category) for category in categories}
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(categories), 8)) as pool:
+        banks = dict(zip(categories, pool.map(load_bank, categories)))
+
+    return MixedQuestionBank(
+        banks,
+        counts,
+        config.get("category_weights"),
+        config.get("difficulty_weights")
+    )
+
+
+def show_leaderboard(n: int) -> None:
+    """Print the top n results as a table."""
+    from game.leaderboard import top_n, format_table
+
+    print(format_table(top_n(n)))
 
-    # Show leaderboard and exit if requested
-    if leaderboard is not None:
-        results = top_n(leaderboard)
-        print(format_table(results))
-        return
 
-    # Load questions
+def _leaderboard_request(argv: List[str]) -> Optional[int]:
+    """Return N if the arguments only ask for the top-N leaderboard.
+
+    Recognizes ``-b N``, ``--leaderboard N``, ``--leaderboard=N`` and
+    ``leaderboard N``. Anything else, including a bad N, returns None so that
+    Typer parses it and reports errors as usual.
+    """
+    if len(argv) == 2 and argv[0] in ("-b", "--leaderboard", "leaderboard"):
+        value = argv[1]
+    elif len(argv) == 1 and argv[0].startswith("--leaderboard="):
+        value = argv[0].split("=", 1)[1]
+    else:
+        return None
     try:
-        questions = load_questions(category)
-    except FileNotFoundError as e:
-        print(f"Error: {e}")
-        available = get_available_categories()
-        print(f"Available categories: {', '.join(available)}")
-        sys.exit(1)
+        return int(value)
+    except ValueError:
+        return None
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Run the command line, taking the fast path for leaderboard lookups.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:]).
+    """
+    from utils.metrics import instrument_from_env
 
-    # Select questions based on filters
-    selected = select_questions(questions, limit, difficulty)
+    with instrument_from_env():
+        n = _leaderboard_request(sys.argv[1:] if argv is None else argv)
+        if n is not None:
+            show_leaderboard(n)
+            return
 
-    if not selected:
-        print(f"No questions found matching your criteria.")
-        sys.exit(1)
+        from game.cli import app
+        app(args=argv)
 
-    # Run the quiz
-    result = run_quiz(selected, hints_enabled=hints)
 
-    # Save the result
-    save_result(result)
-    print("Your result has been saved to the leaderboard!")
+def __getattr__(name):
+    """Expose the Typer app as ``game.app.app`` without importing it eagerly."""
+    if name == "app":
+        from game.cli import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app()
+    run()
@@ -0,0 +1,302 @@
+"""Catalog manifest of the question banks in the data folder.
+
+The manifest (``data/.cache/catalog.json``) records, for every
+``questions_<category>.json`` / ``.jsonl`` file, its size, mtime, SHA-256
+and question counts per difficulty. Loading the catalog only stats the data
+folder and the files it lists:
+
+* the folder is listed again only if its mtime changed (a file was added,
+  removed or renamed);
+* a file is hashed again only if its mtime or size changed, and its
+  questions are counted again only if its content hash changed, and then
+  only once the counts are asked for (e.g. to validate ``--difficulty``).
+
+The CLI lists categories and validates ``--category``, ``--difficulty`` and
+``--limit`` from the catalog before loading a bank, and the compiled question
+cache is keyed on the catalog's content hash.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CATALOG_VERSION = 1
+BANK_SUFFIXES = (".json", ".jsonl")  # a .json bank takes precedence
+# A folder mtime this close to the scan may still change within the same
+# timestamp tick, so it is not trusted to mean "nothing added"
+RACY_NS = 1_000_000_000
+HASH_CHUNK_BYTES = 1024 * 1024
+DIFFICULTY_PATTERN = re.compile(rb'"difficulty"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+@dataclass
+class CategoryEntry:
+    """One question bank file as recorded in the catalog."""
+    file: str
+    category: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    questions: Optional[int] = None  # None until counted, like difficulties
+    difficulties: Optional[Dict[str, int]] = None
+
+
+def catalog_path(data_folder: Path) -> Path:
+    """Return the manifest path for a data folder."""
+    return Path(data_folder) / ".cache" / "catalog.json"
+
+
+def _bank_category(name: str) -> Optional[str]:
+    """Return the category of a bank file name, or None if it is not a bank."""
+    for suffix in BANK_SUFFIXES:
+        if name.startswith("questions_") and name.endswith(suffix):
+            return name[len("questions_"):-len(suffix)]
+    return None
+
+
+def _count_difficulties(path: Path) -> Dict[str, int]:
+    """Count a bank's questions per (lower-cased) difficulty.
+
+    Scans the file a line at a time for ``"difficulty"`` fields instead of
+    parsing it, so neither the file nor its questions are held in memory.
+    """
+    counts: Counter = Counter()
+    with open(path, "rb") as f:
+        for line in f:
+            for match in DIFFICULTY_PATTERN.finditer(line):
+                counts[json.loads(b'"' + match.group(1) + b'"').lower()] += 1
+    return dict(counts)
+
+
+def _describe(path: Path, stat: os.stat_result, previous: Optional[CategoryEntry]) -> CategoryEntry:
+    """Build the entry for a new or changed bank file."""
+    import hashlib  # only needed when a bank changed; kept off the startup path
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+
+    # Only touched: keep the counts; otherwise they are recounted when needed
+    unchanged = previous is not None and previous.sha256 == sha256
+    return CategoryEntry(
+        file=path.name,
+        category=_bank_category(path.name),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=sha256,
+        questions=previous.questions if unchanged else None,
+        difficulties=previous.difficulties if unchanged else None
+    )
+
+
+class Catalog:
+    """The question banks of a data folder and their question counts."""
+
+    def __init__(self, data_folder: Path, files: Dict[str, CategoryEntry], manifest: Optional[dict] = None):
+        """Initialize the catalog.
+
+        Args:
+            data_folder: Folder holding the question banks.
+            files: Entries keyed by file name.
+            manifest: The manifest holding ``files``, saved again when
+                counts are added to it (default: counts are not saved).
+        """
+        self.data_folder = Path(data_folder)
+        self.files = files
+        self.manifest = manifest
+
+    def categories(self) -> List[str]:
+        """Return the available category names, sorted."""
+        return sorted({entry.category for entry in self.files.values()})
+
+    def entry(self, category: str) -> CategoryEntry:
+        """Return the entry of the file that serves a category.
+
+        Raises:
+            FileNotFoundError: If the category has no question file.
+        """
+        for suffix in BANK_SUFFIXES:
+            entry = self.files.get(f"questions_{category}{suffix}")
+            if entry is not None:
+                return entry
+        raise FileNotFoundError(f"No questions found for category: {category}")
+
+    def path(self, category: str) -> Path:
+        """Return the question file that serves a category.
+
+        Raises:
+            FileNotFoundError: If the category has no question file.
+        """
+        return self.data_folder / self.entry(category).file
+
+    def difficulties(self, category: str) -> Dict[str, int]:
+        """Return a category's question counts per (lower-cased) difficulty.
+
+        Counts missing from the manifest (the bank is new or changed) are
+        computed with a line scan of the bank and saved.
+
+        Raises:
+            FileNotFoundError: If the category has no question file.
+        """
+        entry = self.entry(category)
+        if entry.difficulties is None:
+            entry.difficulties = _count_difficulties(self.data_folder / entry.file)
+            entry.questions = sum(entry.difficulties.values())
+            if self.manifest is not None:
+                _write_manifest(catalog_path(self.data_folder), self.manifest)
+        return entry.difficulties
+
+    def validate(self, category: str, difficulty: Optional[str] = None, limit: Optional[int] = None) -> Optional[int]:
+        """Check quiz options against the catalog before loading any bank.
+
+        Args:
+            category: Category name.
+            difficulty: Optional difficulty filter.
+            limit: Optional number of questions requested.
+
+        Returns:
+            Number of questions matching the category and difficulty. Without
+            a difficulty the bank is not counted, so this is None if its
+            counts are not known yet.
+
+        Raises:
+            FileNotFoundError: If the category has no question file.
+            ValueError: If the difficulty does not occur in the category or
+                the limit is not positive.
+        """
+        entry = self.entry(category)
+        if limit is not None and limit < 1:
+            raise ValueError(f"Limit must be at least 1, got {limit}.")
+        if difficulty is None:
+            return entry.questions
+        difficulties = self.difficulties(category)
+        available = difficulties.get(difficulty.lower(), 0)
+        if available == 0:
+            choices = ", ".join(sorted(difficulties)) or "none"
+            raise ValueError(f"No {difficulty} questions in category {category} (available: {choices}).")
+        return available
+
+    def validate_mix(
+        self, categories: List[str], difficulty: Optional[str] = None, limit: Optional[int] = None
+    ) -> Optional[int]:
+        """Check options for a quiz drawn from several categories.
+
+        The difficulty only has to occur in one of the categories.
+
+        Returns:
+            Number of questions matching the categories and difficulty; as
+            for ``validate``, None without a difficulty if a bank has not
+            been counted yet.
+
+        Raises:
+            FileNotFoundError: If a category has no question file.
+            ValueError: If no categories are given, the difficulty occurs in
+                none of them or the limit is not positive.
+        """
+        if not categories:
+            raise ValueError("No categories given.")
+        entries = [self.entry(category) for category in categories]
+        if limit is not None and limit < 1:
+            raise ValueError(f"Limit must be at least 1, got {limit}.")
+        if difficulty is None:
+            counts = [entry.questions for entry in entries]
+            return None if None in counts else sum(counts)
+        difficulties = [self.difficulties(category) for category in categories]
+        available = sum(counts.get(difficulty.lower(), 0) for counts in difficulties)
+        if available == 0:
+            choices = ", ".join(sorted({d for counts in difficulties for d in counts})) or "none"
+            raise ValueError(f"No {difficulty} questions in categories {', '.join(categories)} (available: {choices}).")
+        return available
+
+
+def _read_manifest(path: Path) -> Optional[dict]:
+    """Load a manifest, returning None if it is missing or unusable."""
+    try:
+        with open(path, "rb") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != CATALOG_VERSION:
+            return None
+        manifest["files"] = {name: CategoryEntry(**entry) for name, entry in manifest["files"].items()}
+        return manifest
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    """Atomically write a manifest, ignoring unwritable data folders."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    data = dict(manifest, files={name: asdict(entry) for name, entry in manifest["files"].items()})
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_catalog(data_folder: Path) -> Catalog:
+    """Return the catalog of a data folder, refreshing its manifest if stale.
+
+    Args:
+        data_folder: Folder holding the question banks.
+
+    Returns:
+        Catalog describing every bank currently in the folder.
+    """
+    data_folder = Path(data_folder)
+    path = catalog_path(data_folder)
+    manifest = _read_manifest(path)
+    if manifest is None:
+        manifest = {"version": CATALOG_VERSION, "folder_mtime_ns": -1, "scanned_ns": 0, "files": {}}
+    old_files = manifest["files"]
+
+    try:
+        # Create the cache folder first so that doing so later does not
+        # change the data folder's mtime
+        path.parent.mkdir(exist_ok=True)
+    except OSError:
+        pass
+    try:
+        folder_mtime_ns = data_folder.stat().st_mtime_ns
+    except FileNotFoundError:
+        return Catalog(data_folder, {})
+
+    listed = (folder_mtime_ns == manifest["folder_mtime_ns"]
+              and folder_mtime_ns < manifest["scanned_ns"] - RACY_NS)
+    if listed:
+        names = list(old_files)
+    else:
+        names = [entry.name for entry in os.scandir(data_folder) if _bank_category(entry.name) is not None]
+
+    files = {}
+    for name in names:
+        file_path = data_folder / name
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            continue
+        previous = old_files.get(name)
+        if previous is not None and previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+            files[name] = previous
+        else:
+            files[name] = _describe(file_path, stat, previous)
+
+    if listed and files == old_files:
+        return Catalog(data_folder, files, manifest)
+    manifest = {
+        "version": CATALOG_VERSION,
+        "folder_mtime_ns": folder_mtime_ns,
+        "scanned_ns": time.time_ns(),
+        "files": files
+    }
+    _write_manifest(path, manifest)
+    return Catalog(data_folder, files, manifest)
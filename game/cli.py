@@ -0,0 +1,498 @@
+"""Typer command-line interface for the AI Quiz Game.
+
+Each command imports the modules it needs when it runs, so ``--help`` and
+cheap commands never pay for the quiz engine, the server or the simulator.
+"""
+
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List, Optional
+import typer
+from game.app import get_available_categories, load_bank, load_mixed_bank, show_leaderboard
+
+
+app = typer.Typer()
+
+
+def _parse_categories(category: str, available: List[str]) -> List[str]:
+    """Split a ``--category`` value into category names.
+
+    Accepts one category, a comma-separated list, or ``all``.
+    """
+    if category.strip().lower() == "all":
+        return available
+    return list(dict.fromkeys(name.strip() for name in category.split(",") if name.strip()))
+
+
+def _open_bank(category: str, difficulty: Optional[str] = None, limit: Optional[int] = None):
+    """Check the options against the catalog, then load the requested banks.
+
+    ``category`` may name several comma-separated categories or ``all``, in
+    which case the banks are loaded concurrently into a MixedQuestionBank.
+    Bad options are reported before any question file is parsed. Exits with
+    status 1 on error.
+    """
+    from game.catalog import load_catalog
+    from game.config import load_config
+
+    catalog = load_catalog(load_config()["data_folder"])
+    categories = _parse_categories(category, catalog.categories())
+    try:
+        if len(categories) == 1:
+            catalog.validate(categories[0], difficulty, limit)
+            return load_bank(categories[0])
+        catalog.validate_mix(categories, difficulty, limit)
+        return load_mixed_bank(categories)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print(f"Available categories: {', '.join(catalog.categories())}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+@app.callback(invoke_without_command=True)
+def main(
+    ctx: typer.Context,
+    category: str = typer.Option("general", "--category", "-c", help="Question category, comma-separated categories, or all"),
+    limit: int = typer.Option(10, "--limit", "-l", help="Number of questions"),
+    difficulty: Optional[str] = typer.Option(None, "--difficulty", "-d", help="Filter by difficulty (easy/medium/hard)"),
+    hints: bool = typer.Option(False, "--hints", "-h", help="Enable hints (halves points when used)"),
+    leaderboard: Optional[int] = typer.Option(None, "--leaderboard", "-b", help="Show top N scores and exit"),
+    frontend: str = typer.Option("terminal", "--frontend", help="Output format (terminal, jsonl)"),
+    input_path: Optional[Path] = typer.Option(None, "--input", help="Read the name and answers from this file instead of stdin"),
+    runs: int = typer.Option(1, "--runs", help="Number of quizzes to play in a row"),
+    pacing: Optional[str] = typer.Option(None, "--pacing", help="Pacing between questions (off, fixed, timed)"),
+    delay: Optional[float] = typer.Option(None, "--delay", help="Seconds to pause after each answer"),
+    time_limit: Optional[float] = typer.Option(None, "--time-limit", help="Seconds per question in timed mode"),
+    metrics: Optional[Path] = typer.Option(None, "--metrics", help="Write metrics to this file (.json, or .prom for Prometheus)"),
+    profile: Optional[Path] = typer.Option(None, "--profile", help="Profile with cProfile and save stats here (.txt for a report)")
+):
+    """Run the AI Quiz Game.
+
+    Examples:
+        python -m game.app
+        python -m game.app --category science --limit 5
+        python -m game.app --category science,general --difficulty easy
+        python -m game.app --hints
+        python -m game.app --pacing timed --time-limit 15
+        python -m game.app --leaderboard 10
+        python -m game.app recent 20
+        python -m game.app leaderboard 10 --shards "/mnt/hosts/*/leaderboard.jsonl"
+        python -m game.app --frontend jsonl --input answers.txt --runs 1000
+        python -m game.app categories
+        python -m game.app answer-stats --sort hints
+        python -m game.app stats --by day
+        python -m game.app rebuild-index
+        python -m game.app compact
+        python -m game.app migrate-storage --to sqlite
+        python -m game.app build-cache
+        python -m game.app convert-bank science
+        python -m game.app dedup --output cleaned
+        python -m game.app serve --port 8765
+        python -m game.app simulate --sessions 1000000 --policy accuracy --accuracy 0.7
+        python -m game.app --metrics metrics.prom simulate --sessions 1000
+    """
+    if metrics or profile:
+        from utils.metrics import instrument
+        ctx.with_resource(instrument(metrics, profile))
+
+    if ctx.invoked_subcommand is not None:
+        return
+
+    # Show leaderboard and exit if requested
+    if leaderboard is not None:
+        show_leaderboard(leaderboard)
+        return
+
+    from engine.frontends import make_frontend
+    from engine.pacing import pacing_from_config
+    from engine.quiz_engine import run_quiz
+    from game.answer_log import AnswerLog
+    from game.config import load_config
+    from game.io_manager import save_result
+    from game.leaderboard import rank_result
+
+    # Load questions
+    bank = _open_bank(category, difficulty, limit)
+
+    config = load_config()
+    with ExitStack() as stack:
+        try:
+            quiz_pacing = pacing_from_config(config, pacing, delay, time_limit)
+            replies = stack.enter_context(open(input_path)) if input_path else None
+            ui = make_frontend(frontend, replies)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        answer_log = AnswerLog.from_config(config)
+
+        for _ in range(runs):
+            # Select questions based on filters
+            selected = bank.select(limit, difficulty)
+
+            if not selected:
+                print(f"No questions found matching your criteria.")
+                sys.exit(1)
+
+            # Run the quiz
+            try:
+                result = run_quiz(
+                    selected, hints_enabled=hints, frontend=ui, pacing=quiz_pacing,
+                    ranker=rank_result, on_answer=answer_log.record
+                )
+            except EOFError as e:
+                ui.error(str(e))
+                ui.flush()
+                sys.exit(1)
+            finally:
+                answer_log.flush()
+
+            # Save the result
+            save_result(result)
+            ui.message("Your result has been saved to the leaderboard!")
+
+        ui.flush()
+
+
+@app.command("leaderboard")
+def leaderboard_command(
+    n: int = typer.Argument(10, help="Number of results to show"),
+    category: Optional[str] = typer.Option(None, "--category", "-c", help="Only show results in this category"),
+    shards: Optional[str] = typer.Option(None, "--shards", help="Rank across the leaderboards in this directory or glob")
+):
+    """Show the top N scores, overall, in one category or across shards."""
+    if shards is not None:
+        if category is not None:
+            print("Error: --category cannot be combined with --shards.")
+            sys.exit(1)
+        from game.leaderboard import format_table, top_n
+
+        print(format_table(top_n(n, shards)))
+        return
+
+    if category is None:
+        show_leaderboard(n)
+        return
+
+    from game.leaderboard import category_top_n, format_table
+
+    print(format_table(category_top_n(category, n)))
+
+
+@app.command("recent")
+def recent_command(
+    n: int = typer.Argument(10, help="Number of results to show")
+):
+    """Show the N most recently saved results, newest first."""
+    from game.leaderboard import format_recent, recent_results
+
+    print(format_recent(recent_results(n)))
+
+
+@app.command("player")
+def player_command(
+    name: str = typer.Argument(..., help="Player name")
+):
+    """Show a player's attempts, average score and best result."""
+    from game.leaderboard import format_player_stats, player_stats
+
+    stats = player_stats(name)
+    if stats is None:
+        print(f"No results for {name}.")
+        sys.exit(1)
+    print(format_player_stats(stats))
+
+
+@app.command("categories")
+def categories_command(
+    counts: bool = typer.Option(False, "--counts", help="Also show question counts per difficulty")
+):
+    """List the available question categories."""
+    if not counts:
+        for category in get_available_categories():
+            print(category)
+        return
+
+    from game.catalog import load_catalog
+    from game.config import load_config
+
+    catalog = load_catalog(load_config()["data_folder"])
+    for category in catalog.categories():
+        difficulties = catalog.difficulties(category)
+        by_difficulty = ", ".join(f"{name} {n}" for name, n in sorted(difficulties.items()))
+        print(f"{category:<15} {sum(difficulties.values()):>6} questions ({by_difficulty})")
+
+
+@app.command("answer-stats")
+def answer_stats_command(
+    sort: str = typer.Option("accuracy", "--sort", help="Order by accuracy (hardest first), hints, latency or answers"),
+    limit: int = typer.Option(20, "--limit", "-l", help="Number of questions to show"),
+    min_answers: int = typer.Option(1, "--min-answers", help="Skip questions answered fewer times")
+):
+    """Show per-question accuracy, hint rate and response times from the answer log."""
+    from game.answer_log import SORT_KEYS, answer_log_path, format_question_stats, question_stats
+    from game.config import load_config
+
+    if sort not in SORT_KEYS:
+        print(f"Error: Unknown sort order: {sort} (choose from {', '.join(SORT_KEYS)})")
+        sys.exit(1)
+    try:
+        stats = question_stats(answer_log_path(load_config()), min_answers)
+    except ImportError:
+        print("Error: answer-stats requires NumPy (pip install numpy).")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(format_question_stats(sorted(stats, key=SORT_KEYS[sort])[:limit]))
+
+
+@app.command("migrate-storage")
+def migrate_storage_command(
+    source: str = typer.Option("jsonl", "--from", help="Backend to copy results from (jsonl or sqlite)"),
+    target: str = typer.Option("sqlite", "--to", help="Backend to copy results into (jsonl or sqlite)")
+):
+    """Copy the leaderboard into another storage backend, e.g. JSONL to SQLite."""
+    from game.leaderboard import migrate_storage
+
+    try:
+        count = migrate_storage(source, target)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Migrated {count} results from {source} to {target}.")
+    print(f'Set "storage_backend": "{target}" in game/config.py to use it.')
+
+
+@app.command("export-columns")
+def export_columns_command():
+    """Append new leaderboard results to the columnar (NumPy) export."""
+    from game.leaderboard import export_columns
+
+    try:
+        count = export_columns()
+    except ImportError:
+        print("Error: export-columns requires NumPy (pip install numpy).")
+        sys.exit(1)
+    print(f"Exported {count} new results.")
+
+
+@app.command("stats")
+def stats_command(
+    by: str = typer.Option("category", "--by", help="Group by category or day")
+):
+    """Show score distributions, mean time and hint usage from the leaderboard."""
+    from game.columnar import format_group_stats
+    from game.leaderboard import leaderboard_stats
+
+    try:
+        stats = leaderboard_stats(by)
+    except ImportError:
+        print("Error: stats requires NumPy (pip install numpy).")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(format_group_stats(stats, by))
+
+
+@app.command("rebuild-index")
+def rebuild_index_command():
+    """Rebuild the leaderboard ranking index from leaderboard.jsonl."""
+    from game.leaderboard import rebuild_index
+
+    try:
+        count = rebuild_index()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Indexed {count} results.")
+
+
+@app.command("rebuild-views")
+def rebuild_views_command():
+    """Rebuild the per-category and per-player views from the leaderboard."""
+    from game.leaderboard import rebuild_views
+
+    try:
+        count = rebuild_views()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Rebuilt views from {count} results.")
+
+
+@app.command("compact")
+def compact_command():
+    """Merge leaderboard segments into one sorted segment, dropping bad lines."""
+    from game.leaderboard import compact
+
+    try:
+        merged, kept = compact()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Compacted {merged} segments into {kept} results.")
+
+
+@app.command("build-cache")
+def build_cache_command():
+    """Precompile the question cache for every category."""
+    from game.io_manager import build_question_cache
+
+    for category in get_available_categories():
+        count = build_question_cache(category)
+        print(f"Compiled {count} questions for category: {category}")
+
+
+@app.command("convert-bank")
+def convert_bank_command(
+    categories: Optional[list[str]] = typer.Argument(None, help="Categories to convert (default: all JSON banks)")
+):
+    """Convert JSON question banks to streaming JSON Lines files."""
+    from game.config import load_config
+    from game.io_manager import convert_to_jsonl
+
+    if not categories:
+        data_folder = load_config()["data_folder"]
+        categories = sorted(f.stem.replace("questions_", "") for f in data_folder.glob("questions_*.json"))
+
+    for category in categories:
+        try:
+            target = convert_to_jsonl(category)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Wrote {target}")
+
+
+@app.command("dedup")
+def dedup_command(
+    categories: Optional[list[str]] = typer.Argument(None, help="Categories to check (default: all)"),
+    threshold: float = typer.Option(0.8, "--threshold", help="Similarity (0-1) at which questions are near duplicates"),
+    exact_only: bool = typer.Option(False, "--exact-only", help="Only find exact duplicates (no NumPy needed)"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write cleaned banks to this folder")
+):
+    """Find duplicate questions within and across categories.
+
+    Categories are checked in the order given, and the first occurrence of a
+    question is the one kept.
+    """
+    from engine.dedup import dedupe
+    from game.catalog import load_catalog
+    from game.config import load_config
+    from game.io_manager import load_questions, write_questions
+
+    catalog = load_catalog(load_config()["data_folder"])
+    categories = categories or catalog.categories()
+    questions = []
+    try:
+        for category in categories:
+            catalog.entry(category)
+            questions.extend((category, question) for question in load_questions(category))
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print(f"Available categories: {', '.join(catalog.categories())}")
+        sys.exit(1)
+
+    try:
+        kept, groups = dedupe([question for _, question in questions], threshold=None if exact_only else threshold)
+    except ImportError:
+        print("Error: near-duplicate detection requires NumPy (pip install numpy); use --exact-only.")
+        sys.exit(1)
+
+    sources = {id(question): category for category, question in questions}
+    for group in groups:
+        duplicates = ", ".join(f"{q.id} ({sources[id(q)]})" for q in group.duplicates)
+        kind = "exact" if group.exact else "near"
+        print(f"{group.kept.id} ({sources[id(group.kept)]}) <- {duplicates} [{kind}]")
+    removed = len(questions) - len(kept)
+    print(f"Found {removed} duplicates in {len(groups)} groups among {len(questions)} questions.")
+
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+        for category in categories:
+            target = output / catalog.entry(category).file
+            count = write_questions(target, (q for q in kept if sources[id(q)] == category))
+            print(f"Wrote {count} questions to {target}")
+
+
+@app.command("serve")
+def serve_command(
+    category: str = typer.Option("general", "--category", "-c", help="Question category, comma-separated categories, or all"),
+    limit: int = typer.Option(10, "--limit", "-l", help="Number of questions per session"),
+    difficulty: Optional[str] = typer.Option(None, "--difficulty", "-d", help="Filter by difficulty (easy/medium/hard)"),
+    hints: bool = typer.Option(False, "--hints", "-h", help="Enable hints (halves points when used)"),
+    host: Optional[str] = typer.Option(None, "--host", help="Interface to bind"),
+    port: Optional[int] = typer.Option(None, "--port", "-p", help="TCP port to listen on"),
+    pacing: Optional[str] = typer.Option(None, "--pacing", help="Pacing between questions (off, fixed, timed)"),
+    delay: Optional[float] = typer.Option(None, "--delay", help="Seconds to pause after each answer"),
+    time_limit: Optional[float] = typer.Option(None, "--time-limit", help="Seconds per question in timed mode")
+):
+    """Host multi-player quiz sessions over TCP (e.g. connect with nc)."""
+    from engine.pacing import pacing_from_config
+    from game.answer_log import AnswerLog
+    from game.config import load_config
+    from game.server import QuizServer, run_server
+
+    config = load_config()
+
+    bank = _open_bank(category, difficulty, limit)
+
+    try:
+        server_pacing = pacing_from_config(config, pacing, delay, time_limit)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    host = host or config["server_host"]
+    port = port or config["server_port"]
+    print(f"Serving {len(bank)} {category} questions on {host}:{port} (Ctrl+C to stop)")
+    answer_log = AnswerLog.from_config(config)
+    run_server(QuizServer(bank, limit, difficulty, hints, pacing=server_pacing, answer_log=answer_log), host, port)
+
+
+@app.command("simulate")
+def simulate_command(
+    category: str = typer.Option("general", "--category", "-c", help="Question category, comma-separated categories, or all"),
+    limit: int = typer.Option(10, "--limit", "-l", help="Number of questions per session"),
+    difficulty: Optional[str] = typer.Option(None, "--difficulty", "-d", help="Filter by difficulty (easy/medium/hard)"),
+    sessions: int = typer.Option(100000, "--sessions", "-n", help="Number of sessions to simulate"),
+    policy: str = typer.Option("random", "--policy", help="Answer policy (random, correct, accuracy)"),
+    accuracy: float = typer.Option(0.5, "--accuracy", help="Correct-answer probability for the accuracy policy"),
+    hint_rate: float = typer.Option(0.0, "--hint-rate", help="Probability of using a hint per question"),
+    workers: int = typer.Option(1, "--workers", "-w", help="Worker processes"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed for reproducible runs")
+):
+    """Simulate scripted quiz sessions headlessly and print aggregate stats as JSON."""
+    import json
+    import time
+    from engine.simulation import make_policy, run_simulation
+
+    bank = _open_bank(category, difficulty, limit)
+    try:
+        answer_policy = make_policy(policy, accuracy, hint_rate)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    pool = bank.select(bank.count(difficulty=difficulty), difficulty)
+    if not pool:
+        print(f"No questions found matching your criteria.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        stats = run_simulation(pool, answer_policy, sessions, limit, workers, seed)
+    except ImportError:
+        print("Error: simulate requires NumPy (pip install numpy).")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    summary = stats.summary()
+    summary["seconds"] = elapsed
+    summary["sessions_per_second"] = stats.sessions / elapsed if elapsed else 0.0
+    print(json.dumps(summary, indent=2))
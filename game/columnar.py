@@ -0,0 +1,453 @@
+"""Columnar export of the leaderboard for analytics.
+
+The export lives in ``<leaderboard>.columns/``: one ``.npy`` file per Result
+field, readable with ``numpy.load(..., mmap_mode="r")``, plus string
+dictionaries for players and categories (``player.jsonl`` and
+``category.jsonl``, one JSON string per line, whose line numbers are the
+codes stored in the ``player`` and ``category`` columns). Timestamps are
+stored as Unix seconds (NaN if unparseable).
+
+Exports are incremental. ``manifest.json`` records, per source file (keyed
+by inode, which survives rotation), how many bytes have been exported, so a
+later export parses only lines appended since. Compaction rewrites the
+stored results into a new segment, so the first export after one starts
+over. Backends other than JSONL (see ``game.storage``) are exported from
+their ``iter_results()`` and start over every time.
+
+Each ``.npy`` header is padded to a fixed size and rewritten in place as
+rows are appended, and columns are cut back to the manifest's row count
+before appending, so an export interrupted midway is simply redone.
+
+Requires NumPy (``pip install numpy``).
+"""
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from game.models import Result
+from game.segments import SegmentedLeaderboard
+from utils.metrics import span
+
+COLUMNS_VERSION = 1
+COLUMNS = {
+    "player": "<u4",
+    "category": "<u4",
+    "score": "<f8",
+    "total": "<i4",
+    "streak_max": "<i4",
+    "seconds": "<f8",
+    "hints_used": "<i4",
+    "timestamp": "<f8",
+}
+DICTIONARY_COLUMNS = ("player", "category")
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_BYTES = 128  # fixed, so the header can be rewritten in place
+READ_BYTES = 16 * 1024 * 1024  # source bytes parsed per batch
+RESULTS_BATCH = 100_000  # results converted per batch when exporting from a backend
+GROUP_BY = ("category", "day")
+
+
+def columns_path(config: dict) -> Path:
+    """Return the configured export folder, defaulting to one next to the leaderboard."""
+    path = config.get("columns_path")
+    return Path(path) if path else Path(f"{config['leaderboard_path']}.columns")
+
+
+def _npy_header(dtype: str, rows: int) -> bytes:
+    """Return a fixed-size ``.npy`` (version 1.0) header for a 1-D column."""
+    header = repr({"descr": dtype, "fortran_order": False, "shape": (rows,)}).encode("latin1")
+    length = NPY_HEADER_BYTES - len(NPY_MAGIC) - 2
+    return NPY_MAGIC + struct.pack("<H", length) + header.ljust(length - 1) + b"\n"
+
+
+def _append_column(path: Path, dtype: str, rows: int, data: bytes) -> None:
+    """Write ``data`` after the first ``rows`` rows of a column file."""
+    itemsize = int(dtype[2:])  # e.g. "<f8" is 8 bytes
+    with open(path, "r+b" if path.exists() else "w+b") as f:
+        f.seek(NPY_HEADER_BYTES + rows * itemsize)
+        f.write(data)
+        f.truncate()
+        f.seek(0)
+        f.write(_npy_header(dtype, rows + len(data) // itemsize))
+
+
+def _parse_timestamp(value: str) -> float:
+    """Return an ISO timestamp as Unix seconds, or NaN if it is unparseable."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return float("nan")
+    if moment.tzinfo is None:
+        return (moment - datetime(1970, 1, 1)).total_seconds()  # results are saved in UTC
+    return moment.timestamp()
+
+
+@dataclass
+class LeaderboardColumns:
+    """The exported leaderboard as NumPy arrays.
+
+    Attributes:
+        rows: Number of results.
+        arrays: Column name to 1-D array (memory-mapped when non-empty).
+        players: Player names, indexed by the ``player`` column's codes.
+        categories: Category names, indexed by the ``category`` column's codes.
+    """
+    rows: int
+    arrays: Dict[str, object]
+    players: List[str]
+    categories: List[str]
+
+
+class ColumnStore:
+    """Incremental columnar export of a segmented leaderboard."""
+
+    def __init__(self, path: Path):
+        """Initialize the store.
+
+        Args:
+            path: Export folder; created on first export.
+        """
+        self.path = Path(path)
+        self.manifest_path = self.path / "manifest.json"
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ColumnStore":
+        """Build the store for the configured leaderboard."""
+        return cls(columns_path(config))
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == COLUMNS_VERSION else None
+
+    def _write_manifest(self, manifest: dict) -> None:
+        tmp_path = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _read_dictionary(self, name: str, count: int) -> List[str]:
+        """Return the first ``count`` entries of a string dictionary."""
+        values = []
+        try:
+            with open(self.path / f"{name}.jsonl", "rb") as f:
+                for line in f:
+                    if len(values) == count:
+                        break
+                    values.append(json.loads(line))
+        except FileNotFoundError:
+            pass
+        return values
+
+    def export(self, store: SegmentedLeaderboard) -> int:
+        """Append results stored since the last export.
+
+        Args:
+            store: The leaderboard to export.
+
+        Returns:
+            Number of rows appended (all rows if the export started over).
+        """
+        with span("leaderboard.export_columns"):
+            return self._export(store)
+
+    def _export(self, store: SegmentedLeaderboard) -> int:
+        """Export as documented on export, without the metrics span."""
+        # Open every source under the lock so no rotation or compaction
+        # happens in between; the open files are then read without it
+        with store.lock():
+            compacted, rotated = store.segments()
+            paths = ([compacted] if compacted else []) + rotated
+            if store.live_path.exists():
+                paths.append(store.live_path)
+            sources = [open(path, "rb") for path in paths]
+
+        try:
+            stats = [os.fstat(f.fileno()) for f in sources]
+            current = {str(st.st_ino): st.st_size for st in stats}
+            manifest = self._read_manifest()
+            if (manifest is None
+                    or manifest.get("source", "jsonl") != "jsonl"
+                    or manifest["compacted"] != (compacted.name if compacted else None)
+                    or any(current.get(ino, -1) < offset for ino, offset in manifest["files"].items())):
+                manifest = self._empty_manifest("jsonl")
+            manifest["compacted"] = compacted.name if compacted else None
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            dictionaries = {
+                name: {value: code for code, value in enumerate(
+                    self._read_dictionary(name, manifest["dictionaries"][name]))}
+                for name in DICTIONARY_COLUMNS
+            }
+            known = {name: len(codes) for name, codes in dictionaries.items()}
+            start_rows = rows = manifest["rows"]
+            files = {}
+
+            for f, st in zip(sources, stats):
+                ino = str(st.st_ino)
+                offset = manifest["files"].get(ino, 0)
+                f.seek(offset)
+                while offset < st.st_size:
+                    chunk = f.read(min(READ_BYTES, st.st_size - offset))
+                    end = chunk.rfind(b"\n") + 1
+                    if end == 0:
+                        break  # only a partial line is left
+                    rows = self._append_rows(self._parse(chunk[:end], dictionaries), rows)
+                    offset += end
+                    f.seek(offset)
+                files[ino] = offset
+
+            manifest["files"] = files
+            self._finish(manifest, dictionaries, known, start_rows, rows)
+            return rows - start_rows
+        finally:
+            for f in sources:
+                f.close()
+
+    def export_results(self, results: Iterable[Result], source: str) -> int:
+        """Replace the export with the given results.
+
+        Used for storage backends without JSONL files to resume from, so
+        the export starts over each time.
+
+        Args:
+            results: Every stored result, e.g. a backend's ``iter_results()``.
+            source: Name of the backend the results come from.
+
+        Returns:
+            Number of rows exported.
+        """
+        with span("leaderboard.export_columns"):
+            self.path.mkdir(parents=True, exist_ok=True)
+            dictionaries: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+            players, categories = dictionaries["player"], dictionaries["category"]
+            rows = 0
+            batch = []
+            for result in results:
+                batch.append((
+                    players.setdefault(result.player, len(players)),
+                    categories.setdefault(result.category, len(categories)),
+                    result.score, result.total, result.streak_max,
+                    result.seconds, result.hints_used, _parse_timestamp(result.timestamp)
+                ))
+                if len(batch) >= RESULTS_BATCH:
+                    rows = self._append_rows(self._columns(batch), rows)
+                    batch = []
+            rows = self._append_rows(self._columns(batch), rows)
+            self._finish(self._empty_manifest(source), dictionaries, {name: 0 for name in DICTIONARY_COLUMNS}, 0, rows)
+            return rows
+
+    @staticmethod
+    def _empty_manifest(source: str) -> dict:
+        return {"version": COLUMNS_VERSION, "source": source, "rows": 0, "files": {}, "compacted": None,
+                "dictionaries": {name: 0 for name in DICTIONARY_COLUMNS}}
+
+    def _append_rows(self, batch: Dict[str, list], rows: int) -> int:
+        """Append a batch of column lists after ``rows`` rows; return the new row count."""
+        import numpy as np
+
+        if not batch["score"]:
+            return rows
+        for name, dtype in COLUMNS.items():
+            data = np.asarray(batch[name], dtype=dtype).tobytes()
+            _append_column(self.path / f"{name}.npy", dtype, rows, data)
+        return rows + len(batch["score"])
+
+    def _finish(self, manifest: dict, dictionaries: Dict[str, Dict[str, int]], known: Dict[str, int],
+                start_rows: int, rows: int) -> None:
+        """Write new dictionary entries, cut the columns to ``rows`` and save the manifest."""
+        for name, codes in dictionaries.items():
+            values = list(codes)[known[name]:]
+            with open(self.path / f"{name}.jsonl", "ab") as f:
+                f.truncate(self._dictionary_bytes(name, known[name]))
+                f.write(b"".join(json.dumps(value).encode() + b"\n" for value in values))
+            manifest["dictionaries"][name] = len(codes)
+
+        for name, dtype in COLUMNS.items():
+            if not (self.path / f"{name}.npy").exists() or rows == start_rows:
+                _append_column(self.path / f"{name}.npy", dtype, rows, b"")
+        manifest["rows"] = rows
+        self._write_manifest(manifest)
+
+    def _dictionary_bytes(self, name: str, count: int) -> int:
+        """Return the byte length of the first ``count`` dictionary lines."""
+        size = 0
+        try:
+            with open(self.path / f"{name}.jsonl", "rb") as f:
+                for _, line in zip(range(count), f):
+                    size += len(line)
+        except FileNotFoundError:
+            pass
+        return size
+
+    @staticmethod
+    def _parse(lines: bytes, dictionaries: Dict[str, Dict[str, int]]) -> Dict[str, list]:
+        """Parse complete leaderboard lines into column lists, skipping bad lines."""
+        text = [line for line in lines.decode(errors="replace").splitlines() if line.strip()]
+        try:
+            records = json.loads("[" + ",".join(text) + "]")  # one decoder call per batch
+        except ValueError:
+            records = []
+            for line in text:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+
+        players, categories = dictionaries["player"], dictionaries["category"]
+        rows = []
+        for data in records:
+            try:
+                rows.append((
+                    players.setdefault(data["player"], len(players)),
+                    categories.setdefault(data["category"], len(categories)),
+                    float(data["score"]), int(data["total"]), int(data["streak_max"]),
+                    float(data["seconds"]), int(data.get("hints_used", 0)), _parse_timestamp(data["timestamp"])
+                ))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+        return ColumnStore._columns(rows)
+
+    @staticmethod
+    def _columns(rows: List[tuple]) -> Dict[str, list]:
+        """Transpose row tuples into one list per column."""
+        return dict(zip(COLUMNS, map(list, zip(*rows)))) if rows else {name: [] for name in COLUMNS}
+
+    def load(self) -> LeaderboardColumns:
+        """Open the last export.
+
+        Returns:
+            LeaderboardColumns (empty if nothing was exported yet).
+        """
+        import numpy as np
+
+        manifest = self._read_manifest()
+        rows = manifest["rows"] if manifest else 0
+        arrays = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode="r")[:rows] if rows else np.empty(0, dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+        counts = manifest["dictionaries"] if manifest else {}
+        return LeaderboardColumns(
+            rows,
+            arrays,
+            self._read_dictionary("player", counts.get("player", 0)),
+            self._read_dictionary("category", counts.get("category", 0))
+        )
+
+
+@dataclass
+class GroupStats:
+    """Aggregates over the results in one category or on one day."""
+    name: str
+    results: int
+    mean_percent: float
+    p25_percent: float
+    median_percent: float
+    p75_percent: float
+    mean_seconds: float
+    hints_per_quiz: float
+    hint_share: float
+
+
+def group_stats(columns: LeaderboardColumns, by: str = "category") -> List[GroupStats]:
+    """Compute score distribution, time and hint usage per group.
+
+    Everything is computed column-wise: groups are numbered, sums come from
+    ``bincount`` and percentiles from one sort of (group, score percent).
+
+    Args:
+        columns: The exported leaderboard.
+        by: ``category`` or ``day`` (UTC; results without a valid
+            timestamp are left out).
+
+    Returns:
+        Statistics per group, by name.
+
+    Raises:
+        ValueError: If ``by`` is not a supported grouping.
+    """
+    import numpy as np
+
+    if by not in GROUP_BY:
+        raise ValueError(f"Unknown grouping: {by} (choose from {', '.join(GROUP_BY)})")
+
+    arrays = columns.arrays
+    total = np.asarray(arrays["total"], dtype=np.float64)
+    percent = np.divide(100.0 * np.asarray(arrays["score"]), total, out=np.zeros_like(total), where=total > 0)
+    if by == "category":
+        keys = np.asarray(arrays["category"], dtype=np.int64)
+        rows = np.arange(columns.rows)
+    else:
+        rows = np.flatnonzero(~np.isnan(arrays["timestamp"]))
+        keys = np.floor(np.asarray(arrays["timestamp"])[rows] / 86400).astype(np.int64)
+        percent = percent[rows]
+
+    if len(keys) == 0:
+        return []
+    labels, groups = np.unique(keys, return_inverse=True)
+    counts = np.bincount(groups)
+    hints = np.asarray(arrays["hints_used"])[rows]
+
+    order = np.lexsort((percent, groups))
+    sorted_percent = percent[order]
+    starts = np.cumsum(counts) - counts
+
+    def quantile(q: float):
+        return sorted_percent[starts + ((counts - 1) * q).astype(np.int64)]
+
+    columns_out = zip(
+        labels.tolist(),
+        counts.tolist(),
+        (np.bincount(groups, weights=percent) / counts).tolist(),
+        quantile(0.25).tolist(),
+        quantile(0.5).tolist(),
+        quantile(0.75).tolist(),
+        (np.bincount(groups, weights=np.asarray(arrays["seconds"])[rows]) / counts).tolist(),
+        (np.bincount(groups, weights=hints) / counts).tolist(),
+        (np.bincount(groups, weights=hints > 0) / counts).tolist()
+    )
+    if by == "category":
+        def name(label):
+            return columns.categories[label]
+    else:
+        def name(label):
+            return str(np.datetime64(label, "D"))
+    stats = [GroupStats(name(label), *rest) for label, *rest in columns_out]
+    return sorted(stats, key=lambda s: s.name)
+
+
+def format_group_stats(stats: List[GroupStats], by: str = "category") -> str:
+    """Format group statistics as a printable table.
+
+    Args:
+        stats: Statistics returned by group_stats.
+        by: The grouping, used as the first column's title.
+
+    Returns:
+        Formatted table string.
+    """
+    if not stats:
+        return "No results yet!"
+
+    lines = []
+    lines.append("=" * 78)
+    lines.append(f"{by.title():<12} {'Results':<9} {'Mean %':<8} {'P25 %':<7} {'Median %':<9} {'P75 %':<7} "
+                 f"{'Time (s)':<9} {'Hints':<6} {'Hinted':<7}")
+    lines.append("=" * 78)
+
+    for s in stats:
+        lines.append(
+            f"{s.name:<12} {s.results:<9} {s.mean_percent:<8.1f} {s.p25_percent:<7.1f} {s.median_percent:<9.1f} "
+            f"{s.p75_percent:<7.1f} {s.mean_seconds:<9.1f} {s.hints_per_quiz:<6.2f} {s.hint_share:<7.1%}"
+        )
+
+    lines.append("=" * 78)
+    return "\n".join(lines)
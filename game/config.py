@@ -7,12 +7,28 @@ def load_config():
     """Return default configuration settings.
 
     Returns:
-        dict: Configuration dictionary with data_folder and leaderboard_path.
+        dict: Configuration dictionary with data_folder, leaderboard_path,
+            storage, mixed-quiz weights, pacing and server settings.
     """
     base_dir = Path(__file__).parent.parent
     return {
         "data_folder": base_dir / "data",
         "leaderboard_path": base_dir / "leaderboard.jsonl",
+        "answer_log_path": base_dir / "answers.bin",
+        "columns_path": base_dir / "leaderboard.jsonl.columns",
+        "storage_backend": "jsonl",
+        "sqlite_path": base_dir / "leaderboard.sqlite",
+        "leaderboard_shards": None,
         "default_limit": 10,
-        "default_category": "general"
+        "default_category": "general",
+        "segment_max_bytes": 64 * 1024 * 1024,
+        "max_rotated_segments": 4,
+        "view_top_k": 100,
+        "category_weights": {},
+        "difficulty_weights": {},
+        "pacing": "fixed",
+        "pacing_delay": 0.5,
+        "question_time_limit": 30.0,
+        "server_host": "127.0.0.1",
+        "server_port": 8765
     }
@@ -1,52 +1,298 @@
 """File I/O operations for questions and results."""
 
+import hashlib
 import json
+import os
+import pickle
+import threading
 from pathlib import Path
-from typing import List
-from game.models import Question, Result
+from typing import Iterable, Iterator, List, Optional, Tuple
+from game.models import Question, QuestionTable, Result, question_from_dict, question_to_dict
+from game.catalog import load_catalog
 from game.config import load_config
+from game.storage import get_backend
+from utils.metrics import inc, span
+
+
+CACHE_VERSION = 1
+
+
+def _cache_path(file_path: Path) -> Path:
+    """Return the compiled cache path for a question file."""
+    return file_path.parent / ".cache" / f"{file_path.stem}.pickle"
+
+
+def _parse_questions(raw: bytes, jsonl: bool = False) -> List[tuple]:
+    """Parse a question file into columns, one tuple per Question field.
+
+    Args:
+        raw: File contents.
+        jsonl: Whether the file holds one question per line instead of a
+            JSON array.
+    """
+    if jsonl:
+        data = (json.loads(line) for line in raw.splitlines() if line.strip())
+    else:
+        data = json.loads(raw)
+    rows = [
+        (
+            item["id"],
+            item["category"],
+            item["difficulty"],
+            item["prompt"],
+            item["choices"],
+            item["answer_index"],
+            item.get("hint", "No hint available")
+        )
+        for item in data
+    ]
+    return list(zip(*rows)) if rows else [()] * 7
+
+
+def _read_cache(cache_path: Path) -> Optional[dict]:
+    """Load a compiled cache, returning None if it is missing or unusable."""
+    try:
+        with open(cache_path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return None
+    return payload
+
+
+def _write_cache(cache_path: Path, payload: dict) -> None:
+    """Atomically write a compiled cache, ignoring unwritable data folders."""
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _load_columns(file_path: Path, force: bool = False, sha256: Optional[str] = None) -> List[tuple]:
+    """Return question columns for a file, using or refreshing its cache.
+
+    Given the catalog's content hash, the cache is trusted when it was built
+    from that content. Otherwise it is trusted when the source mtime and size
+    match. On a miss the source is hashed; if the content is unchanged only
+    the stamp is refreshed, else the JSON is parsed and the cache rewritten.
+    """
+    with span("questions.load"):
+        cache_path = _cache_path(file_path)
+        stat = file_path.stat()
+        payload = None if force else _read_cache(cache_path)
+
+        if payload and (
+            payload["sha256"] == sha256 if sha256
+            else payload["mtime_ns"] == stat.st_mtime_ns and payload["size"] == stat.st_size
+        ):
+            inc("questions.cache_hits")
+            return payload["columns"]
+        inc("questions.cache_misses")
+
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        if payload and payload["sha256"] == digest:
+            columns = payload["columns"]
+        else:
+            columns = _parse_questions(raw, jsonl=file_path.suffix == ".jsonl")
+
+        _write_cache(cache_path, {
+            "version": CACHE_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "columns": columns
+        })
+        return columns
+
+
+def _bank_file(category: str) -> Tuple[Path, str]:
+    """Return a category's question file and content hash from the catalog."""
+    config = load_config()
+    entry = load_catalog(config["data_folder"]).entry(category)
+    return config["data_folder"] / entry.file, entry.sha256
+
+
+def question_file(category: str) -> Path:
+    """Return the question file for a category.
+
+    A JSON array file (``questions_<category>.json``) takes precedence over a
+    JSON Lines file (``questions_<category>.jsonl``).
+
+    Args:
+        category: Category name.
+
+    Returns:
+        Path to the category's question file.
+
+    Raises:
+        FileNotFoundError: If the category has no question file.
+    """
+    return _bank_file(category)[0]
 
 
 def load_questions(category: str) -> List[Question]:
+    """Load all questions for a category.
+
+    Questions are read from a compiled cache in ``data/.cache`` when the
+    source file is unchanged, and the cache is rebuilt transparently when it
+    is not.
+
+    Args:
+        category: Category name, matching ``data/questions_<category>.json``
+            or ``data/questions_<category>.jsonl``.
+
+    Returns:
+        List of Question objects.
+
+    Raises:
+        FileNotFoundError: If the category has no question file.
+    """
+    file_path, sha256 = _bank_file(category)
+    return list(map(Question, *_load_columns(file_path, sha256=sha256)))
+
+
+def iter_questions(category: str) -> Iterator[Question]:
+    """Yield a category's questions one at a time.
+
+    JSON Lines banks are streamed line by line without loading the whole
+    file; JSON array banks are loaded with load_questions.
+
+    Args:
+        category: Category name.
+
+    Yields:
+        Question objects in file order.
+
+    Raises:
+        FileNotFoundError: If the category has no question file.
+    """
+    file_path = question_file(category)
+
+    if file_path.suffix != ".jsonl":
+        yield from load_questions(category)
+        return
+
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield question_from_dict(json.loads(line))
+
+
+def load_question_table(category: str) -> QuestionTable:
+    """Load a category into a memory-compact columnar QuestionTable.
+
+    Uses the same compiled cache as load_questions, but never builds a full
+    list of Question objects.
+
+    Args:
+        category: Category name, matching ``data/questions_<category>.json``.
+
+    Returns:
+        QuestionTable holding every question in the category.
+
+    Raises:
+        FileNotFoundError: If the category has no question file.
+    """
+    file_path, sha256 = _bank_file(category)
+    return QuestionTable.from_columns(_load_columns(file_path, sha256=sha256))
+
+
+def build_question_cache(category: str) -> int:
+    """Rebuild the compiled cache for a category.
+
+    Args:
+        category: Category name to compile.
+
+    Returns:
+        Number of questions compiled.
+
+    Raises:
+        FileNotFoundError: If the category has no question file.
+    """
+    return len(_load_columns(question_file(category), force=True)[0])
+
+
+def convert_to_jsonl(category: str) -> Path:
+    """Write a JSON array question bank out as JSON Lines.
+
+    Each question record is copied unchanged onto its own line in
+    ``questions_<category>.jsonl`` next to the source. The JSON file keeps
+    precedence until it is removed.
+
+    Args:
+        category: Category name with a ``questions_<category>.json`` file.
+
+    Returns:
+        Path of the written JSONL file.
+
+    Raises:
+        FileNotFoundError: If the category has no JSON question file.
+    """
     config = load_config()
-    data_folder = config["data_folder"]
-    file_path = data_folder / f"questions_{category}.json"
+    source = config["data_folder"] / f"questions_{category}.json"
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"No questions found for category: {category}")
+    if not source.exists():
+        raise FileNotFoundError(f"No JSON question file for category: {category}")
 
-    with open(file_path, 'r') as f:
+    with open(source, 'r') as f:
         data = json.load(f)
 
-    questions = []
-    for item in data:
-        questions.append(Question(
-            id=item["id"],
-            category=item["category"],
-            difficulty=item["difficulty"],
-            prompt=item["prompt"],
-            choices=item["choices"],
-            answer_index=item["answer_index"],
-            hint=item.get("hint", "No hint available")
-        ))
+    target = source.with_suffix(".jsonl")
+    tmp_path = target.with_suffix(".jsonl.tmp")
+    with open(tmp_path, 'w') as f:
+        for item in data:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, target)
+    return target
+
+
+def write_questions(path: Path, questions: Iterable[Question]) -> int:
+    """Atomically write questions as a question bank file.
+
+    A ``.jsonl`` path gets one question per line; any other path gets an
+    indented JSON array.
 
-    return questions
+    Args:
+        path: File to write.
+        questions: Questions to write, in order.
+
+    Returns:
+        Number of questions written.
+    """
+    path = Path(path)
+    tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+    count = 0
+    with open(tmp_path, 'w') as f:
+        if path.suffix == ".jsonl":
+            for question in questions:
+                f.write(json.dumps(question_to_dict(question), ensure_ascii=False) + '\n')
+                count += 1
+        else:
+            records = [question_to_dict(question) for question in questions]
+            json.dump(records, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+            count = len(records)
+    os.replace(tmp_path, path)
+    return count
 
 
 def save_result(result: Result):
+    """Append a result to the leaderboard.
+
+    The result goes to the configured storage backend. With the default
+    JSONL backend the write is locked against other processes, fsynced, and
+    group committed with concurrent saves from other threads.
+
+    Args:
+        result: The Result to save.
+    """
     config = load_config()
-    leaderboard_path = config["leaderboard_path"]
-
-    result_dict = {
-        "player": result.player,
-        "score": result.score,
-        "total": result.total,
-        "streak_max": result.streak_max,
-        "seconds": result.seconds,
-        "category": result.category,
-        "timestamp": result.timestamp,
-        "hints_used": result.hints_used
-    }
-
-    with open(leaderboard_path, 'a') as f:
-        f.write(json.dumps(result_dict) + '\n')
+    get_backend(config).save(result)
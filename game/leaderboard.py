@@ -1,45 +1,233 @@
 """Leaderboard management and display."""
 
-import json
-from pathlib import Path
-from typing import List
-from game.models import Result
+from typing import TYPE_CHECKING, List, Optional
+from game.models import Rank, Result
 from game.config import load_config
+from game.segments import SegmentedLeaderboard
+from game.storage import JsonlBackend, LeaderboardBackend, get_backend
 
+if TYPE_CHECKING:
+    from game.columnar import ColumnStore, GroupStats  # NumPy stays off the top-N fast path
+    from game.views import ViewStats  # sqlite3 stays off the top-N fast path
 
-def top_n(n: int) -> List[Result]:
+
+def _jsonl_store(config: dict, command: str) -> SegmentedLeaderboard:
+    """Return the JSONL leaderboard, for maintenance that only applies to it.
+
+    Raises:
+        ValueError: If another storage backend is configured.
+    """
+    backend = get_backend(config)
+    if not isinstance(backend, JsonlBackend):
+        raise ValueError(f"{command} is not supported with the {backend.name} backend.")
+    return backend.store
+
+
+def top_n(n: int, shards: Optional[str] = None) -> List[Result]:
     """Return the top n results sorted by score and time.
 
+    With the JSONL backend, merges the compacted segment with the indexed
+    rotated segments and live file, so only about n lines per source are
+    read and parsed. If shards are given (or ``leaderboard_shards`` is set),
+    returns the global top n across them instead.
+
     Args:
         n: Number of top results to return.
+        shards: Directory or glob pattern of leaderboard shards.
 
     Returns:
         List of Result objects sorted by score (desc) and seconds (asc).
     """
     config = load_config()
-    leaderboard_path = config["leaderboard_path"]
-
-    if not Path(leaderboard_path).exists():
-        return []
-
-    results = []
-    with open(leaderboard_path, 'r') as f:
-        for line in f:
-            data = json.loads(line.strip())
-            results.append(Result(
-                player=data["player"],
-                score=data["score"],
-                total=data["total"],
-                streak_max=data["streak_max"],
-                seconds=data["seconds"],
-                category=data["category"],
-                timestamp=data["timestamp"],
-                hints_used=data.get("hints_used", 0)  # Default to 0 for old records
-            ))
-
-    # Sort by score descending, then by time ascending
-    results.sort(key=lambda r: (-r.score, r.seconds))
-    return results[:n]
+    shards = shards or config.get("leaderboard_shards")
+    if shards:
+        from game.shards import ShardedLeaderboard
+
+        return ShardedLeaderboard.from_spec(str(shards)).top(n)
+    return get_backend(config).top(n)
+
+
+def recent_results(n: int) -> List[Result]:
+    """Return the n most recently saved results, newest first.
+
+    With the JSONL backend, scans the leaderboard backwards from its end, so
+    only about n lines are read and parsed.
+
+    Args:
+        n: Number of results to return.
+
+    Returns:
+        List of Result objects, most recent first.
+    """
+    return get_backend(load_config()).recent(n)
+
+
+def rank_result(result: Result, saved: bool = False) -> Rank:
+    """Return where a result ranks among all stored results.
+
+    With the JSONL backend, bisects the ranking indexes instead of loading
+    the leaderboard, so the cost is O(log n). Results with the same score
+    and time share a rank.
+
+    Args:
+        result: The result to rank.
+        saved: Whether the result is already stored; if not, it is counted
+            as if it had been added.
+
+    Returns:
+        Rank with the 1-based position and the number of results.
+    """
+    ahead, total = get_backend(load_config()).rank(result.score, result.seconds)
+    return Rank(ahead + 1, total if saved else total + 1)
+
+
+def rebuild_index() -> int:
+    """Rebuild the ranking indexes of the live file and rotated segments.
+
+    Returns:
+        Number of results indexed.
+
+    Raises:
+        ValueError: If the JSONL backend is not the configured one (SQLite
+            maintains its own indexes).
+    """
+    return _jsonl_store(load_config(), "rebuild-index").rebuild_indexes()
+
+
+def compact() -> tuple[int, int]:
+    """Merge all leaderboard segments into one sorted, compacted segment.
+
+    Returns:
+        Tuple of (segments merged, results kept).
+
+    Raises:
+        ValueError: If the JSONL backend is not the configured one.
+    """
+    return _jsonl_store(load_config(), "compact").compact()
+
+
+def category_top_n(category: str, n: int) -> List[Result]:
+    """Return the top n results in one category.
+
+    Args:
+        category: Category name (case-insensitive).
+        n: Number of top results to return (with the JSONL backend, at most
+            ``view_top_k``, the size of the category view).
+
+    Returns:
+        List of Result objects sorted by score (desc) and seconds (asc).
+    """
+    return get_backend(load_config()).category_top(category, n)
+
+
+def player_stats(player: str) -> Optional["ViewStats"]:
+    """Return a player's attempts, average score and best result.
+
+    Args:
+        player: Player name (case-sensitive, as saved).
+
+    Returns:
+        ViewStats for the player, or None if they have no results.
+    """
+    return get_backend(load_config()).player_stats(player)
+
+
+def rebuild_views() -> int:
+    """Recompute the per-category and per-player views from the leaderboard.
+
+    Returns:
+        Number of results applied.
+
+    Raises:
+        ValueError: If the JSONL backend is not the configured one (SQLite
+            answers category and player queries from its own indexes).
+    """
+    from game.views import LeaderboardViews
+
+    config = load_config()
+    _jsonl_store(config, "rebuild-views")
+    return LeaderboardViews.from_config(config).rebuild()
+
+
+def migrate_storage(source: str = "jsonl", target: str = "sqlite") -> int:
+    """Copy every result from one storage backend into another, empty one.
+
+    Args:
+        source: Backend to read from.
+        target: Backend to write to.
+
+    Returns:
+        Number of results copied.
+
+    Raises:
+        ValueError: If a backend name is unknown, the backends are the same
+            or the target already holds results.
+    """
+    from game.storage import migrate
+
+    if source == target:
+        raise ValueError(f"Source and target are both {source}.")
+    config = load_config()
+    return migrate(get_backend(config, source), get_backend(config, target))
+
+
+def export_columns() -> int:
+    """Append results stored since the last export to the columnar export.
+
+    With a backend other than JSONL, the export is rebuilt from all results.
+
+    Returns:
+        Number of rows appended.
+    """
+    from game.columnar import ColumnStore
+
+    config = load_config()
+    return _export(ColumnStore.from_config(config), get_backend(config))
+
+
+def _export(columns: "ColumnStore", backend: LeaderboardBackend) -> int:
+    """Export a backend's results into a ColumnStore."""
+    if isinstance(backend, JsonlBackend):
+        return columns.export(backend.store)
+    return columns.export_results(backend.iter_results(), backend.name)
+
+
+def leaderboard_stats(by: str = "category") -> List["GroupStats"]:
+    """Refresh the columnar export and aggregate it per category or day.
+
+    Args:
+        by: ``category`` or ``day``.
+
+    Returns:
+        Score distribution, mean time and hint usage per group.
+
+    Raises:
+        ValueError: If ``by`` is not a supported grouping.
+    """
+    from game.columnar import ColumnStore, group_stats
+
+    config = load_config()
+    columns = ColumnStore.from_config(config)
+    _export(columns, get_backend(config))
+    return group_stats(columns.load(), by)
+
+
+def format_player_stats(stats: "ViewStats") -> str:
+    """Format a player's statistics for printing.
+
+    Args:
+        stats: ViewStats returned by player_stats.
+
+    Returns:
+        Formatted statistics string.
+    """
+    best = stats.best
+    return "\n".join([
+        f"Player: {stats.name}",
+        f"Attempts: {stats.attempts}",
+        f"Average Score: {stats.average_score:.2f}",
+        f"Best: {best.score}/{best.total} in {best.seconds:.1f}s ({best.category}, {best.timestamp})",
+    ])
 
 
 def format_table(results: List[Result]) -> str:
@@ -68,3 +256,31 @@ def format_table(results: List[Result]) -> str:
 
     lines.append("=" * 78)
     return "\n".join(lines)
+
+
+def format_recent(results: List[Result]) -> str:
+    """Format recent results, newest first, as a printable table.
+
+    Args:
+        results: List of Result objects.
+
+    Returns:
+        Formatted table string.
+    """
+    if not results:
+        return "No results yet!"
+
+    lines = []
+    lines.append("=" * 78)
+    lines.append(f"{'When (UTC)':<20} {'Player':<15} {'Score':<10} {'Time (s)':<10} {'Category':<12}")
+    lines.append("=" * 78)
+
+    for result in results:
+        when = result.timestamp[:19].replace("T", " ")
+        score_display = f"{result.score}/{result.total}"
+        lines.append(
+            f"{when:<20} {result.player:<15} {score_display:<10} {result.seconds:<10.1f} {result.category:<12}"
+        )
+
+    lines.append("=" * 78)
+    return "\n".join(lines)
@@ -1,7 +1,9 @@
 """Data models for the AI Quiz Game."""
 
+import sys
+from array import array
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterator, List, Sequence, Tuple
 
 
 @dataclass
@@ -27,3 +29,215 @@ class Result:
     category: str
     timestamp: str
     hints_used: int = 0
+
+
+@dataclass
+class AnswerEvent:
+    """One answered (or timed out) question within a quiz session.
+
+    A choice of -1 means the question timed out unanswered.
+    """
+    session: int
+    question_id: str
+    choice: int
+    correct: bool
+    hint_used: bool
+    seconds: float
+    timestamp: float
+
+
+@dataclass(frozen=True)
+class Rank:
+    """Where a result stands on the leaderboard.
+
+    Results with the same score and time share a rank.
+    """
+    position: int
+    total: int
+
+    @property
+    def top_percent(self) -> float:
+        """Percentage of results ranked at or above this one."""
+        return 100.0 * self.position / self.total if self.total else 0.0
+
+
+def question_from_dict(item: dict) -> Question:
+    """Build a Question from a decoded question-bank record."""
+    return Question(
+        id=item["id"],
+        category=item["category"],
+        difficulty=item["difficulty"],
+        prompt=item["prompt"],
+        choices=item["choices"],
+        answer_index=item["answer_index"],
+        hint=item.get("hint", "No hint available")
+    )
+
+
+def question_to_dict(question: Question) -> dict:
+    """Convert a Question to its question-bank record."""
+    return {
+        "id": question.id,
+        "category": question.category,
+        "difficulty": question.difficulty,
+        "prompt": question.prompt,
+        "choices": list(question.choices),
+        "answer_index": question.answer_index,
+        "hint": question.hint
+    }
+
+
+def result_to_dict(result: Result) -> dict:
+    """Convert a Result to the JSON record stored in the leaderboard."""
+    return {
+        "player": result.player,
+        "score": result.score,
+        "total": result.total,
+        "streak_max": result.streak_max,
+        "seconds": result.seconds,
+        "category": result.category,
+        "timestamp": result.timestamp,
+        "hints_used": result.hints_used
+    }
+
+
+def result_from_dict(data: dict) -> Result:
+    """Build a Result from a decoded leaderboard record."""
+    return Result(
+        player=data["player"],
+        score=data["score"],
+        total=data["total"],
+        streak_max=data["streak_max"],
+        seconds=data["seconds"],
+        category=data["category"],
+        timestamp=data["timestamp"],
+        hints_used=data.get("hints_used", 0)  # Default to 0 for old records
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CompactQuestion:
+    """Immutable, slotted Question with tuple choices.
+
+    Build with ``from_question`` or ``compact_question`` so category and
+    difficulty strings are interned and shared between instances.
+    """
+    id: str
+    category: str
+    difficulty: str
+    prompt: str
+    choices: Tuple[str, ...]
+    answer_index: int
+    hint: str
+
+    @classmethod
+    def from_question(cls, question: "Question") -> "CompactQuestion":
+        """Convert a Question into its compact form."""
+        return compact_question(
+            question.id, question.category, question.difficulty, question.prompt,
+            question.choices, question.answer_index, question.hint
+        )
+
+
+def compact_question(
+    id: str,
+    category: str,
+    difficulty: str,
+    prompt: str,
+    choices: Sequence[str],
+    answer_index: int,
+    hint: str
+) -> CompactQuestion:
+    """Build a CompactQuestion with interned category and difficulty."""
+    return CompactQuestion(
+        id, sys.intern(category), sys.intern(difficulty), prompt,
+        tuple(choices), answer_index, hint
+    )
+
+
+class QuestionTable:
+    """Columnar, array-backed container for a whole question bank.
+
+    Categories and difficulties are stored once in small dictionaries and
+    referenced by two-byte codes; answer indices live in an unsigned two-byte
+    array (0 to 65535). Rows are materialized as CompactQuestion objects only
+    when indexed, so the table stands in for a list of questions: JSON banks
+    are loaded into one for QuestionBank (see ``game.app.load_bank``).
+    """
+
+    def __init__(self):
+        """Create an empty table."""
+        self.ids: List[str] = []
+        self.prompts: List[str] = []
+        self.choices: List[Tuple[str, ...]] = []
+        self.hints: List[str] = []
+        self.answers = array("H")
+        self.category_codes = array("H")
+        self.difficulty_codes = array("H")
+        self.categories: List[str] = []
+        self.difficulties: List[str] = []
+        self._category_lookup: Dict[str, int] = {}
+        self._difficulty_lookup: Dict[str, int] = {}
+
+    @classmethod
+    def from_columns(cls, columns: Sequence[Sequence]) -> "QuestionTable":
+        """Build a table from per-field columns in Question field order."""
+        table = cls()
+        for row in zip(*columns):
+            table.append(*row)
+        return table
+
+    @staticmethod
+    def _code(value: str, values: List[str], lookup: Dict[str, int]) -> int:
+        """Return the dictionary code for a value, adding it if new."""
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(sys.intern(value))
+        return code
+
+    def append(
+        self,
+        id: str,
+        category: str,
+        difficulty: str,
+        prompt: str,
+        choices: Sequence[str],
+        answer_index: int,
+        hint: str
+    ) -> None:
+        """Add one question to the table.
+
+        Raises:
+            ValueError: If ``answer_index`` does not fit the answers array.
+        """
+        if not 0 <= answer_index < 1 << 16:
+            raise ValueError(f"answer_index {answer_index} of question {id} is out of range (0 to 65535)")
+        self.ids.append(id)
+        self.category_codes.append(self._code(category, self.categories, self._category_lookup))
+        self.difficulty_codes.append(self._code(difficulty, self.difficulties, self._difficulty_lookup))
+        self.prompts.append(prompt)
+        self.choices.append(tuple(choices))
+        self.answers.append(answer_index)
+        self.hints.append(hint)
+
+    def __len__(self) -> int:
+        """Return the number of questions."""
+        return len(self.ids)
+
+    def __getitem__(self, idx: int) -> CompactQuestion:
+        """Materialize the question at ``idx``."""
+        return CompactQuestion(
+            self.ids[idx],
+            self.categories[self.category_codes[idx]],
+            self.difficulties[self.difficulty_codes[idx]],
+            self.prompts[idx],
+            self.choices[idx],
+            self.answers[idx],
+            self.hints[idx]
+        )
+
+    def __iter__(self) -> Iterator[CompactQuestion]:
+        """Materialize every question in order."""
+        for idx in range(len(self.ids)):
+            yield self[idx]
@@ -0,0 +1,309 @@
+"""Persistent ranking index for the leaderboard file.
+
+The index lives next to ``leaderboard.jsonl`` and is made of two files:
+
+* ``<leaderboard>.idx`` - a header followed by fixed-width records sorted by
+  ranking key (score desc, seconds asc, file offset asc).
+* ``<leaderboard>.idx.tail`` - records for recently appended lines, in append
+  order. It is kept small and merged into the sorted file once it grows past
+  ``TAIL_LIMIT`` records.
+
+Each record stores the score and seconds used for ranking plus the byte offset
+and length of the JSON line, so a top-N query reads N records and N lines
+instead of parsing and sorting the whole leaderboard, and the rank of a score
+is found by bisecting the fixed-width records in O(log n) reads.
+"""
+
+import heapq
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+HEADER = struct.Struct("<4sHQQ")  # magic, version, covered bytes, record count
+RECORD = struct.Struct("<ddQI")  # score, seconds, offset, length
+MAGIC = b"QIDX"
+VERSION = 1
+TAIL_LIMIT = 1024
+READ_BATCH = 4096
+
+Entry = Tuple[float, float, int, int]
+
+
+def rank_key(entry: Entry) -> Tuple[float, float, int]:
+    """Return the sort key for an index entry.
+
+    Args:
+        entry: Tuple of (score, seconds, offset, length).
+
+    Returns:
+        Key ordering by score descending, then seconds and offset ascending.
+    """
+    return (-entry[0], entry[1], entry[2])
+
+
+def parse_entry(line: bytes, offset: int) -> Entry:
+    """Build an index entry from one raw leaderboard line.
+
+    Args:
+        line: The raw line including its trailing newline.
+        offset: Byte offset of the line in the leaderboard file.
+
+    Returns:
+        Tuple of (score, seconds, offset, length).
+
+    Raises:
+        ValueError: If the line is not a valid result record.
+    """
+    try:
+        data = json.loads(line)
+        return (float(data["score"]), float(data["seconds"]), offset, len(line))
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed leaderboard line at offset {offset}") from e
+
+
+def scan_entries(path: Path, start: int = 0) -> Tuple[List[Entry], int]:
+    """Parse complete leaderboard lines from ``start`` to end of file.
+
+    Blank and malformed lines are skipped. A trailing line without a newline
+    (a write still in progress or cut short by a crash) is left unindexed.
+
+    Args:
+        path: Path to the leaderboard file.
+        start: Byte offset to start scanning from.
+
+    Returns:
+        Tuple of (entries found, offset just past the last complete line).
+    """
+    entries = []
+    offset = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                try:
+                    entries.append(parse_entry(line, offset))
+                except ValueError:
+                    pass
+            offset += len(line)
+    return entries, offset
+
+
+class RankingIndex:
+    """Sorted on-disk index over a leaderboard JSONL file."""
+
+    def __init__(self, leaderboard_path: Path):
+        """Initialize the index for a leaderboard file.
+
+        Args:
+            leaderboard_path: Path to the leaderboard JSONL file.
+        """
+        self.source = Path(leaderboard_path)
+        self.path = Path(f"{self.source}.idx")
+        self.tail_path = Path(f"{self.source}.idx.tail")
+
+    def _read_header(self) -> Tuple[int, int]:
+        """Return (covered bytes, sorted record count), or (-1, 0) if invalid."""
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read(HEADER.size)
+        except FileNotFoundError:
+            return -1, 0
+        if len(raw) < HEADER.size:
+            return -1, 0
+        magic, version, covered, count = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION:
+            return -1, 0
+        return covered, count
+
+    def _read_tail(self) -> List[Entry]:
+        """Return the unsorted tail records in append order."""
+        try:
+            with open(self.tail_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        usable = len(data) - len(data) % RECORD.size
+        return list(RECORD.iter_unpack(data[:usable]))
+
+    def _covered(self) -> int:
+        """Return how many bytes of the leaderboard the index accounts for."""
+        covered, _ = self._read_header()
+        if covered < 0:
+            return -1
+        tail = self._read_tail()
+        if tail:
+            last = tail[-1]
+            covered = max(covered, last[2] + last[3])
+        return covered
+
+    def is_current(self) -> bool:
+        """Whether the index covers every byte of the leaderboard file."""
+        try:
+            size = self.source.stat().st_size
+        except FileNotFoundError:
+            return False
+        return size == 0 or self._covered() == size
+
+    def _write_sorted(self, entries: List[Entry], covered: int) -> None:
+        """Atomically replace the sorted file and clear the tail."""
+        tmp_path = Path(f"{self.path}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, covered, len(entries)))
+            for entry in entries:
+                f.write(RECORD.pack(*entry))
+        os.replace(tmp_path, self.path)
+        self.tail_path.unlink(missing_ok=True)
+
+    def rebuild(self) -> int:
+        """Rebuild the index from a full scan of the leaderboard.
+
+        Returns:
+            Number of results indexed.
+        """
+        if not self.source.exists():
+            self.path.unlink(missing_ok=True)
+            self.tail_path.unlink(missing_ok=True)
+            return 0
+        entries, covered = scan_entries(self.source)
+        entries.sort(key=rank_key)
+        self._write_sorted(entries, covered)
+        return len(entries)
+
+    def sync(self) -> None:
+        """Bring the index up to date with the leaderboard file.
+
+        Lines appended since the last sync are added to the tail. A missing
+        index, or one covering more bytes than the file holds (the file was
+        truncated or replaced), triggers a full rebuild.
+        """
+        if not self.source.exists():
+            return
+        size = self.source.stat().st_size
+        covered = self._covered()
+        if covered < 0 or covered > size:
+            self.rebuild()
+            return
+        if covered == size:
+            return
+
+        new_entries, end = scan_entries(self.source, covered)
+        if new_entries:
+            with open(self.tail_path, "ab") as f:
+                f.write(b"".join(RECORD.pack(*entry) for entry in new_entries))
+        if end > covered:
+            self._set_covered(end)
+        if len(self._read_tail()) > TAIL_LIMIT:
+            self.merge()
+
+    def _set_covered(self, covered: int) -> None:
+        """Update the covered byte count in the sorted file header in place."""
+        _, count = self._read_header()
+        with open(self.path, "r+b") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, covered, count))
+
+    def merge(self) -> None:
+        """Fold the tail records into the sorted file."""
+        covered = self._covered()
+        tail = sorted(self._read_tail(), key=rank_key)
+        merged = list(heapq.merge(self._iter_sorted(), tail, key=rank_key))
+        self._write_sorted(merged, covered)
+
+    def _iter_sorted(self, limit: int = -1) -> Iterator[Entry]:
+        """Yield records from the sorted file, up to ``limit`` if given."""
+        _, count = self._read_header()
+        if limit >= 0:
+            count = min(count, limit)
+        if count <= 0:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(HEADER.size)
+            while count > 0:
+                batch = min(count, READ_BATCH)
+                yield from RECORD.iter_unpack(f.read(batch * RECORD.size))
+                count -= batch
+
+    def _pending(self) -> Tuple[bool, List[Entry]]:
+        """Return whether the index is usable, and entries for lines it misses.
+
+        Lines appended since the last sync are scanned; if the index is
+        missing or covers more bytes than the file holds, the whole file is.
+        Nothing is written, so readers need no write access; ``sync()``
+        keeps the scan short by folding new lines into the index.
+        """
+        try:
+            size = self.source.stat().st_size
+        except FileNotFoundError:
+            return False, []
+        covered = self._covered()
+        if covered < 0 or covered > size:
+            return False, scan_entries(self.source)[0]
+        if covered == size:
+            return True, []
+        return True, scan_entries(self.source, covered)[0]
+
+    def _unsorted(self) -> Tuple[bool, List[Entry]]:
+        """Return whether the sorted file is usable, and every other entry, sorted."""
+        usable, pending = self._pending()
+        extra = self._read_tail() + pending if usable else pending
+        return usable, sorted(extra, key=rank_key)
+
+    def ranked(self) -> Iterator[Entry]:
+        """Yield every entry in ranking order, streaming the sorted file.
+
+        Lines not yet indexed are included without writing the index.
+        """
+        usable, extra = self._unsorted()
+        yield from heapq.merge(self._iter_sorted() if usable else iter(()), extra, key=rank_key)
+
+    def top(self, n: int) -> List[Entry]:
+        """Return the n best entries in ranking order.
+
+        Only the first n sorted records, the small tail and any lines not
+        yet indexed are read; the index is not written.
+
+        Args:
+            n: Number of entries to return.
+
+        Returns:
+            List of (score, seconds, offset, length) tuples.
+        """
+        if n <= 0:
+            return []
+        usable, extra = self._unsorted()
+        merged = heapq.merge(self._iter_sorted(n) if usable else iter(()), extra, key=rank_key)
+        return [entry for entry, _ in zip(merged, range(n))]
+
+    def count_ahead(self, score: float, seconds: float) -> Tuple[int, int]:
+        """Count the entries ranked strictly ahead of a score and time.
+
+        Bisects the sorted file, reading O(log n) records, and scans the
+        small tail and any lines not yet indexed; the index is not written.
+
+        Args:
+            score: Score to rank.
+            seconds: Time taken, which breaks score ties.
+
+        Returns:
+            Tuple of (entries ranked ahead, total entries).
+        """
+        target = (-score, seconds)
+        usable, extra = self._unsorted()
+        ahead = sum(1 for entry in extra if (-entry[0], entry[1]) < target)
+
+        count = self._read_header()[1] if usable else 0
+        lo, hi = 0, count
+        if count > 0:
+            with open(self.path, "rb") as f:
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    f.seek(HEADER.size + mid * RECORD.size)
+                    entry = RECORD.unpack(f.read(RECORD.size))
+                    if (-entry[0], entry[1]) < target:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+        return ahead + lo, count + len(extra)
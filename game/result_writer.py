@@ -0,0 +1,168 @@
+"""Durable, concurrency-safe leaderboard writes with group commit."""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from game.models import Result, result_to_dict
+from game.ranking_index import RankingIndex
+from game.segments import SegmentedLeaderboard
+from game.views import DEFAULT_VIEW_TOP_K, LeaderboardViews
+from utils.metrics import inc, span
+
+logger = logging.getLogger(__name__)
+
+class _PendingWrite:
+    """One result and its encoded line waiting to be committed."""
+    __slots__ = ("result", "line", "done", "error")
+
+    def __init__(self, result: Result):
+        self.result = result
+        self.line = (json.dumps(result_to_dict(result)) + "\n").encode()
+        self.done = False
+        self.error = None
+
+
+class ResultWriter:
+    """Appends results to the leaderboard safely under concurrency.
+
+    Every commit takes the leaderboard's inter-process lock, appends whole
+    lines with a single write, fsyncs, then updates the ranking index and the
+    per-category and per-player views and rotates the live file if needed.
+    A batch counts as committed once the fsync returns: the index, views and
+    rotation are derived upkeep, so a failure there is logged rather than
+    raised (the index and views are caught up later, see ``_maintain``).
+    Threads that call ``write`` while another commit is in flight queue their
+    lines, and the next committer writes the whole queue at once (group
+    commit), so one fsync covers many results.
+    """
+
+    def __init__(self, store: SegmentedLeaderboard, views: Optional[LeaderboardViews] = None):
+        """Initialize the writer.
+
+        Args:
+            store: The segmented leaderboard to append to.
+            views: Views to keep up to date (default: the store's views).
+        """
+        self.store = store
+        self.views = views or LeaderboardViews(store)
+        self.path = store.live_path
+        self._pending: List[_PendingWrite] = []
+        self._pending_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+
+    def write(self, result: Result) -> None:
+        """Append one result, returning once it is durably committed.
+
+        Args:
+            result: The Result to save.
+
+        Raises:
+            OSError: If the batch containing this result could not be written
+                and fsynced; it was then not committed and may be retried.
+        """
+        item = _PendingWrite(result)
+        with self._pending_lock:
+            self._pending.append(item)
+
+        with self._commit_lock:
+            if not item.done:
+                with self._pending_lock:
+                    batch, self._pending = self._pending, []
+                try:
+                    self._commit(batch)
+                except BaseException as e:
+                    for pending in batch:
+                        pending.error = e
+                finally:
+                    for pending in batch:
+                        pending.done = True
+
+        if item.error is not None:
+            raise item.error
+
+    def write_many(self, results: List[Result]) -> None:
+        """Append several results in one commit.
+
+        Args:
+            results: Results to save.
+        """
+        batch = [_PendingWrite(result) for result in results]
+        with self._commit_lock:
+            self._commit(batch)
+
+    def _commit(self, batch: List[_PendingWrite]) -> None:
+        """Write, fsync and index a batch of results under the file lock."""
+        if not batch:
+            return
+        data = b"".join(pending.line for pending in batch)
+        inc("leaderboard.commits")
+        inc("leaderboard.results_written", len(batch))
+
+        with span("leaderboard.commit"), self.store.lock():
+            stale = self.views.prepare()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # Never glue a line onto a partial line left by a crashed writer
+                if os.fstat(fd).st_size and not _ends_with_newline(self.path):
+                    data = b"\n" + data
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+            # Index the new lines so top_n never has to rescan the whole file
+            self._maintain("index", lambda: RankingIndex(self.path).sync())
+            self._maintain("views", lambda: self.views.apply((pending.result for pending in batch), stale))
+            self._maintain("rotation", self.store.maybe_rotate)
+
+    def _maintain(self, step: str, action: Callable[[], object]) -> None:
+        """Run post-commit upkeep, logging instead of raising on failure.
+
+        The batch is already durable, so raising would make callers retry
+        and write it twice. Nothing is lost by skipping a step: readers scan
+        lines the index has not covered and the next commit syncs it, views
+        whose update failed keep their dirty marker and are rebuilt by the
+        next commit, and rotation is retried by the next commit.
+        """
+        try:
+            action()
+        except Exception as e:
+            inc("leaderboard.maintenance_errors")
+            logger.warning("Leaderboard %s update failed after commit to %s: %s", step, self.path, e)
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """Whether a non-empty file ends with a newline."""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+_writers: Dict[Path, ResultWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(config: dict) -> ResultWriter:
+    """Return the shared ResultWriter for the configured leaderboard.
+
+    Writers are shared per leaderboard path so that concurrent saves in one
+    process are group committed together.
+
+    Args:
+        config: Configuration dictionary from load_config().
+
+    Returns:
+        The ResultWriter for ``config["leaderboard_path"]``.
+    """
+    store = SegmentedLeaderboard.from_config(config)
+    with _writers_lock:
+        writer = _writers.get(store.live_path)
+        if writer is None:
+            views = LeaderboardViews(store, config.get("view_top_k", DEFAULT_VIEW_TOP_K))
+            writer = _writers[store.live_path] = ResultWriter(store, views)
+        return writer
@@ -0,0 +1,542 @@
+"""Segmented leaderboard storage with compaction.
+
+Results are appended to the live file (``leaderboard.jsonl``). Once it grows
+past ``segment_max_bytes`` it is rotated into ``<leaderboard>.segments/`` as
+``live-<seq>.jsonl`` together with its ranking index. Compaction merges every
+rotated segment, and any earlier compacted segment, into a single
+``sorted-<seq>.jsonl`` whose lines are already in ranking order and hold only
+the Result fields. Every segment has a ranking index, so ranks are found by
+bisecting each index rather than reading results.
+
+A compacted segment's sequence number is the highest one it includes, so
+segments left over by an interrupted compaction (sequence numbers at or below
+it) are ignored by readers and removed by the next compaction. Only one
+compaction runs at a time, across processes.
+"""
+
+import errno
+import heapq
+import json
+import logging
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+from game.models import Result, result_from_dict, result_to_dict
+from game.ranking_index import RankingIndex
+from utils.filelock import FileLock
+from utils.metrics import inc, span
+
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ROTATED_SEGMENTS = 4
+SEGMENT_PATTERN = re.compile(r"^(live|sorted)-(\d{8})\.jsonl$")
+READ_ATTEMPTS = 3  # lock-free reads before one is made under the lock
+READ_ONLY_ERRNOS = (errno.EACCES, errno.EPERM, errno.EROFS)
+
+logger = logging.getLogger(__name__)
+_hinted: set = set()
+T = TypeVar("T")
+
+
+def result_key(result: Result) -> Tuple[float, float]:
+    """Return the ranking key: score descending, then seconds ascending."""
+    return (-result.score, result.seconds)
+
+
+def _parse_line(line: bytes) -> Optional[Result]:
+    """Parse a leaderboard line, returning None if it is blank or malformed."""
+    if not line.strip():
+        return None
+    try:
+        return result_from_dict(json.loads(line))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _read_indexed(path: Path, entries) -> Iterator[Result]:
+    """Yield Results for index entries by seeking to each line."""
+    with open(path, "rb") as f:
+        for _, _, offset, length in entries:
+            f.seek(offset)
+            result = _parse_line(f.read(length))
+            if result is not None:
+                yield result
+
+
+def _read_sorted(path: Path) -> Iterator[Result]:
+    """Yield Results from a compacted segment, already in ranking order."""
+    with open(path, "rb") as f:
+        for line in f:
+            result = _parse_line(line)
+            if result is not None:
+                yield result
+
+
+def _read_prefix(f, size: int) -> Iterator[Result]:
+    """Yield Results from the complete lines in the first ``size`` bytes of an open file."""
+    offset = 0
+    for line in f:
+        offset += len(line)
+        if offset > size or not line.endswith(b"\n"):
+            return
+        result = _parse_line(line)
+        if result is not None:
+            yield result
+
+
+def _read_reversed(f) -> Iterator[Result]:
+    """Yield Results from an open file, last line first, then close it.
+
+    The file is memory-mapped and scanned backwards for newlines, so only
+    the lines actually consumed are parsed. A last line without a newline
+    (a write still in progress) is skipped.
+    """
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = data.rfind(b"\n") + 1
+            while end > 0:
+                start = data.rfind(b"\n", 0, end - 1) + 1
+                result = _parse_line(data[start:end])
+                if result is not None:
+                    yield result
+                end = start
+
+
+def _remove_with_index(path: Path) -> None:
+    """Delete a segment file and any ranking index files next to it."""
+    index = RankingIndex(path)
+    for p in (path, index.path, index.tail_path):
+        p.unlink(missing_ok=True)
+
+
+class SegmentedLeaderboard:
+    """A live leaderboard file plus rotated and compacted segments."""
+
+    def __init__(
+        self,
+        leaderboard_path: Path,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        max_rotated_segments: int = DEFAULT_MAX_ROTATED_SEGMENTS
+    ):
+        """Initialize the store.
+
+        Args:
+            leaderboard_path: Path to the live leaderboard JSONL file.
+            segment_max_bytes: Live file size that triggers rotation.
+            max_rotated_segments: Rotated segment count that makes compaction due.
+        """
+        self.live_path = Path(leaderboard_path)
+        self.segment_dir = Path(f"{self.live_path}.segments")
+        self.segment_max_bytes = segment_max_bytes
+        self.max_rotated_segments = max_rotated_segments
+
+    @classmethod
+    def from_config(cls, config: dict) -> "SegmentedLeaderboard":
+        """Build the store described by a configuration dictionary."""
+        return cls(
+            config["leaderboard_path"],
+            config.get("segment_max_bytes", DEFAULT_SEGMENT_MAX_BYTES),
+            config.get("max_rotated_segments", DEFAULT_MAX_ROTATED_SEGMENTS)
+        )
+
+    def lock(self) -> FileLock:
+        """Return the inter-process lock guarding appends and rotation."""
+        return FileLock(Path(f"{self.live_path}.lock"))
+
+    def compaction_lock(self) -> FileLock:
+        """Return the inter-process lock held for a whole compaction.
+
+        It is separate from ``lock()`` so writers keep appending while a
+        compaction merges; take it before ``lock()``, never inside it.
+        """
+        return FileLock(Path(f"{self.live_path}.compact.lock"))
+
+    @contextmanager
+    def _read_lock(self):
+        """Hold ``lock()`` while a reader lists its files, if it can be taken.
+
+        Yields whether the lock is held. Readers without write access to the
+        leaderboard's folder cannot create the lock file and go without it.
+        """
+        lock = self.lock()
+        try:
+            lock.__enter__()
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            lock.__exit__(None, None, None)
+
+    def _sync_indexes(self, paths: List[Path]) -> None:
+        """Bring the ranking indexes of ``paths`` up to date, if they can be written.
+
+        Leaderboards written before the indexes existed are indexed by the
+        first reader that can write them. Without write access the readers
+        scan what the indexes miss, and a hint to run ``rebuild-index`` is
+        logged once. The caller must hold ``lock()``.
+        """
+        for path in paths:
+            if not path.exists():
+                continue
+            try:
+                RankingIndex(path).sync()
+            except OSError as e:
+                if e.errno not in READ_ONLY_ERRNOS:
+                    raise
+                self._hint_unindexed()
+                return
+
+    def _check_indexes(self, locked: bool, paths: List[Path]) -> None:
+        """Sync the indexes of ``paths`` if ``lock()`` is held, else hint when they are stale."""
+        if locked:
+            self._sync_indexes(paths)
+        elif not all(RankingIndex(path).is_current() for path in paths if path.exists()):
+            self._hint_unindexed()
+
+    def _hint_unindexed(self) -> None:
+        """Log, once per leaderboard, that reads are scanning un-indexed lines."""
+        inc("leaderboard.unindexed_reads")
+        if self.live_path not in _hinted:
+            _hinted.add(self.live_path)
+            logger.warning(
+                "%s has no current ranking index and it cannot be written here; "
+                "reads scan the whole file until `rebuild-index` is run with write access.",
+                self.live_path
+            )
+
+    def _read_consistent(self, read: Callable[[Optional[Path], List[Path]], T]) -> T:
+        """Run ``read(compacted, sources)`` against one generation of the files.
+
+        ``sources`` are the rotated segments and live file. The files are
+        listed (and their indexes synced) under ``lock()`` and read without
+        it; if a rotation or compaction changed the listing meanwhile, the
+        read is repeated, and the last attempt holds the lock throughout.
+        """
+        for _ in range(READ_ATTEMPTS - 1):
+            with self._read_lock() as locked:
+                compacted, rotated = listing = self.segments()
+                sources = rotated + [self.live_path]
+                self._check_indexes(locked, sources)
+            try:
+                result = read(compacted, sources)
+            except FileNotFoundError:
+                continue  # a file was rotated or compacted away while being read
+            if self.segments() == listing:
+                return result
+
+        with self._read_lock():
+            compacted, rotated = self.segments()
+            return read(compacted, rotated + [self.live_path])
+
+    def _scan(self) -> List[Tuple[int, str, Path]]:
+        """Return (seq, kind, path) for every segment file, oldest first."""
+        if not self.segment_dir.exists():
+            return []
+        found = []
+        for path in self.segment_dir.iterdir():
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                found.append((int(match.group(2)), match.group(1), path))
+        found.sort()
+        return found
+
+    def segments(self) -> Tuple[Optional[Path], List[Path]]:
+        """Return the current compacted segment and the rotated segments.
+
+        Returns:
+            Tuple of (compacted segment or None, rotated segments oldest first).
+        """
+        found = self._scan()
+        compacted_seq = max((seq for seq, kind, _ in found if kind == "sorted"), default=0)
+        compacted = None
+        rotated = []
+        for seq, kind, path in found:
+            if kind == "sorted" and seq == compacted_seq:
+                compacted = path
+            elif seq > compacted_seq:
+                rotated.append(path)
+        return compacted, rotated
+
+    def _next_seq(self) -> int:
+        """Return the next unused segment sequence number."""
+        found = self._scan()
+        return found[-1][0] + 1 if found else 1
+
+    def rotate(self) -> Optional[Path]:
+        """Move the live file and its index into a new rotated segment.
+
+        The caller must hold ``lock()``.
+
+        Returns:
+            Path of the new segment, or None if the live file was empty.
+        """
+        if not self.live_path.exists() or self.live_path.stat().st_size == 0:
+            return None
+
+        self.segment_dir.mkdir(exist_ok=True)
+        target = self.segment_dir / f"live-{self._next_seq():08d}.jsonl"
+        live_index = RankingIndex(self.live_path)
+        live_index.sync()
+
+        os.replace(self.live_path, target)
+        target_index = RankingIndex(target)
+        for src, dst in ((live_index.path, target_index.path), (live_index.tail_path, target_index.tail_path)):
+            if src.exists():
+                os.replace(src, dst)
+        return target
+
+    def maybe_rotate(self) -> Optional[Path]:
+        """Rotate the live file if it has reached ``segment_max_bytes``.
+
+        The caller must hold ``lock()``.
+        """
+        if self.live_path.exists() and self.live_path.stat().st_size >= self.segment_max_bytes:
+            return self.rotate()
+        return None
+
+    def needs_compaction(self) -> bool:
+        """Whether enough rotated segments have piled up to compact."""
+        _, rotated = self.segments()
+        return len(rotated) >= self.max_rotated_segments
+
+    def compact(self, rotate_live: bool = True) -> Tuple[int, int]:
+        """Merge all segments into one sorted segment.
+
+        Malformed lines are dropped and records are rewritten with only the
+        Result fields. Ties keep chronological order, as in a full sort.
+        Segments are immutable once rotated, so only the rotation step has to
+        be coordinated with writers; ``compaction_lock()`` is held throughout
+        so concurrent compactions (e.g. the CLI and the server) cannot merge,
+        replace or delete the same segments at once.
+
+        Args:
+            rotate_live: Rotate the live file first so it is compacted too.
+
+        Returns:
+            Tuple of (segments merged, results kept).
+        """
+        with span("leaderboard.compact"), self.compaction_lock():
+            return self._compact(rotate_live)
+
+    def _compact(self, rotate_live: bool) -> Tuple[int, int]:
+        """Compact as documented on compact, without the metrics span."""
+        if rotate_live:
+            with self.lock():
+                self.rotate()
+        compacted, rotated = self.segments()
+        inputs = ([compacted] if compacted else []) + rotated
+        if not inputs or (compacted and not rotated):
+            return 0, 0
+
+        sources = [_read_sorted(compacted)] if compacted else []
+        for path in rotated:
+            index = RankingIndex(path)
+            index.sync()
+            sources.append(_read_indexed(path, index.ranked()))
+
+        upto = max(int(SEGMENT_PATTERN.match(p.name).group(2)) for p in inputs)
+        target = self.segment_dir / f"sorted-{upto:08d}.jsonl"
+        tmp_path = Path(f"{target}.tmp")
+
+        kept = 0
+        with open(tmp_path, "w") as f:
+            for result in heapq.merge(*sources, key=result_key):
+                f.write(json.dumps(result_to_dict(result)) + "\n")
+                kept += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+        RankingIndex(target).rebuild()
+
+        # Everything at or below ``upto`` is now superseded by ``target``
+        for seq, _, path in self._scan():
+            if seq <= upto and path != target:
+                _remove_with_index(path)
+
+        return len(inputs), kept
+
+    def iter_results(self) -> Iterator[Result]:
+        """Yield every stored result, oldest segments first.
+
+        The compacted segment comes first (in ranking order, ties
+        chronological), then rotated segments and the live file in append
+        order. Hold ``lock()`` so no rotation happens while iterating.
+        """
+        compacted, rotated = self.segments()
+        paths = ([compacted] if compacted else []) + rotated
+        if self.live_path.exists():
+            paths.append(self.live_path)
+        for path in paths:
+            yield from _read_sorted(path)
+
+    def iter_snapshot(self) -> Iterator[Result]:
+        """Yield every result stored when iteration starts, in ``iter_results`` order.
+
+        The files are opened and their sizes taken under ``lock()`` (if it
+        can be taken), then read without it: open files stay readable if a
+        rotation or compaction moves them, and lines appended later are not
+        read, so writers are only held up while the files are opened.
+        """
+        with self._read_lock():
+            compacted, rotated = self.segments()
+            files = []
+            try:
+                for path in ([compacted] if compacted else []) + rotated + [self.live_path]:
+                    try:
+                        files.append(open(path, "rb"))
+                    except FileNotFoundError:
+                        continue  # no live file yet
+                sizes = [os.fstat(f.fileno()).st_size for f in files]
+            except BaseException:
+                for f in files:
+                    f.close()
+                raise
+
+        try:
+            for f, size in zip(files, sizes):
+                yield from _read_prefix(f, size)
+        finally:
+            for f in files:
+                f.close()
+
+    def indexed(self) -> bool:
+        """Whether the rotated segments and live file all have current ranking indexes."""
+        _, rotated = self.segments()
+        paths = rotated + ([self.live_path] if self.live_path.exists() else [])
+        return all(RankingIndex(path).is_current() for path in paths)
+
+    def ranked(self) -> Iterator[Result]:
+        """Yield every stored result in ranking order, reading lazily.
+
+        Streams the compacted segment and the ranking indexes of the rotated
+        segments and live file as they are on disk. Nothing is locked or
+        written, so this also works on read-only copies of a leaderboard.
+        Lines the indexes do not cover are parsed and sorted in memory, so
+        check ``indexed()`` first when that matters.
+        """
+        compacted, rotated = self.segments()
+        sources = [_read_sorted(compacted)] if compacted else []
+        for path in rotated + ([self.live_path] if self.live_path.exists() else []):
+            sources.append(_read_indexed(path, RankingIndex(path).ranked()))
+        # Sources are passed oldest first so ties keep chronological order
+        return heapq.merge(*sources, key=result_key)
+
+    def rank(self, score: float, seconds: float) -> Tuple[int, int]:
+        """Count the stored results ranked strictly ahead of a score and time.
+
+        Bisects the ranking index of every segment and the live file, so the
+        cost grows with log n rather than n. Indexes that miss lines are
+        synced first if the leaderboard can be written; otherwise the lines
+        they miss are scanned, so readers need no write access.
+
+        Args:
+            score: Score to rank.
+            seconds: Time taken, which breaks score ties.
+
+        Returns:
+            Tuple of (results ranked ahead, total results).
+        """
+        if not (self.live_path.exists() or self.segment_dir.exists()):
+            return 0, 0
+
+        with span("leaderboard.rank"):
+            return self._read_consistent(lambda compacted, sources: self._rank(compacted, sources, score, seconds))
+
+    @staticmethod
+    def _rank(compacted: Optional[Path], sources: List[Path], score: float, seconds: float) -> Tuple[int, int]:
+        """Sum the per-source counts of results ranked ahead."""
+        ahead = total = 0
+        for path in ([compacted] if compacted else []) + sources:
+            if not path.exists():
+                continue
+            source_ahead, source_total = RankingIndex(path).count_ahead(score, seconds)
+            ahead += source_ahead
+            total += source_total
+        return ahead, total
+
+    def rebuild_indexes(self) -> int:
+        """Rebuild the ranking index of the live file and rotated segments.
+
+        Returns:
+            Number of results indexed.
+        """
+        with self.lock():
+            _, rotated = self.segments()
+            return sum(RankingIndex(path).rebuild() for path in rotated + [self.live_path])
+
+    def recent(self, n: int) -> List[Result]:
+        """Return the n most recently saved results, newest first.
+
+        The live file and then the rotated segments, newest first, are
+        scanned backwards from their end, so the cost grows with n rather
+        than with the leaderboard's size. Only if they hold fewer than n
+        results is the compacted segment read; it is in ranking order, so
+        it is read whole and its newest results picked by timestamp.
+
+        Args:
+            n: Number of results to return.
+
+        Returns:
+            List of Result objects, most recent first.
+        """
+        if n <= 0 or not (self.live_path.exists() or self.segment_dir.exists()):
+            return []
+
+        with span("leaderboard.recent"):
+            # Open under the lock so a rotation cannot move lines between the
+            # files; the open files stay readable if a compaction removes them
+            with self._read_lock():
+                compacted, rotated = self.segments()
+                paths = [path for path in [self.live_path] + rotated[::-1] if path.exists()]
+                files = [open(path, "rb") for path in paths]
+                older = open(compacted, "rb") if compacted else None
+
+            try:
+                newest = (_read_reversed(f) for f in files)
+                results = [result for result, _ in zip((r for source in newest for r in source), range(n))]
+                if len(results) < n and older is not None:
+                    remaining = n - len(results)
+                    compacted_results = (r for r in map(_parse_line, older) if r is not None)
+                    results += heapq.nlargest(remaining, compacted_results, key=lambda r: r.timestamp)
+                return results
+            finally:
+                for f in files + ([older] if older else []):
+                    f.close()
+
+    def top(self, n: int) -> List[Result]:
+        """Return the n best results across all segments and the live file.
+
+        Reads at most n lines from the compacted segment and n indexed lines
+        from each rotated segment and the live file. Indexes that miss lines
+        are synced first if the leaderboard can be written; otherwise the
+        lines they miss are scanned, so readers need no write access.
+
+        Args:
+            n: Number of results to return.
+
+        Returns:
+            List of Result objects sorted by score (desc) and seconds (asc).
+        """
+        if n <= 0 or not (self.live_path.exists() or self.segment_dir.exists()):
+            return []
+
+        with span("leaderboard.top"):
+            return self._read_consistent(lambda compacted, sources: self._top(compacted, sources, n))
+
+    @staticmethod
+    def _top(compacted: Optional[Path], sources: List[Path], n: int) -> List[Result]:
+        """Merge the best n results of every source."""
+        streams = [_read_sorted(compacted)] if compacted else []
+        for path in sources:
+            if path.exists():
+                streams.append(_read_indexed(path, RankingIndex(path).top(n)))
+
+        # Sources are passed oldest first so ties keep chronological order
+        merged = heapq.merge(*streams, key=result_key)
+        return [result for result, _ in zip(merged, range(n))]
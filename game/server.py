@@ -0,0 +1,220 @@
+"""Asyncio TCP server hosting many quiz sessions in one process.
+
+The protocol is line based and mirrors the terminal game: the server sends
+text frames terminated by newlines and reads one line per answer (a choice
+number, or ``h`` for a hint). All connections share one loaded QuestionBank
+and each one drives its own QuizSession.
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+from engine.question_bank import QuestionBank
+from engine.frontends import TerminalFrontend, format_answer_prompt
+from engine.pacing import Pacing
+from engine.quiz_engine import apply_reply
+from engine.session import QuizSession
+from game.answer_log import AnswerLog
+from game.config import load_config
+from game.io_manager import save_result
+from game.leaderboard import rank_result
+from game.models import AnswerEvent
+from game.segments import SegmentedLeaderboard
+
+
+class _ClientFrontend(TerminalFrontend):
+    """The terminal game's text for one network client.
+
+    Replies are read by the server, which awaits the socket; everything shown
+    in between is buffered here and sent with the next prompt as one frame.
+    """
+
+    interactive = False
+
+    def __init__(self):
+        self._buffer: List[str] = []
+
+    def frame(self, prompt: str = "") -> bytes:
+        """Return everything shown since the last frame, then the prompt on its own line."""
+        if prompt:
+            self._buffer.append(prompt.rstrip(" ") + "\n")
+        data = "".join(self._buffer).encode()
+        self._buffer = []
+        return data
+
+
+class QuizServer:
+    """Serves quiz sessions over TCP from a shared question bank."""
+
+    def __init__(
+        self,
+        bank: QuestionBank,
+        limit: int = 10,
+        difficulty: Optional[str] = None,
+        hints_enabled: bool = False,
+        idle_timeout: float = 300.0,
+        pacing: Optional[Pacing] = None,
+        answer_log: Optional[AnswerLog] = None
+    ):
+        """Initialize the server.
+
+        Args:
+            bank: Question bank shared by all sessions.
+            limit: Number of questions per session.
+            difficulty: Optional difficulty filter (easy, medium, hard).
+            hints_enabled: Whether players may request hints.
+            idle_timeout: Seconds to wait for a line before dropping a client.
+            pacing: Pause and time limit per question (default: none). Pauses
+                and time limits never block the event loop.
+            answer_log: Where to log every answer (default: not logged).
+        """
+        self.bank = bank
+        self.limit = limit
+        self.difficulty = difficulty
+        self.hints_enabled = hints_enabled
+        self.idle_timeout = idle_timeout
+        self.pacing = pacing or Pacing("off")
+        self.answer_log = answer_log
+        self._compaction: Optional[asyncio.Future] = None
+        self._log_flush: Optional[asyncio.Future] = None
+
+    async def _send(self, writer: asyncio.StreamWriter, frontend: _ClientFrontend, prompt: str = "") -> None:
+        """Write one frame to the client: what the front-end has shown, then the prompt."""
+        writer.write(frontend.frame(prompt))
+        await writer.drain()
+
+    async def _readline(self, reader: asyncio.StreamReader, timeout: Optional[float] = None) -> str:
+        """Read one stripped line from the client.
+
+        Args:
+            reader: The client's stream.
+            timeout: Seconds to wait, if shorter than the idle timeout.
+
+        Raises:
+            ConnectionError: If the client disconnected.
+            asyncio.TimeoutError: If no line arrived in time.
+        """
+        if timeout is None or timeout > self.idle_timeout:
+            timeout = self.idle_timeout
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        if not line:
+            raise ConnectionError("Client disconnected")
+        return line.decode(errors="replace").strip()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Run one quiz session for a connected client."""
+        try:
+            await self._play(reader, writer)
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            if self.answer_log:
+                # Also logs the answers of clients that left mid-quiz
+                await asyncio.to_thread(self.answer_log.flush)
+
+    async def _play(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Drive a QuizSession from the client's lines."""
+        frontend = _ClientFrontend()
+        frontend.welcome()
+        await self._send(writer, frontend, "Enter your name:")
+        player = await self._readline(reader) or "Anonymous"
+
+        questions = self.bank.select(self.limit, self.difficulty)
+        if not questions:
+            frontend.message("No questions found matching your criteria.")
+            await self._send(writer, frontend)
+            return
+
+        on_answer = self._log_answer if self.answer_log else None
+        session = QuizSession(questions, player, self.hints_enabled, on_answer=on_answer)
+        if self.pacing.mode == "timed":
+            frontend.message(f"You have {self.pacing.time_limit:g} seconds per question.")
+
+        while not session.is_finished:
+            frontend.question(session.current_question, session.question_number, session.total)
+            session.question_shown()
+            deadline = self.pacing.deadline()
+
+            outcome = None
+            while outcome is None:
+                await self._send(writer, frontend, format_answer_prompt(session.hint_available))
+                try:
+                    remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                    answer = await self._readline(reader, remaining)
+                except asyncio.TimeoutError:
+                    if remaining is None or remaining > self.idle_timeout:
+                        raise
+                    outcome = session.timeout()
+                    continue
+                outcome = apply_reply(frontend, session, answer)
+
+            if outcome.timed_out:
+                frontend.timeout(outcome.correct_answer)
+            else:
+                frontend.feedback(outcome.correct, outcome.points, outcome.correct_answer)
+            await self._send(writer, frontend)  # shown before the pause, not after it
+            await self.pacing.pause_async()
+
+        result = session.finish()
+        rank = await asyncio.to_thread(rank_result, result)
+        frontend.summary(result, rank)
+        await self._send(writer, frontend)
+        # Saves run off the event loop; concurrent ones are group committed
+        await asyncio.to_thread(save_result, result)
+        frontend.message("Your result has been saved to the leaderboard!")
+        await self._send(writer, frontend)
+        self._schedule_compaction()
+
+    def _log_answer(self, event: AnswerEvent) -> None:
+        """Buffer an answer; a full buffer is flushed off the event loop."""
+        if self.answer_log.buffer(event) and (self._log_flush is None or self._log_flush.done()):
+            self._log_flush = asyncio.ensure_future(asyncio.to_thread(self.answer_log.flush))
+
+    def _schedule_compaction(self) -> None:
+        """Start a background compaction check unless one is still running."""
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.ensure_future(asyncio.to_thread(self._compact_if_needed))
+
+    @staticmethod
+    def _compact_if_needed() -> None:
+        """Compact once enough segments have rotated (runs off the event loop).
+
+        Reading the config and listing the segments touch the disk too, so
+        they run in the executor with the compaction itself.
+        """
+        config = load_config()
+        if config.get("storage_backend", "jsonl") != "jsonl":
+            return  # only the JSONL leaderboard has segments to compact
+        store = SegmentedLeaderboard.from_config(config)
+        if store.needs_compaction():
+            store.compact()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Accept connections until cancelled.
+
+        Args:
+            host: Interface to bind.
+            port: TCP port to listen on.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def run_server(server: QuizServer, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """Run a QuizServer in a new event loop until interrupted.
+
+    Args:
+        server: The configured QuizServer.
+        host: Interface to bind.
+        port: TCP port to listen on.
+    """
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,118 @@
+"""Global rankings over leaderboards written by several hosts.
+
+Each quiz host writes its own leaderboard; a shard is one of those files
+(with its ``.segments/`` folder, if any). ``leaderboard_shards`` names the
+shards as a directory (every ``*.jsonl`` in it) or a glob pattern such as
+``/mnt/hosts/*/leaderboard.jsonl``.
+
+Every shard yields its results in ranking order and ``top`` merges the
+shards lazily with ``heapq.merge``, stopping after N results:
+
+* a shard whose ranking indexes cover all of its files is streamed through
+  them, so only about N of its lines are read;
+* a shard without current indexes (e.g. a copy from a host that never
+  indexed it) is parsed and its best N results sorted in a worker process,
+  one shard per worker, so several such shards are sorted in parallel.
+
+Shards are only read: no locks are taken and no indexes are written, so
+read-only copies work.
+"""
+
+import glob
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, List, Optional
+from game.models import Result
+from game.segments import SegmentedLeaderboard, result_key
+from utils.metrics import inc, span
+
+SEGMENTS_SUFFIX = ".segments"
+
+
+def shard_paths(spec: str) -> List[Path]:
+    """Return the leaderboard files named by a directory or glob pattern.
+
+    A shard whose live file is gone after a compaction is found through its
+    ``.segments`` folder.
+
+    Args:
+        spec: Directory holding ``*.jsonl`` leaderboards, or a glob pattern.
+
+    Returns:
+        Shard paths, sorted.
+    """
+    pattern = os.path.join(spec, "*.jsonl") if os.path.isdir(spec) else spec
+    paths = {Path(p) for p in glob.glob(pattern) if p.endswith(".jsonl") and os.path.isfile(p)}
+    for p in glob.glob(pattern + SEGMENTS_SUFFIX):
+        if os.path.isdir(p):
+            paths.add(Path(p[:-len(SEGMENTS_SUFFIX)]))
+    return sorted(paths)
+
+
+def _sort_shard(path: str, n: int) -> List[Result]:
+    """Parse a whole shard and return its n best results in ranking order."""
+    return heapq.nsmallest(n, SegmentedLeaderboard(path).iter_results(), key=result_key)
+
+
+class ShardedLeaderboard:
+    """Read-only global ranking over several leaderboard shards."""
+
+    def __init__(self, paths: List[Path], max_workers: Optional[int] = None):
+        """Initialize the ranking.
+
+        Args:
+            paths: Shard leaderboard files, in tie-breaking order.
+            max_workers: Worker processes for sorting unindexed shards
+                (default: one per such shard, at most the CPU count).
+        """
+        self.paths = [Path(path) for path in paths]
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_spec(cls, spec: str, max_workers: Optional[int] = None) -> "ShardedLeaderboard":
+        """Build the ranking over the shards named by a directory or glob pattern."""
+        return cls(shard_paths(spec), max_workers)
+
+    def _sort_unindexed(self, paths: List[Path], n: int) -> List[List[Result]]:
+        """Return the n best results of each unindexed shard, sorting them in parallel."""
+        workers = min(len(paths), self.max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            return [_sort_shard(str(path), n) for path in paths]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_sort_shard, map(str, paths), repeat(n)))
+
+    def top(self, n: int) -> List[Result]:
+        """Return the n best results across all shards.
+
+        Args:
+            n: Number of results to return.
+
+        Returns:
+            List of Result objects sorted by score (desc) and seconds (asc);
+            ties are ordered by shard, then chronologically.
+        """
+        if n <= 0 or not self.paths:
+            return []
+
+        with span("leaderboard.shards.top"):
+            try:
+                return self._top(n)
+            except FileNotFoundError:
+                # A host rotated or compacted its shard while it was read; list again
+                return self._top(n)
+
+    def _top(self, n: int) -> List[Result]:
+        """Merge the ranked streams of every shard."""
+        stores = [SegmentedLeaderboard(path) for path in self.paths]
+        unindexed = [i for i, store in enumerate(stores) if not store.indexed()]
+        inc("leaderboard.shards_sorted", len(unindexed))
+        sorted_tops: Dict[int, List[Result]] = dict(zip(
+            unindexed, self._sort_unindexed([self.paths[i] for i in unindexed], n)
+        ))
+
+        sources = [iter(sorted_tops[i]) if i in sorted_tops else store.ranked() for i, store in enumerate(stores)]
+        merged = heapq.merge(*sources, key=result_key)
+        return [result for result, _ in zip(merged, range(n))]
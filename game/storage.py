@@ -0,0 +1,351 @@
+"""Pluggable leaderboard storage backends.
+
+``save_result`` and the leaderboard queries go through the backend named by
+the ``storage_backend`` setting:
+
+* ``jsonl`` (default) - the segmented JSON Lines leaderboard with its ranking
+  indexes and SQLite views (see ``game.segments`` and ``game.views``);
+* ``sqlite`` - one SQLite database (``sqlite_path``) in WAL mode with indexes
+  on ranking, category, player and timestamp. Every query is an index lookup
+  and concurrent writers in any number of processes are serialized by SQLite.
+
+``migrate`` copies every result from one backend to another, e.g. from the
+existing JSONL leaderboard into a new SQLite database.
+"""
+
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from game.models import Result
+from game.segments import SegmentedLeaderboard
+
+if TYPE_CHECKING:
+    from game.views import ViewStats
+
+DEFAULT_BACKEND = "jsonl"
+MIGRATE_BATCH = 10_000
+
+
+class LeaderboardBackend:
+    """Interface between the leaderboard functions and where results are stored."""
+
+    name = ""
+
+    def save(self, result: Result) -> None:
+        """Durably store one result."""
+        raise NotImplementedError
+
+    def save_many(self, results: List[Result]) -> None:
+        """Durably store several results in one commit."""
+        raise NotImplementedError
+
+    def top(self, n: int) -> List[Result]:
+        """Return the n best results by score (desc) and seconds (asc)."""
+        raise NotImplementedError
+
+    def recent(self, n: int) -> List[Result]:
+        """Return the n most recently saved results, newest first."""
+        raise NotImplementedError
+
+    def rank(self, score: float, seconds: float) -> Tuple[int, int]:
+        """Return (results ranked strictly ahead of a score and time, total results)."""
+        raise NotImplementedError
+
+    def category_top(self, category: str, n: int) -> List[Result]:
+        """Return the n best results in a category (case-insensitive)."""
+        raise NotImplementedError
+
+    def player_stats(self, player: str) -> Optional["ViewStats"]:
+        """Return a player's attempts, average score and best result."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Return the number of stored results."""
+        raise NotImplementedError
+
+    def iter_results(self) -> Iterator[Result]:
+        """Yield every stored result."""
+        raise NotImplementedError
+
+    def bulk_load(self):
+        """Return a context manager to wrap a bulk copy into this backend."""
+        return nullcontext()
+
+
+class JsonlBackend(LeaderboardBackend):
+    """The segmented JSON Lines leaderboard."""
+
+    name = "jsonl"
+
+    def __init__(self, config: dict):
+        """Initialize the backend.
+
+        Args:
+            config: Configuration dictionary from load_config().
+        """
+        self.config = config
+        self.store = SegmentedLeaderboard.from_config(config)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "JsonlBackend":
+        """Build the backend for the configured leaderboard."""
+        return cls(config)
+
+    def _views(self):
+        from game.views import LeaderboardViews  # sqlite3 stays off the top-N fast path
+
+        return LeaderboardViews.from_config(self.config)
+
+    def save(self, result: Result) -> None:
+        from game.result_writer import get_writer
+
+        get_writer(self.config).write(result)
+
+    def save_many(self, results: List[Result]) -> None:
+        from game.result_writer import get_writer
+
+        get_writer(self.config).write_many(results)
+
+    def top(self, n: int) -> List[Result]:
+        return self.store.top(n)
+
+    def recent(self, n: int) -> List[Result]:
+        return self.store.recent(n)
+
+    def rank(self, score: float, seconds: float) -> Tuple[int, int]:
+        return self.store.rank(score, seconds)
+
+    def category_top(self, category: str, n: int) -> List[Result]:
+        return self._views().category_top(category, n)
+
+    def player_stats(self, player: str) -> Optional["ViewStats"]:
+        return self._views().player_stats(player)
+
+    def count(self) -> int:
+        return self.store.rank(0.0, 0.0)[1]  # the total comes from the ranking indexes
+
+    def iter_results(self) -> Iterator[Result]:
+        return self.store.iter_snapshot()  # writers are not blocked while results are read
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player TEXT NOT NULL,
+    score REAL NOT NULL,
+    total INTEGER NOT NULL,
+    streak_max INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    category TEXT NOT NULL COLLATE NOCASE,
+    timestamp TEXT NOT NULL,
+    hints_used INTEGER NOT NULL DEFAULT 0
+);
+"""
+SQLITE_INDEXES = """
+CREATE INDEX IF NOT EXISTS results_rank ON results (score DESC, seconds);
+CREATE INDEX IF NOT EXISTS results_category ON results (category, score DESC, seconds);
+CREATE INDEX IF NOT EXISTS results_player ON results (player, score DESC, seconds);
+CREATE INDEX IF NOT EXISTS results_timestamp ON results (timestamp);
+"""
+RESULT_COLUMNS = "player, score, total, streak_max, seconds, category, timestamp, hints_used"
+INSERT_RESULT = f"INSERT INTO results ({RESULT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def _result_row(result: Result) -> tuple:
+    return (
+        result.player, result.score, result.total, result.streak_max,
+        result.seconds, result.category, result.timestamp, result.hints_used
+    )
+
+
+class SqliteBackend(LeaderboardBackend):
+    """Results in an indexed SQLite database in WAL mode.
+
+    Each thread gets its own connection. Commits are synchronous, so a saved
+    result survives a crash like one appended to the JSONL leaderboard; WAL
+    lets readers run while another process writes. Ties in score and time
+    are ordered by insertion, as in the JSONL leaderboard.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path):
+        """Initialize the backend.
+
+        Args:
+            path: Database file; created with its tables on first use.
+        """
+        self.path = Path(path)
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "SqliteBackend":
+        """Build the backend for the configured database."""
+        path = config.get("sqlite_path")
+        return cls(Path(path) if path else Path(config["leaderboard_path"]).with_suffix(".sqlite"))
+
+    def _conn(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.executescript(SQLITE_SCHEMA + SQLITE_INDEXES)
+            self._local.conn = conn
+        return conn
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Result]:
+        rows = self._conn().execute(sql, params).fetchall()
+        return [Result(*row) for row in rows]
+
+    def save(self, result: Result) -> None:
+        self.save_many([result])
+
+    def save_many(self, results: List[Result]) -> None:
+        conn = self._conn()
+        with conn:
+            conn.executemany(INSERT_RESULT, map(_result_row, results))
+
+    def top(self, n: int) -> List[Result]:
+        return self._query(
+            f"SELECT {RESULT_COLUMNS} FROM results ORDER BY score DESC, seconds, id LIMIT ?", (max(n, 0),)
+        )
+
+    def recent(self, n: int) -> List[Result]:
+        return self._query(
+            f"SELECT {RESULT_COLUMNS} FROM results ORDER BY timestamp DESC, id DESC LIMIT ?", (max(n, 0),)
+        )
+
+    def rank(self, score: float, seconds: float) -> Tuple[int, int]:
+        # Two range counts over the ranking index; an OR would defeat it
+        higher, faster, total = self._conn().execute(
+            "SELECT (SELECT COUNT(*) FROM results WHERE score > ?), "
+            "(SELECT COUNT(*) FROM results WHERE score = ? AND seconds < ?), "
+            "(SELECT COUNT(*) FROM results)",
+            (score, score, seconds)
+        ).fetchone()
+        return higher + faster, total
+
+    def category_top(self, category: str, n: int) -> List[Result]:
+        return self._query(
+            f"SELECT {RESULT_COLUMNS} FROM results WHERE category = ? ORDER BY score DESC, seconds, id LIMIT ?",
+            (category, max(n, 0))
+        )
+
+    def player_stats(self, player: str) -> Optional["ViewStats"]:
+        from game.views import ViewStats
+
+        attempts, average = self._conn().execute(
+            "SELECT COUNT(*), AVG(score) FROM results WHERE player = ?", (player,)
+        ).fetchone()
+        if attempts == 0:
+            return None
+        best = self._query(
+            f"SELECT {RESULT_COLUMNS} FROM results WHERE player = ? ORDER BY score DESC, seconds, id LIMIT 1",
+            (player,)
+        )
+        return ViewStats(player, attempts, average, best[0])
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def iter_results(self) -> Iterator[Result]:
+        cursor = self._conn().execute(f"SELECT {RESULT_COLUMNS} FROM results ORDER BY id")
+        for row in cursor:
+            yield Result(*row)
+
+    @contextmanager
+    def bulk_load(self):
+        """Drop the indexes for a bulk copy and build them once it is done.
+
+        Building an index over all rows at the end is several times faster
+        than updating it row by row.
+        """
+        conn = self._conn()
+        names = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'results' AND sql IS NOT NULL"
+        )]
+        for name in names:
+            conn.execute(f"DROP INDEX {name}")
+        try:
+            yield
+        finally:
+            conn.executescript(SQLITE_INDEXES)
+
+
+BACKENDS = {
+    "jsonl": JsonlBackend,
+    "sqlite": SqliteBackend,
+}
+
+_sqlite_backends: Dict[Path, SqliteBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(config: dict, name: Optional[str] = None) -> LeaderboardBackend:
+    """Return the storage backend for a configuration.
+
+    SQLite backends are shared per database so their per-thread connections
+    are reused; JSONL backends are cheap and already share their writers.
+
+    Args:
+        config: Configuration dictionary from load_config().
+        name: Backend to use (default: the ``storage_backend`` setting).
+
+    Returns:
+        The backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    name = name or config.get("storage_backend", DEFAULT_BACKEND)
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {name} (expected {' or '.join(BACKENDS)})") from None
+
+    backend = backend_class.from_config(config)
+    if isinstance(backend, SqliteBackend):
+        with _backends_lock:
+            return _sqlite_backends.setdefault(backend.path, backend)
+    return backend
+
+
+def migrate(source: LeaderboardBackend, target: LeaderboardBackend, batch_size: int = MIGRATE_BATCH) -> int:
+    """Copy every result from one backend to another.
+
+    Results are written in batches of ``batch_size``, one commit each,
+    inside the target's ``bulk_load`` (which defers SQLite's indexing).
+
+    Args:
+        source: Backend to read from.
+        target: Backend to write to; must be empty.
+
+    Returns:
+        Number of results copied.
+
+    Raises:
+        ValueError: If the target already holds results.
+    """
+    existing = target.count()
+    if existing:
+        raise ValueError(f"The {target.name} leaderboard already holds {existing} results.")
+
+    copied = 0
+    batch = []
+    with target.bulk_load():
+        for result in source.iter_results():
+            batch.append(result)
+            if len(batch) >= batch_size:
+                target.save_many(batch)
+                copied += len(batch)
+                batch = []
+        if batch:
+            target.save_many(batch)
+            copied += len(batch)
+    return copied
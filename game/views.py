@@ -0,0 +1,325 @@
+"""Materialized per-category and per-player leaderboard views.
+
+Views live in ``<leaderboard>.views.sqlite`` next to the live file and are
+updated by every commit, so queries never scan the leaderboard:
+
+* per player: attempts, average score and best result (primary-key lookup);
+* per category: attempts, average score and the best ``view_top_k``
+  results, read back through an index in ranking order. Trimming is
+  amortized: a category is cut back to ``view_top_k`` rows each time its
+  attempts reach a multiple of ``view_top_k``, so it never holds twice that.
+
+The views are derived data. A commit creates a ``.dirty`` marker before
+appending to the leaderboard and removes it once the views are updated, so
+views left dirty by a crash are rebuilt by the next commit (or with
+``rebuild-views``). A marker file costs far less than an extra transaction.
+
+Queries open the database read-only and never rebuild it: while the views
+are missing or dirty they are answered by scanning the leaderboard, so they
+also work from a read-only directory.
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+from game.models import Result, result_from_dict, result_to_dict
+from game.segments import SegmentedLeaderboard, result_key
+
+DEFAULT_VIEW_TOP_K = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    total_score REAL NOT NULL,
+    best_score REAL NOT NULL,
+    best_seconds REAL NOT NULL,
+    best TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    category TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    total_score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS category_top (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    score REAL NOT NULL,
+    seconds REAL NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS category_rank ON category_top (category, score DESC, seconds, seq);
+"""
+
+# A later result replaces the best only if it ranks strictly higher
+_IS_BETTER = (
+    "(excluded.best_score > players.best_score OR "
+    "(excluded.best_score = players.best_score AND excluded.best_seconds < players.best_seconds))"
+)
+UPSERT_PLAYER = f"""
+INSERT INTO players (player, attempts, total_score, best_score, best_seconds, best)
+VALUES (?, 1, ?, ?, ?, ?)
+ON CONFLICT(player) DO UPDATE SET
+    attempts = players.attempts + 1,
+    total_score = players.total_score + excluded.total_score,
+    best = CASE WHEN {_IS_BETTER} THEN excluded.best ELSE players.best END,
+    best_seconds = CASE WHEN {_IS_BETTER} THEN excluded.best_seconds ELSE players.best_seconds END,
+    best_score = CASE WHEN {_IS_BETTER} THEN excluded.best_score ELSE players.best_score END
+"""
+UPSERT_CATEGORY = """
+INSERT INTO categories (category, attempts, total_score) VALUES (?, 1, ?)
+ON CONFLICT(category) DO UPDATE SET
+    attempts = categories.attempts + 1,
+    total_score = categories.total_score + excluded.total_score
+RETURNING attempts
+"""
+TRIM_CATEGORY = """
+DELETE FROM category_top WHERE category = ? AND seq NOT IN (
+    SELECT seq FROM category_top WHERE category = ? ORDER BY score DESC, seconds, seq LIMIT ?
+)
+"""
+
+
+@dataclass
+class ViewStats:
+    """Aggregate statistics for one player or one category."""
+    name: str
+    attempts: int
+    average_score: float
+    best: Optional[Result] = None
+
+
+class LeaderboardViews:
+    """Per-category and per-player views of a segmented leaderboard."""
+
+    def __init__(self, store: SegmentedLeaderboard, top_k: int = DEFAULT_VIEW_TOP_K):
+        """Initialize the views.
+
+        Args:
+            store: The leaderboard the views are derived from.
+            top_k: Number of best results kept per category.
+        """
+        self.store = store
+        self.top_k = top_k
+        self.path = Path(f"{store.live_path}.views.sqlite")
+        self.dirty_path = Path(f"{self.path}.dirty")
+        self._locked_conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "LeaderboardViews":
+        """Build the views of the configured leaderboard."""
+        return cls(SegmentedLeaderboard.from_config(config), config.get("view_top_k", DEFAULT_VIEW_TOP_K))
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Open the views database, creating its tables if needed."""
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _locked(self) -> sqlite3.Connection:
+        """Return the connection reused for work done under the store's lock.
+
+        The lock serializes every use, including across threads, so one
+        connection can be shared and kept open between commits.
+        """
+        if self._locked_conn is None or not self.path.exists():
+            if self._locked_conn is not None:
+                self._locked_conn.close()
+            self._locked_conn = self._connect(check_same_thread=False)
+        return self._locked_conn
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: int) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _is_stale(self, conn: sqlite3.Connection) -> bool:
+        """Whether the views are unbuilt or were left dirty."""
+        return self.dirty_path.exists() or not self._meta(conn, "built")
+
+    def _mark_clean(self) -> None:
+        try:
+            os.unlink(self.dirty_path)
+        except FileNotFoundError:
+            pass
+
+    def prepare(self) -> bool:
+        """Mark the views dirty ahead of a commit.
+
+        The caller must hold the store's lock and call ``apply`` after
+        appending to the leaderboard.
+
+        Returns:
+            Whether the views were already stale and must be rebuilt.
+        """
+        stale = self._is_stale(self._locked())
+        os.close(os.open(self.dirty_path, os.O_CREAT | os.O_WRONLY, 0o644))
+        return stale
+
+    def apply(self, results: Iterable[Result], stale: bool = False) -> None:
+        """Add committed results to the views and mark them clean.
+
+        The caller must hold the store's lock.
+
+        Args:
+            results: Results just appended to the leaderboard.
+            stale: The value returned by ``prepare``; if true the views are
+                rebuilt from the log instead.
+        """
+        if stale:
+            self._rebuild()
+            return
+
+        conn = self._locked()
+        with conn:
+            self._add(conn, results)
+        self._mark_clean()
+
+    def _add(self, conn: sqlite3.Connection, results: Iterable[Result]) -> int:
+        """Insert results into the view tables; returns how many."""
+        categories = set()
+        count = 0
+        for result in results:
+            record = json.dumps(result_to_dict(result))
+            category = result.category.lower()
+            conn.execute(UPSERT_PLAYER, (result.player, result.score, result.score, result.seconds, record))
+            attempts = conn.execute(UPSERT_CATEGORY, (category, result.score)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO category_top (category, score, seconds, result) VALUES (?, ?, ?, ?)",
+                (category, result.score, result.seconds, record)
+            )
+            if attempts % self.top_k == 0:
+                categories.add(category)
+            count += 1
+        for category in categories:
+            conn.execute(TRIM_CATEGORY, (category, category, self.top_k))
+        return count
+
+    def _rebuild(self) -> int:
+        """Recompute every view from the log. The caller holds the lock."""
+        conn = self._locked()
+        while True:
+            try:
+                with conn:
+                    for table in ("players", "categories", "category_top"):
+                        conn.execute(f"DELETE FROM {table}")
+                    count = self._add(conn, self.store.iter_results())
+                    self._set_meta(conn, "built", 1)
+                self._mark_clean()
+                return count
+            except FileNotFoundError:
+                continue  # a concurrent compaction replaced a segment; start over
+
+    def rebuild(self) -> int:
+        """Recompute every view from the leaderboard log.
+
+        Returns:
+            Number of results applied.
+        """
+        with self.store.lock():
+            return self._rebuild()
+
+    def _reader(self) -> Optional[sqlite3.Connection]:
+        """Open the views read-only for a query.
+
+        Returns:
+            A connection, or None if the views are missing, unreadable or
+            stale, in which case the caller scans the leaderboard instead.
+        """
+        if not self.path.exists():
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30.0)
+        except sqlite3.Error:
+            return None
+        try:
+            if not self._is_stale(conn):
+                return conn
+        except sqlite3.Error:
+            pass  # no tables yet, or a read-only directory without the WAL index
+        conn.close()
+        return None
+
+    def _scan(self, key: str, value: str) -> Iterable[Result]:
+        """Yield stored results whose ``key`` ("category" or "player") matches."""
+        if key == "category":
+            return (r for r in self.store.iter_snapshot() if r.category.lower() == value)
+        return (r for r in self.store.iter_snapshot() if r.player == value)
+
+    @staticmethod
+    def _scan_stats(name: str, results: Iterable[Result]) -> Optional[ViewStats]:
+        """Aggregate scanned results like the views do; ties keep the earliest best."""
+        attempts, total, best = 0, 0.0, None
+        for result in results:
+            attempts += 1
+            total += result.score
+            if best is None or result_key(result) < result_key(best):
+                best = result
+        if not attempts:
+            return None
+        return ViewStats(name, attempts, total / attempts, best)
+
+    def category_top(self, category: str, n: int) -> List[Result]:
+        """Return the n best results in a category (at most ``top_k``).
+
+        Args:
+            category: Category name (case-insensitive).
+            n: Number of results to return.
+
+        Returns:
+            List of Result objects sorted by score (desc) and seconds (asc).
+        """
+        n = max(min(n, self.top_k), 0)
+        conn = self._reader()
+        if conn is None:
+            return heapq.nsmallest(n, self._scan("category", category.lower()), key=result_key)
+        try:
+            rows = conn.execute(
+                "SELECT result FROM category_top WHERE category = ? ORDER BY score DESC, seconds, seq LIMIT ?",
+                (category.lower(), n)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [result_from_dict(json.loads(row[0])) for row in rows]
+
+    def category_stats(self, category: str) -> Optional[ViewStats]:
+        """Return attempts, average score and best result for a category."""
+        conn = self._reader()
+        if conn is None:
+            return self._scan_stats(category.lower(), self._scan("category", category.lower()))
+        try:
+            row = conn.execute(
+                "SELECT attempts, total_score FROM categories WHERE category = ?", (category.lower(),)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        best = self.category_top(category, 1)
+        return ViewStats(category.lower(), row[0], row[1] / row[0], best[0] if best else None)
+
+    def player_stats(self, player: str) -> Optional[ViewStats]:
+        """Return attempts, average score and best result for a player."""
+        conn = self._reader()
+        if conn is None:
+            return self._scan_stats(player, self._scan("player", player))
+        try:
+            row = conn.execute(
+                "SELECT attempts, total_score, best FROM players WHERE player = ?", (player,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return ViewStats(player, row[0], row[1] / row[0], result_from_dict(json.loads(row[2])))
@@ -0,0 +1,113 @@
+"""Unit tests for the per-answer event log and its aggregation."""
+
+import pytest
+from engine.frontends import MemoryFrontend
+from engine.quiz_engine import run_quiz
+from engine.session import QuizSession
+from game.answer_log import HEADER, RECORD, AnswerLog, decode_event, encode_event, question_stats
+from game.models import AnswerEvent, Question
+
+
+def make_questions():
+    """Build two questions whose correct answers are choices 1 and 2."""
+    return [
+        Question("F-1", "test", "easy", "First?", ["A", "B"], 0, "Pick A"),
+        Question("F-2", "test", "hard", "Second?", ["A", "B"], 1, "Pick B"),
+    ]
+
+
+def read_records(path):
+    """Decode every record in a log file."""
+    data = path.read_bytes()[HEADER.size:]
+    return [decode_event(data[i:i + RECORD.size]) for i in range(0, len(data), RECORD.size)]
+
+
+def test_engine_logs_every_answer(tmp_path):
+    """Test that answers and timeouts are logged with their session and flags."""
+    log = AnswerLog(tmp_path / "answers.bin")
+    frontend = MemoryFrontend(["Ann", "1", "h", "1"])
+    run_quiz(make_questions(), hints_enabled=True, frontend=frontend, on_answer=log.record)
+    assert log.flush() == 2
+
+    ticks = iter([0.0, 1.0, 3.5, 4.0])
+    session = QuizSession(make_questions(), "Bob", clock=lambda: next(ticks), on_answer=log.record)
+    session.question_shown()
+    session.timeout()
+    log.flush()
+
+    first, second, timed_out = read_records(tmp_path / "answers.bin")
+    assert first.session == second.session != timed_out.session
+    assert (first.question_id, first.choice, first.correct, first.hint_used) == ("F-1", 0, True, False)
+    assert (second.question_id, second.choice, second.correct, second.hint_used) == ("F-2", 0, False, True)
+    assert (timed_out.choice, timed_out.correct, timed_out.seconds) == (-1, False, 2.5)
+
+
+def test_question_stats(tmp_path):
+    """Test per-question aggregation, including after a torn record."""
+    pytest.importorskip("numpy")
+    path = tmp_path / "answers.bin"
+    log = AnswerLog(path)
+    for i, seconds in enumerate([1.0, 2.0, 3.0, 10.0]):
+        log.record(AnswerEvent(1, "Q-1", 0, i < 3, i == 0, seconds, 0.0))
+    log.flush()
+
+    # A crash cut the next record short after its id; the next writer realigns the log
+    with open(path, "ab") as f:
+        f.write(encode_event(AnswerEvent(3, "Q-1", 1, False, False, 5.0, 0.0))[:60])
+    log.record(AnswerEvent(2, "Q-2", -1, False, False, 30.0, 0.0))
+    log.flush()
+
+    stats = {s.question_id: s for s in question_stats(path)}
+    assert set(stats) == {"Q-1", "Q-2"}
+    q1 = stats["Q-1"]
+    assert (q1.answers, q1.accuracy, q1.hint_rate, q1.timeout_rate) == (4, 0.75, 0.25, 0.0)
+    assert (q1.mean_seconds, q1.median_seconds, q1.p90_seconds) == (4.0, 2.0, 3.0)
+    assert (stats["Q-2"].timeout_rate, stats["Q-2"].median_seconds) == (1.0, 30.0)
+    assert [s.question_id for s in question_stats(path, min_answers=2)] == ["Q-1"]
+    assert question_stats(tmp_path / "missing.bin") == []
+    with pytest.raises(ValueError):
+        decode_event(path.read_bytes()[HEADER.size + 4 * RECORD.size:][:RECORD.size])
+
+
+def test_long_question_ids_are_kept_apart(tmp_path):
+    """Test that ids too long for a record are not merged by a shared prefix."""
+    pytest.importorskip("numpy")
+    path = tmp_path / "answers.bin"
+    ids = ["science/" + "x" * 40 + "/first", "science/" + "x" * 40 + "/second", "short"]
+    log = AnswerLog(path)
+    for i in range(6):
+        log.record(AnswerEvent(1, ids[i % 3], 0, i < 3, False, 1.0, 0.0))
+    log.flush()
+    other = AnswerLog(path)  # another writer, which logs the long id again
+    other.record(AnswerEvent(2, ids[0], 0, True, False, 1.0, 0.0))
+    other.flush()
+
+    stats = {s.question_id: s for s in question_stats(path)}
+    assert {q: (s.answers, s.accuracy) for q, s in stats.items()} == {
+        ids[0]: (3, 2 / 3), ids[1]: (2, 0.5), ids[2]: (2, 0.5)
+    }
+    assert read_records(path)[0].question_id.startswith("#")  # unresolved without the side table
+
+
+def test_question_stats_groups_exact_ids_across_chunks(tmp_path, monkeypatch):
+    """Test that every distinct question id gets its own group, whichever chunk it is in."""
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr("game.answer_log.CHUNK_RECORDS", 3)
+    path = tmp_path / "answers.bin"
+    log = AnswerLog(path)
+    ids = ["Q" * 39 + str(i % 4) for i in range(10)]  # differ only in the last byte
+    for i, question_id in enumerate(ids):
+        log.record(AnswerEvent(1, question_id, 0, i % 4 == 0, False, float(i), 0.0))
+    log.flush()
+
+    expected = [(q, ids.count(q)) for q in sorted(set(ids))]
+    stats = question_stats(path)
+    assert [(s.question_id, s.answers) for s in stats] == expected
+    assert [s.accuracy for s in stats] == [1.0, 0.0, 0.0, 0.0]
+    assert stats[1].median_seconds == 5.0
+
+    # Ids whose keys collide are still kept apart
+    monkeypatch.setattr("game.answer_log._question_keys", lambda ids: np.zeros(len(ids), dtype=np.uint64))
+    collided = question_stats(path)
+    assert [(s.question_id, s.answers) for s in collided] == expected
+    assert collided == stats
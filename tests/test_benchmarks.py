@@ -0,0 +1,36 @@
+"""Unit tests for the benchmark data generator and report comparison."""
+
+from benchmarks.bench_scale import compare_reports, percentile
+from benchmarks.synthetic import write_leaderboard, write_question_bank
+from game.io_manager import _load_columns
+from game.segments import SegmentedLeaderboard
+
+
+def test_synthetic_files_are_loadable_and_deterministic(tmp_path):
+    """Test that generated banks and leaderboards parse and repeat per seed."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    bank = write_question_bank(tmp_path / "a", 50, seed=3)
+    again = write_question_bank(tmp_path / "b", 50, seed=3)
+    assert len(_load_columns(bank)[0]) == 50
+    assert bank.read_text() == again.read_text()
+
+    path = write_leaderboard(tmp_path / "leaderboard.jsonl", 30)
+    top = SegmentedLeaderboard(path).top(30)
+    assert len(top) == 30
+    assert [r.score for r in top] == sorted((r.score for r in top), reverse=True)
+
+
+def test_compare_reports_flags_regressions():
+    """Test that only slowdowns beyond the threshold count as regressions."""
+    def report(p50s):
+        return {"results": [
+            {"operation": op, "size": 1000, "latency_ms": {"p50": p50}} for op, p50 in p50s.items()
+        ]}
+
+    rows = compare_reports(report({"top_n": 1.0, "save_result": 2.0, "gone": 1.0}),
+                           report({"top_n": 1.05, "save_result": 3.0, "new": 1.0}), 0.1)
+
+    assert {row["operation"]: row["regression"] for row in rows} == {"top_n": False, "save_result": True}
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
@@ -0,0 +1,124 @@
+"""Unit tests for the question bank catalog manifest."""
+
+import json
+import os
+import pytest
+from game.catalog import catalog_path, load_catalog
+from game.io_manager import load_questions
+
+
+def write_bank(path, difficulties, jsonl=False):
+    """Write a question bank with one question per listed difficulty."""
+    items = [
+        {"id": f"Q-{i}", "category": "test", "difficulty": d, "prompt": "Q?",
+         "choices": ["A", "B"], "answer_index": 0}
+        for i, d in enumerate(difficulties)
+    ]
+    if jsonl:
+        path.write_text("".join(json.dumps(item) + "\n" for item in items))
+    else:
+        path.write_text(json.dumps(items))
+
+
+def test_catalog_counts_and_refreshes(tmp_path, monkeypatch):
+    """Test that the manifest tracks added, touched and edited banks."""
+    write_bank(tmp_path / "questions_alpha.json", ["easy", "easy", "Hard"])
+    write_bank(tmp_path / "questions_beta.jsonl", ["medium"], jsonl=True)
+    (tmp_path / "notes.json").write_text("[]")
+
+    # Banks are only counted when their counts are asked for
+    def fail_count(path):
+        raise AssertionError("banks should not be counted until needed")
+
+    with monkeypatch.context() as m:
+        m.setattr("game.catalog._count_difficulties", fail_count)
+        catalog = load_catalog(tmp_path)
+    assert catalog.categories() == ["alpha", "beta"]
+    assert catalog.entry("alpha").difficulties is None
+    assert catalog.difficulties("alpha") == {"easy": 2, "hard": 1}
+    assert catalog.difficulties("beta") == {"medium": 1}
+    assert catalog.path("beta") == tmp_path / "questions_beta.jsonl"
+    assert catalog_path(tmp_path).exists()
+
+    # Counts are saved, and a touched file is re-hashed but not re-counted
+    monkeypatch.setattr("game.catalog._count_difficulties", fail_count)
+    assert load_catalog(tmp_path).entry("alpha").questions == 3
+    stat = os.stat(tmp_path / "questions_alpha.json")
+    os.utime(tmp_path / "questions_alpha.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_catalog(tmp_path).difficulties("alpha") == {"easy": 2, "hard": 1}
+    monkeypatch.undo()
+
+    # New and edited files are picked up, and a JSON bank wins over JSONL
+    write_bank(tmp_path / "questions_alpha.json", ["easy"])
+    write_bank(tmp_path / "questions_beta.json", ["hard", "hard"])
+    catalog = load_catalog(tmp_path)
+    assert catalog.entry("alpha").questions is None
+    assert catalog.difficulties("alpha") == {"easy": 1}
+    assert catalog.entry("beta").file == "questions_beta.json"
+
+    (tmp_path / "questions_alpha.json").unlink()
+    assert load_catalog(tmp_path).categories() == ["beta"]
+
+
+def test_catalog_validates_options(tmp_path):
+    """Test up-front validation of category, difficulty and limit."""
+    write_bank(tmp_path / "questions_alpha.json", ["easy", "easy", "hard"])
+    catalog = load_catalog(tmp_path)
+
+    assert catalog.validate("alpha") is None  # not counted without a difficulty
+    assert catalog.validate("alpha", "EASY", 10) == 2
+    assert catalog.validate("alpha") == 3
+    with pytest.raises(FileNotFoundError):
+        catalog.validate("missing")
+    with pytest.raises(ValueError, match="available: easy, hard"):
+        catalog.validate("alpha", "medium")
+    with pytest.raises(ValueError):
+        catalog.validate("alpha", limit=0)
+
+    write_bank(tmp_path / "questions_beta.json", ["medium"])
+    catalog = load_catalog(tmp_path)
+    assert catalog.validate_mix(["alpha", "beta"]) is None
+    assert catalog.validate_mix(["alpha", "beta"], "medium") == 1
+    assert catalog.validate_mix(["alpha", "beta"]) == 4
+    with pytest.raises(ValueError, match="available: easy, hard, medium"):
+        catalog.validate_mix(["alpha", "beta"], "expert")
+    with pytest.raises(FileNotFoundError):
+        catalog.validate_mix(["alpha", "missing"])
+
+
+def test_catalog_counts_escaped_and_pretty_printed_banks(tmp_path):
+    """Test that the line scan counts difficulties like parsing the bank would."""
+    items = [
+        {"id": "Q-1", "difficulty": "Easy", "prompt": 'Is "difficulty": "hard" a field?'},
+        {"id": "Q-2", "difficulty": "hard", "prompt": "Q?"},
+        {"id": "Q-3", "difficulty": "easy \"plus\"", "prompt": "Q?"},
+    ]
+    (tmp_path / "questions_pretty.json").write_text(json.dumps(items, indent=2))
+    assert load_catalog(tmp_path).difficulties("pretty") == {"easy": 1, "hard": 1, 'easy "plus"': 1}
+
+
+def test_question_cache_keyed_on_catalog_hash(tmp_path, monkeypatch):
+    """Test that the compiled cache survives a touch and not an edit."""
+    source = tmp_path / "questions_cached.json"
+    write_bank(source, ["easy"])
+
+    def mock_load_config():
+        return {
+            "data_folder": tmp_path,
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    assert len(load_questions("cached")) == 1
+
+    def fail_parse(raw, jsonl=False):
+        raise AssertionError("source should not be re-parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr("game.io_manager._parse_questions", fail_parse)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert len(load_questions("cached")) == 1
+
+    write_bank(source, ["easy", "hard"])
+    assert [q.difficulty for q in load_questions("cached")] == ["easy", "hard"]
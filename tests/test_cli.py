@@ -0,0 +1,54 @@
+"""Unit tests for the CLI entry point and its startup cost."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from game.app import _leaderboard_request
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("typer", "click", "rich", "asyncio", "engine", "game.io_manager", "game.server")
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and return the heavy modules it imported."""
+    probe = code + "\nimport sys, json\nprint(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = json.loads(out.stdout.splitlines()[-1])
+    return out.stdout, [m for m in modules if m.split(".")[0] in HEAVY_MODULES or m in HEAVY_MODULES]
+
+
+def test_leaderboard_request_parsing():
+    """Test that only leaderboard-only argument lists take the fast path."""
+    assert _leaderboard_request(["-b", "5"]) == 5
+    assert _leaderboard_request(["--leaderboard", "3"]) == 3
+    assert _leaderboard_request(["--leaderboard=7"]) == 7
+    assert _leaderboard_request(["leaderboard", "2"]) == 2
+    assert _leaderboard_request(["-b", "x"]) is None
+    assert _leaderboard_request(["-b", "5", "--hints"]) is None
+    assert _leaderboard_request([]) is None
+
+
+def test_import_app_is_lightweight():
+    """Test that importing game.app pulls in no CLI framework or engine modules."""
+    _, heavy = imported_modules("import game.app")
+    assert heavy == []
+
+
+def test_leaderboard_fast_path_skips_typer_and_engine(tmp_path):
+    """Test that --leaderboard is served without importing Typer or the engine."""
+    path = tmp_path / "leaderboard.jsonl"
+    path.write_text(json.dumps({
+        "player": "Fast", "score": 3.0, "total": 5, "streak_max": 2,
+        "seconds": 10.0, "category": "general", "timestamp": "2025-11-03T12:00:00Z"
+    }) + "\n")
+
+    code = (
+        "import game.config\n"
+        f"game.config.load_config = lambda: {{'leaderboard_path': __import__('pathlib').Path({str(path)!r})}}\n"
+        "import game.app\n"
+        "game.app.run(['--leaderboard', '5'])"
+    )
+    stdout, heavy = imported_modules(code)
+    assert "Fast" in stdout
+    assert heavy == []
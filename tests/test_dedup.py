@@ -0,0 +1,77 @@
+"""Unit tests for duplicate question detection."""
+
+import pytest
+from engine.dedup import dedupe, find_duplicates
+from game.io_manager import load_questions, write_questions
+from game.models import Question
+from utils.text import normalize_text
+
+
+def make_question(qid, prompt, choices, category="test"):
+    """Create a question with the given prompt and choices."""
+    return Question(qid, category, "easy", prompt, choices, 0, "")
+
+
+BANK = [
+    make_question("A", "Which planet is known as the Red Planet?", ["Venus", "Mars", "Jupiter", "Saturn"]),
+    make_question("B", "What is the largest ocean on Earth?", ["Atlantic", "Indian", "Arctic", "Pacific"]),
+    # A with its choices shuffled and its case and punctuation changed
+    make_question("C", "which planet is known as the RED planet", ["Mars", "Saturn", "Venus", "Jupiter"]),
+    # B with one word of the prompt changed
+    make_question("D", "What is the largest ocean on our Earth?", ["Atlantic", "Indian", "Arctic", "Pacific"]),
+    make_question("E", "Who painted the Mona Lisa?", ["Michelangelo", "Leonardo da Vinci", "Raphael", "Donatello"]),
+]
+
+
+def test_normalize_text():
+    """Test that case, accents, punctuation and spacing are normalized away."""
+    assert normalize_text("  What's   the Café?! ") == "whats the cafe"
+    assert normalize_text("ﬁne") == "fine"
+
+
+def test_find_exact_duplicates():
+    """Test that exact-only detection ignores choice order, case and punctuation."""
+    groups = find_duplicates(BANK, threshold=None)
+    assert [(g.kept.id, [q.id for q in g.duplicates], g.exact) for g in groups] == [("A", ["C"], True)]
+
+
+def test_find_near_duplicates():
+    """Test that near duplicates are grouped with the first occurrence."""
+    pytest.importorskip("numpy")
+    groups = find_duplicates(BANK)
+    assert [(g.kept.id, [q.id for q in g.duplicates], g.exact) for g in groups] == [
+        ("A", ["C"], True),
+        ("B", ["D"], False),
+    ]
+
+
+def test_minhash_estimates_jaccard_of_non_ascii_text():
+    """Test that signatures and jaccard use the same shingles, beyond ASCII."""
+    np = pytest.importorskip("numpy")
+    from engine.dedup import jaccard, minhash_signatures
+
+    a = normalize_text("Ποια είναι η πρωτεύουσα της Ελλάδας; Αθήνα")
+    b = normalize_text("Ποια είναι η πρωτεύουσα της Κύπρου; Λευκωσία")
+    signatures = minhash_signatures([a, b, "ab", "ab"], 4000)
+    estimate = np.count_nonzero(signatures[0] == signatures[1]) / 4000
+    assert estimate == pytest.approx(jaccard(a, b), abs=0.03)
+    assert (signatures[2] == signatures[3]).all() and jaccard("ab", "ab") == 1.0
+
+
+def test_dedupe_round_trip(tmp_path, monkeypatch):
+    """Test that a cleaned bank keeps first occurrences and loads back."""
+    pytest.importorskip("numpy")
+    kept, _ = dedupe(BANK)
+    assert [q.id for q in kept] == ["A", "B", "E"]
+
+    def mock_load_config():
+        return {
+            "data_folder": tmp_path,
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    for suffix in (".json", ".jsonl"):
+        category = f"cleaned{suffix[1:]}"
+        assert write_questions(tmp_path / f"questions_{category}{suffix}", kept) == 3
+        assert load_questions(category) == kept
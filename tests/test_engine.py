@@ -1,9 +1,15 @@
 """Basic unit tests for engine module."""
 
+import io
+import json
 import pytest
-from game.models import Question
-from engine.scoring import score_answer
-from engine.question_bank import select_questions
+from game.models import Question, Rank
+from engine.frontends import JsonLinesFrontend, MemoryFrontend, TerminalFrontend
+from engine.pacing import Pacing, pacing_from_config
+from engine.quiz_engine import run_quiz
+from engine.scoring import score_answer, score_answers_batch
+from engine.question_bank import MixedQuestionBank, QuestionBank, select_questions
+from utils.rng import get_rng
 
 
 def test_score_answer_correct():
@@ -124,3 +130,190 @@ def test_select_questions_no_filter():
 
     selected = select_questions(questions, limit=10)
     assert len(selected) == 3
+
+
+def test_question_bank_buckets():
+    """Test that QuestionBank counts and selects by category and difficulty."""
+    questions = [
+        Question("Q1", "science", "Easy", "Q1", ["A", "B"], 0, "hint"),
+        Question("Q2", "science", "hard", "Q2", ["A", "B"], 0, "hint"),
+        Question("Q3", "general", "easy", "Q3", ["A", "B"], 0, "hint"),
+    ]
+    bank = QuestionBank(questions)
+
+    assert len(bank) == 3
+    assert bank.count(difficulty="EASY") == 2
+    assert bank.count(category="science") == 2
+    assert bank.count(category="science", difficulty="easy") == 1
+    assert bank.count(difficulty="medium") == 0
+    assert [q.id for q in bank.select(10, difficulty="easy")] == ["Q1", "Q3"]
+    assert [q.id for q in bank.select(10, category="general")] == ["Q3"]
+    assert bank.select(10, difficulty="medium") == []
+
+
+def test_question_bank_select_is_reproducible():
+    """Test that sampling with a seeded rng is deterministic and unique."""
+    questions = [
+        Question(f"Q{i}", "test", "easy", f"Question {i}", ["A", "B"], 0, "hint")
+        for i in range(1000)
+    ]
+    bank = QuestionBank(questions)
+
+    first = bank.select(10, rng=get_rng(42))
+    second = bank.select(10, rng=get_rng(42))
+    assert [q.id for q in first] == [q.id for q in second]
+    assert len({q.id for q in first}) == 10
+
+
+def test_mixed_bank_stratifies_selection():
+    """Test that a mixed bank splits the limit across categories and difficulties."""
+    def make_bank(category, difficulties):
+        return QuestionBank([
+            Question(f"{category}-{i}", category, d, f"Q{i}", ["A", "B"], 0, "hint")
+            for i, d in enumerate(difficulties)
+        ])
+
+    banks = {
+        "science": make_bank("science", ["easy"] * 20 + ["hard"] * 20),
+        "general": make_bank("general", ["easy"] * 30 + ["hard"] * 10),
+        "history": make_bank("history", ["hard"] * 2),
+    }
+    bank = MixedQuestionBank(banks, difficulty_weights={"easy": 3, "hard": 1})
+    assert len(bank) == 82
+    assert bank.count(difficulty="hard") == 32
+
+    selected = bank.select(12, rng=get_rng(1))
+    strata = {}
+    for q in selected:
+        strata[(q.category, q.difficulty)] = strata.get((q.category, q.difficulty), 0) + 1
+    assert len({q.id for q in selected}) == 12
+    # History's share of 4 is capped at its 2 questions; the rest is split 3:1
+    assert strata == {("science", "easy"): 4, ("science", "hard"): 1,
+                      ("general", "easy"): 4, ("general", "hard"): 1, ("history", "hard"): 2}
+    assert len(bank.select(12, difficulty="hard", rng=get_rng(1))) == 12
+
+    # Shares a category cannot fill go to the others
+    history_only = MixedQuestionBank(banks, category_weights={"science": 0, "general": 0})
+    assert len(history_only.select(5)) == 2
+
+
+def test_score_answers_batch_matches_scalar():
+    """Property test: batch scoring equals score_answer and session streaks."""
+    pytest.importorskip("numpy")
+    rng = get_rng(1234)
+
+    for trial in range(200):
+        n = rng.randint(0, 40)
+        chosen = [rng.randrange(4) for _ in range(n)]
+        answers = [rng.randrange(4) for _ in range(n)]
+        hints = [rng.random() < 0.3 for _ in range(n)]
+        sessions = sorted(rng.randrange(max(n // 3, 1)) for _ in range(n))
+
+        correct, points, streak_max = score_answers_batch(chosen, answers, hints, sessions)
+
+        expected_streaks = []
+        streak = 0
+        for i in range(n):
+            question = Question(f"Q{i}", "test", "easy", "?", ["A", "B", "C", "D"], answers[i], "hint")
+            exp_correct, exp_points = score_answer(question, chosen[i], hints[i])
+            assert bool(correct[i]) is exp_correct
+            assert points[i] == exp_points
+
+            if i == 0 or sessions[i] != sessions[i - 1]:
+                expected_streaks.append(0)
+                streak = 0
+            streak = streak + 1 if exp_correct else 0
+            expected_streaks[-1] = max(expected_streaks[-1], streak)
+
+        assert streak_max.tolist() == expected_streaks
+
+
+def test_score_answers_batch_defaults():
+    """Test batch scoring without hints or session ids."""
+    np = pytest.importorskip("numpy")
+
+    correct, points, streak_max = score_answers_batch(
+        np.array([0, 1, 1, 3, 2]), np.array([0, 1, 2, 3, 2])
+    )
+    assert correct.tolist() == [True, True, False, True, True]
+    assert points.tolist() == [1.0, 1.0, 0.0, 1.0, 1.0]
+    assert streak_max.tolist() == [2]
+
+
+def make_quiz_questions():
+    """Build two questions whose correct answers are choices 1 and 2."""
+    return [
+        Question("F-1", "test", "easy", "First?", ["A", "B"], 0, "Pick A"),
+        Question("F-2", "test", "hard", "Second?", ["A", "B"], 1, "Pick B"),
+    ]
+
+
+def test_run_quiz_memory_frontend():
+    """Test that the engine runs from scripted replies, validating input."""
+    frontend = MemoryFrontend(["Ann", "x", "1", "h", "5", "2"])
+    result = run_quiz(make_quiz_questions(), hints_enabled=True, frontend=frontend)
+
+    assert (result.player, result.score, result.hints_used, result.streak_max) == ("Ann", 1.5, 1, 2)
+    kinds = [event["event"] for event in frontend.events]
+    assert kinds == [
+        "welcome", "prompt", "question", "prompt", "error", "prompt", "feedback",
+        "question", "prompt", "hint", "prompt", "error", "prompt", "feedback", "result",
+    ]
+    assert frontend.events[9]["text"] == "Pick B"
+    assert frontend.events[10]["hint_available"] is False
+
+    with pytest.raises(EOFError):
+        run_quiz(make_quiz_questions(), frontend=MemoryFrontend(["Ann", "1"]))
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls."""
+
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_stream_frontends_write_one_chunk_per_frame():
+    """Test that each frame is written once, with the prompt, in both formats."""
+    output = CountingStream()
+    frontend = JsonLinesFrontend(io.StringIO("Bo\n2\n2\n"), output)
+    result = run_quiz(make_quiz_questions(), frontend=frontend)
+
+    events = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert result.score == 1.0
+    assert events[-1]["event"] == "result" and events[-1]["player"] == "Bo"
+    # name prompt, two answer prompts, then the final summary
+    assert output.writes == 4
+    assert frontend.interactive is False
+
+    output = CountingStream()
+    run_quiz(make_quiz_questions(), frontend=TerminalFrontend(io.StringIO("\n1\n2\n"), output),
+             ranker=lambda result: Rank(4213, 1200000))
+    assert output.writes == 4
+    assert "Player: Anonymous" in output.getvalue()
+    assert "Rank: #4,213 of 1,200,000 (top 0.4%)" in output.getvalue()
+
+    frontend = MemoryFrontend(["Cy", "1", "1"])
+    run_quiz(make_quiz_questions(), frontend=frontend, ranker=lambda result: Rank(1, 1))
+    assert frontend.events[-1]["rank"] == 1 and frontend.events[-1]["ranked_results"] == 1
+
+
+def test_pacing_modes_and_timed_quiz():
+    """Test pacing validation, config overrides and late answers timing out."""
+    assert Pacing("off").pause_seconds == 0.0
+    assert Pacing().deadline() is None
+    assert pacing_from_config({"pacing": "off"}, delay=2.0) == Pacing("off", 2.0, 30.0)
+    assert pacing_from_config({}, "timed", time_limit=5.0).time_limit == 5.0
+    for bad in (("slow",), ("fixed", -1.0), ("timed", 0.5, None)):
+        with pytest.raises(ValueError):
+            Pacing(*bad)
+
+    frontend = MemoryFrontend(["Ann", "1", "2"])
+    result = run_quiz(make_quiz_questions(), frontend=frontend, pacing=Pacing("timed", 0.0, 1e-9))
+
+    assert result.score == 0.0
+    assert [e["event"] for e in frontend.events].count("timeout") == 2
+    assert frontend.events[1] == {"event": "message", "text": "You have 1e-09 seconds per question."}
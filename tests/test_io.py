@@ -1,10 +1,15 @@
 """Basic unit tests for I/O operations."""
 
+import dataclasses
 import json
+import os
 import pytest
 from pathlib import Path
-from game.models import Question, Result
-from game.io_manager import load_questions, save_result
+from game.models import Question, Result, CompactQuestion, QuestionTable
+from game.io_manager import (
+    load_questions, load_question_table, iter_questions, question_file,
+    save_result, build_question_cache, convert_to_jsonl,
+)
 
 
 def test_load_questions_general():
@@ -122,3 +127,286 @@ def test_save_result_with_hints(tmp_path, monkeypatch):
         assert data["player"] == "HintUser"
         assert data["score"] == 7.5
         assert data["hints_used"] == 3
+
+
+def test_load_questions_uses_compiled_cache(tmp_path, monkeypatch):
+    """Test that an unchanged question file is served from the cache."""
+    source = tmp_path / "questions_cached.json"
+    source.write_text(json.dumps([
+        {"id": "C-001", "category": "cached", "difficulty": "easy", "prompt": "Q?",
+         "choices": ["A", "B", "C", "D"], "answer_index": 1}
+    ]))
+
+    def mock_load_config():
+        return {
+            "data_folder": tmp_path,
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    first = load_questions("cached")
+    assert (tmp_path / ".cache" / "questions_cached.pickle").exists()
+
+    def fail_parse(raw):
+        raise AssertionError("source should not be re-parsed")
+
+    monkeypatch.setattr("game.io_manager._parse_questions", fail_parse)
+    second = load_questions("cached")
+    assert second == first
+    assert second[0].hint == "No hint available"
+
+
+def test_load_questions_rebuilds_stale_cache(tmp_path, monkeypatch):
+    """Test that editing a question file invalidates its cache."""
+    source = tmp_path / "questions_cached.json"
+    item = {"id": "C-001", "category": "cached", "difficulty": "easy", "prompt": "Q?",
+            "choices": ["A", "B", "C", "D"], "answer_index": 1, "hint": "old"}
+    source.write_text(json.dumps([item]))
+
+    def mock_load_config():
+        return {
+            "data_folder": tmp_path,
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    assert load_questions("cached")[0].hint == "old"
+
+    item["hint"] = "a much newer hint"
+    source.write_text(json.dumps([item, dict(item, id="C-002")]))
+
+    questions = load_questions("cached")
+    assert [q.id for q in questions] == ["C-001", "C-002"]
+    assert questions[0].hint == "a much newer hint"
+    assert build_question_cache("cached") == 2
+
+
+def _save_many(leaderboard_path, worker, count):
+    """Process worker saving results through a ResultWriter."""
+    from game.result_writer import ResultWriter
+    from game.segments import SegmentedLeaderboard
+
+    writer = ResultWriter(SegmentedLeaderboard(leaderboard_path))
+    for i in range(count):
+        writer.write(Result(f"W{worker}-{i}", float(i), 10, 1, 1.0, "test", "2025-11-03T12:00:00Z"))
+
+
+def test_save_result_concurrent_processes_and_threads(tmp_path, monkeypatch):
+    """Test that concurrent writers never interleave or lose lines."""
+    import threading
+    from concurrent.futures import ProcessPoolExecutor
+    from game.leaderboard import top_n
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(_save_many, temp_leaderboard, w, 20) for w in range(3)]
+
+        threads = [
+            threading.Thread(target=save_result, args=(Result(f"T{i}", 100.0, 10, 1, 1.0, "test", "2025-11-03T12:00:00Z"),))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for future in futures:
+            future.result()
+
+    with open(temp_leaderboard) as f:
+        players = [json.loads(line)["player"] for line in f]
+    assert len(players) == 80
+    assert len(set(players)) == 80
+    assert len(top_n(100)) == 80
+
+
+def test_save_result_group_commits_concurrent_threads(tmp_path, monkeypatch):
+    """Test that threads queued behind a commit share the next fsync."""
+    import threading
+    from game.result_writer import ResultWriter
+    from game.segments import SegmentedLeaderboard
+
+    writer = ResultWriter(SegmentedLeaderboard(tmp_path / "test_leaderboard.jsonl"))
+    result = Result("Grouped", 5.0, 10, 1, 1.0, "test", "2025-11-03T12:00:00Z")
+
+    fsyncs = []
+    release = threading.Event()
+    real_fsync = os.fsync
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        release.wait(5)
+        real_fsync(fd)
+
+    monkeypatch.setattr("game.result_writer.os.fsync", slow_fsync)
+
+    threads = [threading.Thread(target=writer.write, args=(result,)) for _ in range(10)]
+    threads[0].start()
+    while not fsyncs:
+        pass
+    for thread in threads[1:]:
+        thread.start()
+    while len(writer._pending) < 9:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(fsyncs) == 2
+    with open(tmp_path / "test_leaderboard.jsonl") as f:
+        assert len(f.readlines()) == 10
+
+
+def test_save_result_succeeds_once_fsynced(tmp_path, monkeypatch, caplog):
+    """Test that failures after the fsync are logged, not raised, and caught up by the next commit."""
+    from game.ranking_index import RankingIndex
+    from game.result_writer import ResultWriter
+    from game.segments import SegmentedLeaderboard
+
+    store = SegmentedLeaderboard(tmp_path / "test_leaderboard.jsonl")
+    writer = ResultWriter(store)
+
+    def refuse(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(RankingIndex, "sync", refuse)
+        m.setattr(writer.views, "apply", refuse)
+        writer.write(Result("Committed", 5.0, 10, 1, 1.0, "test", "2025-11-03T12:00:00Z"))
+
+    assert "index update failed" in caplog.text and "views update failed" in caplog.text
+    assert not RankingIndex(store.live_path).is_current()
+    assert [r.player for r in store.top(5)] == ["Committed"]
+
+    writer.write(Result("Next", 9.0, 10, 1, 1.0, "test", "2025-11-03T12:01:00Z"))
+    assert RankingIndex(store.live_path).is_current()
+    assert writer.views.player_stats("Committed").attempts == 1
+    assert not writer.views.dirty_path.exists()
+
+
+def test_save_result_after_partial_line(tmp_path, monkeypatch):
+    """Test that a line cut short by a crash does not swallow the next result."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    temp_leaderboard.write_text('{"player": "Crashed", "sco')
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    save_result(Result("Survivor", 5.0, 10, 1, 1.0, "test", "2025-11-03T12:00:00Z"))
+
+    lines = temp_leaderboard.read_text().splitlines()
+    assert json.loads(lines[-1])["player"] == "Survivor"
+
+
+def test_load_question_table_matches_load_questions():
+    """Test that the columnar table holds the same questions, compactly."""
+    from engine.question_bank import QuestionBank
+
+    questions = load_questions("science")
+    table = load_question_table("science")
+
+    assert len(table) == len(questions)
+    assert table.categories == ["science"]
+    for question, compact in zip(questions, table):
+        assert isinstance(compact, CompactQuestion)
+        assert compact.choices == tuple(question.choices)
+        assert compact == CompactQuestion.from_question(question)
+    assert table[0].category is table[1].category
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        table[0].answer_index = 3
+
+    bank = QuestionBank(table)
+    assert bank.count(difficulty="easy") == sum(q.difficulty == "easy" for q in questions)
+    assert len(bank.select(3)) == 3
+
+    from game.app import load_bank
+    assert isinstance(load_bank("science").questions, QuestionTable)
+
+
+def test_question_table_answer_index_range():
+    """Test that answer indices past one byte are kept and invalid ones rejected."""
+    table = QuestionTable()
+    table.append("Q-1", "test", "easy", "Q?", [str(i) for i in range(300)], 299, "")
+    assert table[0].answer_index == 299
+    with pytest.raises(ValueError):
+        table.append("Q-2", "test", "easy", "Q?", ["A", "B"], -1, "")
+    assert len(table) == 1
+
+
+def test_jsonl_bank_conversion_and_streaming(tmp_path, monkeypatch):
+    """Test converting a JSON bank to JSONL and reading it back."""
+    import shutil
+    shutil.copy(Path("data/questions_science.json"), tmp_path / "questions_science.json")
+
+    def mock_load_config():
+        return {
+            "data_folder": tmp_path,
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    expected = load_questions("science")
+    target = convert_to_jsonl("science")
+    assert target == tmp_path / "questions_science.jsonl"
+
+    (tmp_path / "questions_science.json").unlink()
+    assert question_file("science") == target
+
+    stream = iter_questions("science")
+    assert next(stream) == expected[0]
+    assert [expected[0]] + list(stream) == expected
+    assert load_questions("science") == expected
+
+
+def test_lazy_question_bank_parses_only_selected(tmp_path, monkeypatch):
+    """Test that LazyQuestionBank materializes only the questions it returns."""
+    from engine.question_bank import LazyQuestionBank
+    from utils.rng import get_rng
+
+    path = tmp_path / "questions_big.jsonl"
+    with open(path, 'w') as f:
+        for i in range(1000):
+            f.write(json.dumps({
+                "id": f"B-{i}", "category": "big", "difficulty": "hard" if i % 100 == 0 else "easy",
+                "prompt": f"Q{i}?", "choices": ["A", "B", "C", "D"], "answer_index": i % 4
+            }) + '\n')
+        f.write('\n')
+
+    bank = LazyQuestionBank(path)
+    assert len(bank) == 1000
+    assert bank[5].id == "B-5"
+
+    parsed = []
+    real = json.loads
+    monkeypatch.setattr("engine.question_bank.json.loads", lambda raw: parsed.append(raw) or real(raw))
+
+    selected = bank.select(10, rng=get_rng(3))
+    assert len({q.id for q in selected}) == 10
+    assert len(parsed) == 10
+
+    parsed.clear()
+    easy = bank.select(10, difficulty="easy", rng=get_rng(3))
+    assert len(easy) == 10 and all(q.difficulty == "easy" for q in easy)
+    assert len(parsed) < 50
+
+    hard = bank.select(20, difficulty="hard", rng=get_rng(3))
+    assert [q.id for q in hard] == [f"B-{i}" for i in range(0, 1000, 100)]
+    assert bank.count(difficulty="hard") == 10
@@ -1,10 +1,13 @@
 """Basic unit tests for leaderboard functionality."""
 
 import json
+import sqlite3
 import pytest
 from pathlib import Path
-from game.models import Result
-from game.leaderboard import top_n, format_table
+from game.models import Rank, Result, result_to_dict
+from game.leaderboard import top_n, format_table, rebuild_index, compact, category_top_n, player_stats, rebuild_views, rank_result
+from game.leaderboard import export_columns, leaderboard_stats, recent_results, format_recent, migrate_storage
+from game.io_manager import save_result
 
 
 def test_top_n_sorting(tmp_path, monkeypatch):
@@ -162,3 +165,665 @@ def test_top_n_backward_compatibility(tmp_path, monkeypatch):
 
     assert len(top_results) == 1
     assert top_results[0].hints_used == 0  # Default value
+
+
+def test_top_n_matches_full_sort_after_appends(tmp_path, monkeypatch):
+    """Test that the ranking index stays correct across appends and merges."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.ranking_index.TAIL_LIMIT", 4)
+
+    records = [
+        {"player": f"Player{i}", "score": (i * 7) % 11, "total": 10, "streak_max": 1,
+         "seconds": float((i * 13) % 17), "category": "test", "timestamp": "2025-11-03T10:00:00Z"}
+        for i in range(40)
+    ]
+
+    for start in range(0, len(records), 5):
+        with open(temp_leaderboard, 'a') as f:
+            for record in records[start:start + 5]:
+                f.write(json.dumps(record) + '\n')
+        top_n(3)  # Syncs the index incrementally
+
+    expected = sorted(records, key=lambda r: (-r["score"], r["seconds"]))[:10]
+    assert [r.player for r in top_n(10)] == [r["player"] for r in expected]
+
+
+def test_top_n_skips_malformed_lines(tmp_path, monkeypatch):
+    """Test that blank, malformed and partial lines are ignored."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    good = {"player": "Good", "score": 5, "total": 10, "streak_max": 3, "seconds": 30.0, "category": "test", "timestamp": "2025-11-03T10:00:00Z"}
+
+    with open(temp_leaderboard, 'w') as f:
+        f.write("\n")
+        f.write("not json\n")
+        f.write(json.dumps(good) + '\n')
+        f.write('{"player": "Partial"')
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+
+    top_results = top_n(10)
+    assert [r.player for r in top_results] == ["Good"]
+
+
+def test_readers_need_no_write_access(tmp_path, monkeypatch):
+    """Test that top_n and rank_result work without creating the lock or writing indexes."""
+    from game.ranking_index import RankingIndex
+    from game.segments import SegmentedLeaderboard
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    config = {"data_folder": Path("data"), "leaderboard_path": temp_leaderboard}
+    monkeypatch.setattr("game.leaderboard.load_config", lambda: config)
+    monkeypatch.setattr("game.io_manager.load_config", lambda: config)
+
+    save_result(Result("Indexed", 5.0, 10, 1, 30.0, "test", "2025-11-03T10:00:00Z"))
+    # Appended by a writer that crashed before updating the index
+    with open(temp_leaderboard, 'a') as f:
+        f.write(json.dumps({"player": "Unindexed", "score": 7, "total": 10, "streak_max": 2, "seconds": 40.0,
+                            "category": "test", "timestamp": "2025-11-03T11:00:00Z"}) + '\n')
+
+    class Unwritable:
+        def __enter__(self):
+            raise PermissionError("read-only folder")
+
+    def refuse(*args, **kwargs):
+        raise PermissionError("read-only folder")
+
+    monkeypatch.setattr(SegmentedLeaderboard, "lock", lambda self: Unwritable())
+    monkeypatch.setattr(RankingIndex, "sync", refuse)
+    monkeypatch.setattr(RankingIndex, "_write_sorted", refuse)
+
+    assert [r.player for r in top_n(10)] == ["Unindexed", "Indexed"]
+    assert rank_result(Result("X", 6.0, 10, 0, 1.0, "test", "")) == Rank(2, 3)
+    assert [r.player for r in recent_results(1)] == ["Unindexed"]
+
+    (temp_leaderboard.parent / "test_leaderboard.jsonl.idx").unlink()
+    assert [r.player for r in top_n(10)] == ["Unindexed", "Indexed"]
+
+
+def test_readers_index_pre_upgrade_leaderboards(tmp_path, monkeypatch, caplog):
+    """Test that the first reader with write access indexes an old leaderboard, others hint."""
+    import errno
+    from game.ranking_index import RankingIndex
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    config = {"data_folder": Path("data"), "leaderboard_path": temp_leaderboard}
+    monkeypatch.setattr("game.leaderboard.load_config", lambda: config)
+    with open(temp_leaderboard, 'w') as f:
+        for i in range(5):
+            f.write(json.dumps({"player": f"Old{i}", "score": i, "total": 10, "streak_max": 1, "seconds": 30.0,
+                                "category": "test", "timestamp": "2025-11-03T10:00:00Z"}) + '\n')
+    index = RankingIndex(temp_leaderboard)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError(errno.EROFS, "Read-only file system")
+
+    with monkeypatch.context() as m:
+        m.setattr(RankingIndex, "sync", read_only)
+        assert [r.player for r in top_n(2)] == ["Old4", "Old3"]
+    assert not index.path.exists()
+    assert "rebuild-index" in caplog.text
+
+    assert rank_result(Result("X", 2.5, 10, 0, 1.0, "test", "")) == Rank(3, 6)
+    assert index.is_current()
+
+
+def test_rebuild_index_after_rewrite(tmp_path, monkeypatch):
+    """Test that a truncated leaderboard triggers an index rebuild."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    records = [
+        {"player": f"Player{i}", "score": i, "total": 10, "streak_max": i, "seconds": 30.0, "category": "test", "timestamp": "2025-11-03T10:00:00Z"}
+        for i in range(5)
+    ]
+
+    with open(temp_leaderboard, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+
+    assert top_n(1)[0].player == "Player4"
+
+    with open(temp_leaderboard, 'w') as f:
+        f.write(json.dumps(records[1]) + '\n')
+
+    assert [r.player for r in top_n(10)] == ["Player1"]
+    assert rebuild_index() == 1
+
+
+def test_segmented_leaderboard_rotation_and_compaction(tmp_path, monkeypatch):
+    """Test that top_n merges segments and compaction keeps the same ranking."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard,
+            "segment_max_bytes": 600
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    results = [
+        Result(f"Player{i}", float((i * 7) % 11), 10, 1, float((i * 13) % 17), "test", "2025-11-03T10:00:00Z")
+        for i in range(30)
+    ]
+    for result in results:
+        save_result(result)
+
+    segment_dir = tmp_path / "test_leaderboard.jsonl.segments"
+    assert len(list(segment_dir.glob("live-*.jsonl"))) > 1
+
+    expected = [r.player for r in sorted(results, key=lambda r: (-r.score, r.seconds))]
+    assert [r.player for r in top_n(10)] == expected[:10]
+
+    with open(temp_leaderboard, 'a') as f:
+        f.write("not json\n")
+
+    merged, kept = compact()
+    assert kept == 30
+    assert not temp_leaderboard.exists()
+    assert [p.name for p in segment_dir.glob("*.jsonl")] == [f"sorted-{merged:08d}.jsonl"]
+    assert [r.player for r in top_n(30)] == expected
+
+    # New results after compaction are merged with the compacted segment
+    save_result(Result("Newcomer", 11.0, 10, 10, 1.0, "test", "2025-11-03T10:00:00Z"))
+    assert top_n(1)[0].player == "Newcomer"
+
+
+def test_segments_superseded_by_compaction_are_ignored(tmp_path, monkeypatch):
+    """Test that leftovers of an interrupted compaction are not double counted."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    segment_dir = tmp_path / "test_leaderboard.jsonl.segments"
+    segment_dir.mkdir()
+    record = {"player": "Once", "score": 5, "total": 10, "streak_max": 3, "seconds": 30.0, "category": "test", "timestamp": "2025-11-03T10:00:00Z"}
+
+    for name in ("live-00000001.jsonl", "sorted-00000001.jsonl"):
+        with open(segment_dir / name, 'w') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+
+    assert [r.player for r in top_n(10)] == ["Once"]
+
+
+def test_concurrent_compactions_are_serialized(tmp_path, monkeypatch):
+    """Test that compactions racing each other and a writer keep every result once."""
+    import threading
+    from game.segments import SegmentedLeaderboard
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard,
+            "segment_max_bytes": 600
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    for i in range(60):
+        save_result(Result(f"Player{i}", float(i % 7), 10, 1, float(i), "test", "2025-11-03T10:00:00Z"))
+
+    errors = []
+
+    def run(task):
+        try:
+            task()
+        except Exception as e:  # surfaced by the assertion below
+            errors.append(e)
+
+    def save_more():
+        for i in range(60, 80):
+            save_result(Result(f"Player{i}", float(i % 7), 10, 1, float(i), "test", "2025-11-03T10:00:00Z"))
+
+    tasks = [SegmentedLeaderboard(temp_leaderboard, 600).compact for _ in range(4)] + [save_more]
+    threads = [threading.Thread(target=run, args=(task,)) for task in tasks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(r.player for r in top_n(100)) == sorted(f"Player{i}" for i in range(80))
+    compacted, _ = SegmentedLeaderboard(temp_leaderboard).segments()
+    assert list(temp_leaderboard.with_name("test_leaderboard.jsonl.segments").glob("sorted-*.jsonl")) == [compacted]
+
+
+def test_reads_racing_a_rotation_see_every_result(tmp_path, monkeypatch):
+    """Test that top_n and rank_result retry when a rotation lands between listing and reading."""
+    from game.segments import SegmentedLeaderboard
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+    config = {"data_folder": Path("data"), "leaderboard_path": temp_leaderboard}
+    monkeypatch.setattr("game.leaderboard.load_config", lambda: config)
+    monkeypatch.setattr("game.io_manager.load_config", lambda: config)
+    for i in range(6):
+        save_result(Result(f"Player{i}", float(i), 10, 1, 30.0, "test", "2025-11-03T10:00:00Z"))
+
+    store = SegmentedLeaderboard(temp_leaderboard)
+    top, rank = SegmentedLeaderboard._top, SegmentedLeaderboard._rank
+
+    def rotate_first(read):
+        def racing(compacted, sources, *args):
+            if temp_leaderboard.exists():
+                with store.lock():
+                    store.rotate()  # after the files were listed, before they are read
+            return read(compacted, sources, *args)
+        return staticmethod(racing)
+
+    monkeypatch.setattr(SegmentedLeaderboard, "_top", rotate_first(top))
+    assert [r.player for r in top_n(10)] == [f"Player{i}" for i in range(5, -1, -1)]
+
+    save_result(Result("Late", 9.0, 10, 1, 30.0, "test", "2025-11-03T11:00:00Z"))
+    monkeypatch.setattr(SegmentedLeaderboard, "_rank", rotate_first(rank))
+    assert rank_result(Result("X", 2.5, 10, 0, 1.0, "test", ""), saved=True) == Rank(5, 7)
+
+
+def test_recent_results_newest_first(tmp_path, monkeypatch):
+    """Test that recent results span segments and skip partial lines."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard,
+            "segment_max_bytes": 600
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    assert recent_results(5) == []
+    for i in range(20):
+        save_result(Result(f"Player{i}", float(i % 7), 10, 1, 30.0, "test", f"2025-11-03T10:00:{i:02d}Z"))
+    with open(temp_leaderboard, 'a') as f:
+        f.write('{"player": "Half')  # a write still in progress
+
+    assert len(list((tmp_path / "test_leaderboard.jsonl.segments").glob("live-*.jsonl"))) > 1
+    assert [r.player for r in recent_results(12)] == [f"Player{i}" for i in range(19, 7, -1)]
+
+    # Compacted results are in ranking order, so the oldest are picked by timestamp
+    with open(temp_leaderboard, 'a') as f:
+        f.write('"}\n')
+    compact()
+    save_result(Result("Newcomer", 0.0, 10, 0, 30.0, "test", "2025-11-03T10:01:00Z"))
+    assert [r.player for r in recent_results(4)] == ["Newcomer", "Player19", "Player18", "Player17"]
+    assert len(recent_results(100)) == 21
+    assert "2025-11-03 10:01:00  Newcomer" in format_recent(recent_results(1))
+
+
+def test_rank_result_matches_full_sort(tmp_path, monkeypatch):
+    """Test that bisected ranks match a full sort across every segment kind."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard,
+            "segment_max_bytes": 600
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    monkeypatch.setattr("game.ranking_index.TAIL_LIMIT", 4)
+
+    def make(i):
+        return Result(f"Player{i}", float((i * 7) % 11), 10, 1, float((i * 13) % 17), "test", "2025-11-03T10:00:00Z")
+
+    results = [make(i) for i in range(20)]
+    for result in results[:12]:
+        save_result(result)
+    compact()
+    for result in results[12:]:
+        save_result(result)  # rotated segments and the live file on top of the compacted one
+
+    probes = [make(i) for i in range(40)] + [Result("Top", 11.0, 10, 10, 0.0, "test", "2025-11-03T10:00:00Z")]
+    for probe in probes:
+        ahead = sum(1 for r in results if (-r.score, r.seconds) < (-probe.score, probe.seconds))
+        rank = rank_result(probe)
+        assert (rank.position, rank.total) == (ahead + 1, 21)
+
+    saved = rank_result(results[0], saved=True)
+    assert saved.total == 20
+    assert rank_result(probes[-1]).top_percent == pytest.approx(100 / 21)
+
+
+def test_views_track_saves_and_match_rebuild(tmp_path, monkeypatch):
+    """Test that incrementally updated views match a rebuild from the log."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard,
+            "segment_max_bytes": 600,
+            "view_top_k": 4
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    results = [
+        Result(f"Player{i % 3}", float((i * 7) % 11), 10, 1, float((i * 13) % 17),
+               ("science", "history")[i % 2], "2025-11-03T10:00:00Z")
+        for i in range(30)
+    ]
+    for result in results:
+        save_result(result)
+
+    def expected_top(category):
+        ranked = sorted((r for r in results if r.category == category), key=lambda r: (-r.score, r.seconds))
+        return [(r.player, r.score, r.seconds) for r in ranked]
+
+    def view_top(category, n):
+        return [(r.player, r.score, r.seconds) for r in category_top_n(category, n)]
+
+    assert view_top("Science", 3) == expected_top("science")[:3]
+    assert view_top("history", 10) == expected_top("history")[:4]  # capped at view_top_k
+
+    mine = [r for r in results if r.player == "Player1"]
+    stats = player_stats("Player1")
+    assert stats.attempts == len(mine)
+    assert stats.average_score == pytest.approx(sum(r.score for r in mine) / len(mine))
+    assert stats.best.score == max(r.score for r in mine)
+    assert player_stats("Nobody") is None
+
+    # Trimming is amortized: a category never holds twice view_top_k rows
+    conn = sqlite3.connect(f"{temp_leaderboard}.views.sqlite")
+    counts = dict(conn.execute("SELECT category, COUNT(*) FROM category_top GROUP BY category"))
+    conn.close()
+    assert all(count < 8 for count in counts.values())
+
+    incremental = (view_top("science", 4), player_stats("Player2"))
+    assert rebuild_views() == 30
+    assert (view_top("science", 4), player_stats("Player2")) == incremental
+
+
+def test_views_left_dirty_are_scanned_then_rebuilt(tmp_path, monkeypatch):
+    """Test that reads scan past dirty or missing views without writing, and the next commit rebuilds them."""
+    from game.segments import SegmentedLeaderboard
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    save_result(Result("Saved", 5.0, 10, 3, 30.0, "test", "2025-11-03T10:00:00Z"))
+    assert player_stats("Saved").attempts == 1
+
+    # Simulate a crash between the append and the view update
+    record = {"player": "Crashed", "score": 9, "total": 10, "streak_max": 9, "seconds": 20.0, "category": "test", "timestamp": "2025-11-03T11:00:00Z"}
+    Path(f"{temp_leaderboard}.views.sqlite.dirty").touch()
+    with open(temp_leaderboard, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+    views = Path(f"{temp_leaderboard}.views.sqlite")
+    dirty = Path(f"{views}.dirty")
+    before = views.stat().st_mtime_ns
+
+    class Unwritable:
+        def __enter__(self):
+            raise PermissionError("read-only folder")
+
+    with monkeypatch.context() as m:
+        m.setattr(SegmentedLeaderboard, "lock", lambda self: Unwritable())
+        assert [r.player for r in category_top_n("test", 10)] == ["Crashed", "Saved"]
+        assert player_stats("Crashed").best.score == 9
+        assert views.stat().st_mtime_ns == before and dirty.exists()
+
+        views.unlink()
+        assert player_stats("Saved").attempts == 1
+        assert not views.exists()
+
+    save_result(Result("Later", 1.0, 10, 1, 30.0, "test", "2025-11-03T12:00:00Z"))
+    assert not dirty.exists()
+    assert [r.player for r in category_top_n("test", 10)] == ["Crashed", "Saved", "Later"]
+
+
+def test_columnar_export_is_incremental(tmp_path, monkeypatch):
+    """Test that exports append only new rows, across rotation and compaction."""
+    np = pytest.importorskip("numpy")
+    from game.columnar import ColumnStore
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard,
+            "segment_max_bytes": 600
+        }
+
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+
+    def save(i):
+        category = "math" if i % 2 else "science"
+        day = "2025-11-03" if i < 10 else "2025-11-04"
+        save_result(Result(f"Player{i % 3}", float(i % 5), 4, 1, float(i), category, f"{day}T10:00:00Z", i % 3))
+
+    for i in range(10):
+        save(i)
+    assert export_columns() == 10
+    assert export_columns() == 0
+
+    for i in range(10, 20):
+        save(i)
+    with open(temp_leaderboard, 'a') as f:
+        f.write('{"player": "Half')  # not yet complete; left for the next export
+    assert len(list((tmp_path / "test_leaderboard.jsonl.segments").glob("live-*.jsonl"))) > 1
+    assert export_columns() == 10
+
+    columns = ColumnStore(tmp_path / "test_leaderboard.jsonl.columns").load()
+    assert columns.rows == 20
+    assert sorted(columns.players) == ["Player0", "Player1", "Player2"]
+    assert sorted(np.asarray(columns.arrays["seconds"]).tolist()) == [float(i) for i in range(20)]
+
+    stats = {s.name: s for s in leaderboard_stats("category")}
+    math = stats["math"]
+    assert math.results == 10
+    assert math.mean_percent == pytest.approx(100 * sum((i % 5) / 4 for i in range(1, 20, 2)) / 10)
+    assert math.median_percent == 50.0
+    assert math.mean_seconds == 10.0
+    assert math.hint_share == pytest.approx(sum(1 for i in range(1, 20, 2) if i % 3) / 10)
+    assert [(s.name, s.results) for s in leaderboard_stats("day")] == [("2025-11-03", 10), ("2025-11-04", 10)]
+
+    # Compaction rewrites every stored result, so the export starts over
+    with open(temp_leaderboard, 'a') as f:
+        f.write('"}\n')
+    compact()
+    assert export_columns() == 20
+    assert ColumnStore(tmp_path / "test_leaderboard.jsonl.columns").load().rows == 20
+
+
+def test_sqlite_backend_matches_jsonl_after_migration(tmp_path, monkeypatch):
+    """Test that migrated SQLite storage answers every query like the JSONL leaderboard."""
+    import threading
+
+    config = {
+        "data_folder": Path("data"),
+        "leaderboard_path": tmp_path / "test_leaderboard.jsonl",
+        "sqlite_path": tmp_path / "test_leaderboard.sqlite",
+        "segment_max_bytes": 600
+    }
+    monkeypatch.setattr("game.leaderboard.load_config", lambda: config)
+    monkeypatch.setattr("game.io_manager.load_config", lambda: config)
+
+    for i in range(30):
+        category = "Math" if i % 3 else "science"
+        save_result(Result(f"Player{i % 4}", float(i % 6), 10, 1, float(i % 7), category, f"2025-11-03T10:00:{i:02d}Z"))
+    compact()
+    save_result(Result("Player0", 6.0, 10, 1, 9.0, "math", "2025-11-03T10:01:00Z"))
+
+    def queries():
+        return (
+            top_n(31), recent_results(5), rank_result(Result("X", 4.0, 10, 0, 3.0, "math", ""), saved=False),
+            category_top_n("MATH", 5), player_stats("Player0")
+        )
+
+    expected = queries()
+    assert migrate_storage("jsonl", "sqlite") == 31
+    with pytest.raises(ValueError):
+        migrate_storage("jsonl", "sqlite")  # the target is no longer empty
+
+    config["storage_backend"] = "sqlite"
+    assert queries() == expected
+
+    # Concurrent saves from several threads all land
+    def save_some(thread):
+        for i in range(10):
+            save_result(Result(f"T{thread}", 1.0, 10, 0, float(i), "math", "2025-11-04T10:00:00Z"))
+
+    threads = [threading.Thread(target=save_some, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert rank_result(Result("X", 0.0, 10, 0, 0.0, "math", ""), saved=True).total == 71
+    assert len(top_n(100)) == 71
+
+
+def test_jsonl_iteration_does_not_block_writers(tmp_path, monkeypatch):
+    """Test that saves made while JSONL results are iterated go through and are not read."""
+    from game.storage import JsonlBackend
+
+    config = {
+        "data_folder": Path("data"),
+        "leaderboard_path": tmp_path / "test_leaderboard.jsonl",
+        "segment_max_bytes": 600
+    }
+    monkeypatch.setattr("game.io_manager.load_config", lambda: config)
+
+    for i in range(10):
+        save_result(Result(f"Player{i}", float(i), 10, 1, 20.0, "math", "2025-11-03T10:00:00Z"))
+    with open(config["leaderboard_path"], 'a') as f:
+        f.write('{"player": "Half')  # not yet complete; not part of the snapshot
+
+    results = JsonlBackend(config).iter_results()
+    seen = [next(results).player]
+    # Saves take the lock and rotate segments mid-iteration
+    with open(config["leaderboard_path"], 'a') as f:
+        f.write('"}\n')
+    for i in range(10):
+        save_result(Result(f"Late{i}", 1.0, 10, 1, 20.0, "math", "2025-11-03T11:00:00Z"))
+    seen.extend(r.player for r in results)
+    assert seen == [f"Player{i}" for i in range(10)]
+
+
+def test_sqlite_backend_exports_and_rejects_jsonl_maintenance(tmp_path, monkeypatch):
+    """Test that exports read the SQLite backend and JSONL-only maintenance is refused."""
+    np = pytest.importorskip("numpy")
+    from game.columnar import ColumnStore
+
+    config = {
+        "data_folder": Path("data"),
+        "leaderboard_path": tmp_path / "test_leaderboard.jsonl",
+        "sqlite_path": tmp_path / "test_leaderboard.sqlite",
+        "storage_backend": "sqlite"
+    }
+    monkeypatch.setattr("game.leaderboard.load_config", lambda: config)
+    monkeypatch.setattr("game.io_manager.load_config", lambda: config)
+
+    for i in range(12):
+        category = "math" if i % 2 else "science"
+        save_result(Result(f"Player{i % 3}", float(i % 5), 4, 1, float(i), category, "2025-11-03T10:00:00Z", i % 2))
+
+    assert export_columns() == 12
+    save_result(Result("Late", 4.0, 4, 4, 1.0, "math", "2025-11-04T10:00:00Z"))
+    assert export_columns() == 13  # rebuilt from every result
+    columns = ColumnStore(tmp_path / "test_leaderboard.jsonl.columns").load()
+    assert sorted(np.asarray(columns.arrays["seconds"]).tolist()) == sorted([float(i) for i in range(12)] + [1.0])
+    assert sorted(columns.players) == ["Late", "Player0", "Player1", "Player2"]
+    assert [(s.name, s.results) for s in leaderboard_stats("category")] == [("math", 7), ("science", 6)]
+
+    for maintenance in (rebuild_index, compact, rebuild_views):
+        with pytest.raises(ValueError, match="not supported with the sqlite backend"):
+            maintenance()
+    assert not (tmp_path / "test_leaderboard.jsonl").exists()
+    assert not (tmp_path / "test_leaderboard.jsonl.views.sqlite").exists()
+
+    # Switching back to JSONL starts the export over from its files
+    config["storage_backend"] = "jsonl"
+    save_result(Result("Jsonl", 1.0, 4, 0, 5.0, "math", "2025-11-05T10:00:00Z"))
+    assert export_columns() == 1
+    assert ColumnStore(tmp_path / "test_leaderboard.jsonl.columns").load().players == ["Jsonl"]
+
+
+def test_sharded_top_n_merges_indexed_and_unindexed_shards(tmp_path, monkeypatch):
+    """Test that the global top N over shards matches a full sort of every result."""
+    from game.result_writer import ResultWriter
+    from game.segments import SegmentedLeaderboard
+    from game.shards import ShardedLeaderboard, shard_paths
+
+    shard_dir = tmp_path / "shards"
+    shard_dir.mkdir()
+    results = [
+        Result(f"P{i}", float((i * 7) % 11), 10, 1, float((i * 13) % 17), "test", "2025-11-03T10:00:00Z")
+        for i in range(60)
+    ]
+
+    # Host A writes through the normal path, so it is indexed, rotated and compacted
+    host_a = SegmentedLeaderboard(shard_dir / "host-a.jsonl", segment_max_bytes=600)
+    ResultWriter(host_a).write_many(results[:20])
+    host_a.compact()
+    ResultWriter(host_a).write_many(results[20:25])
+    # Hosts B and C are plain copies without indexes
+    for name, chunk in (("host-b.jsonl", results[25:45]), ("host-c.jsonl", results[45:])):
+        with open(shard_dir / name, 'w') as f:
+            for result in chunk:
+                f.write(json.dumps(result_to_dict(result)) + '\n')
+            f.write("not json\n")
+
+    assert shard_paths(str(shard_dir)) == [shard_dir / n for n in ("host-a.jsonl", "host-b.jsonl", "host-c.jsonl")]
+    assert shard_paths(str(shard_dir / "host-[bc].jsonl")) == [shard_dir / "host-b.jsonl", shard_dir / "host-c.jsonl"]
+    assert host_a.indexed() and not SegmentedLeaderboard(shard_dir / "host-b.jsonl").indexed()
+
+    expected = [r.player for r in sorted(results, key=lambda r: (-r.score, r.seconds))]
+    for workers in (1, 2):
+        top = ShardedLeaderboard.from_spec(str(shard_dir), max_workers=workers).top(15)
+        assert [r.player for r in top] == expected[:15]
+    assert not (shard_dir / "host-b.jsonl.idx").exists()  # shards are only read
+
+    # A compacted shard without a live file is still found; top_n reads the configured shards
+    host_a.compact()
+    monkeypatch.setattr("game.leaderboard.load_config", lambda: {
+        "data_folder": Path("data"),
+        "leaderboard_path": tmp_path / "unused.jsonl",
+        "leaderboard_shards": str(shard_dir)
+    })
+    assert [r.player for r in top_n(60)] == expected
@@ -0,0 +1,53 @@
+"""Unit tests for the metrics registry and profiling hooks."""
+
+import json
+from engine.question_bank import QuestionBank
+from game.models import Question
+from utils.metrics import MetricsRegistry, instrument, registry
+
+
+def test_registry_collects_only_when_enabled():
+    """Test that a disabled registry records nothing and spans become no-ops."""
+    metrics = MetricsRegistry()
+    metrics.inc("calls")
+    with metrics.span("work") as timer:
+        assert timer is None
+    assert metrics.snapshot() == {"counters": {}, "histograms": {}}
+
+    metrics.enable()
+    metrics.inc("calls", 2)
+    with metrics.span("work") as timer:
+        pass
+    metrics.observe("work", 0.002)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"calls": 2}
+    work = snapshot["histograms"]["work"]
+    assert work["count"] == 2
+    assert work["buckets"]["+Inf"] == 2
+    assert work["buckets"]["0.001"] == 1
+    assert timer.elapsed_ns > 0
+
+    text = metrics.to_prometheus()
+    assert "quiz_calls_total 2" in text
+    assert 'quiz_work_seconds_bucket{le="+Inf"} 2' in text
+    assert "quiz_work_seconds_count 2" in text
+
+
+def test_instrument_exports_metrics_and_profile(tmp_path):
+    """Test that instrument records spans from the code and writes both files."""
+    questions = [Question(f"Q{i}", "test", "easy", "?", ["A", "B"], 0, "") for i in range(20)]
+    bank = QuestionBank(questions)
+    metrics_path = tmp_path / "metrics.json"
+    profile_path = tmp_path / "profile.txt"
+
+    registry.reset()
+    with instrument(metrics_path, profile_path):
+        bank.select(5)
+        bank.select(5, "easy")
+
+    assert registry.enabled is False
+    data = json.loads(metrics_path.read_text())
+    assert data["histograms"]["questions.select"]["count"] == 2
+    assert "cumulative" in profile_path.read_text()
+    registry.reset()
@@ -0,0 +1,218 @@
+"""Unit tests for the quiz session state machine and server."""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+from game.models import Question
+from engine.pacing import Pacing
+from engine.question_bank import QuestionBank
+from engine.session import QuizSession
+from game.server import QuizServer
+
+
+def make_questions(count):
+    """Build simple questions whose correct answer is always choice 1."""
+    return [
+        Question(f"Q{i}", "test", "easy", f"Question {i}?", ["A", "B", "C", "D"], 0, f"Hint {i}")
+        for i in range(count)
+    ]
+
+
+def test_session_scores_and_streaks():
+    """Test that a session tracks score, streak and hints like run_quiz."""
+    questions = make_questions(4)
+    session = QuizSession(questions + [questions[0]], "Tester", hints_enabled=True)
+
+    assert session.total == 5
+    assert session.current_question.id == "Q0"
+
+    assert session.submit_answer(0).correct is True
+    assert session.request_hint() == "Hint 1"
+    assert session.hint_available is False
+    assert session.submit_answer(0).points == 0.5
+    outcome = session.submit_answer(3)
+    assert outcome.correct is False
+    assert outcome.correct_answer == "A"
+    session.submit_answer(0)
+
+    assert session.is_finished
+    result = session.finish()
+    assert result.player == "Tester"
+    assert result.score == 2.5
+    assert result.streak_max == 2
+    assert result.hints_used == 1
+    assert result.total == 5
+
+
+def test_session_rejects_invalid_actions():
+    """Test that out-of-range answers and disabled hints raise errors."""
+    session = QuizSession(make_questions(1))
+
+    with pytest.raises(ValueError):
+        session.submit_answer(4)
+    with pytest.raises(ValueError):
+        session.request_hint()
+
+    session.submit_answer(1)
+    with pytest.raises(RuntimeError):
+        session.submit_answer(0)
+
+
+def test_server_runs_concurrent_sessions(tmp_path, monkeypatch):
+    """Test that the server hosts several clients and saves their results."""
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+
+    server = QuizServer(QuestionBank(make_questions(3)), limit=3, hints_enabled=True)
+
+    async def play(port, name):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{name}\nh\nx\n1\n2\n1\n".encode())
+        await writer.drain()
+        output = (await reader.read()).decode()
+        writer.close()
+        return output
+
+    async def main():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await asyncio.gather(*(play(port, f"P{i}") for i in range(5)))
+
+    outputs = asyncio.run(main())
+
+    for output in outputs:
+        assert "Hint: Hint" in output
+        assert "Invalid input." in output
+        assert "QUIZ COMPLETE!" in output
+        assert "Score: 1.5/3" in output
+        assert "Rank: #1 of " in output  # every player ties for first
+
+    with open(temp_leaderboard) as f:
+        players = sorted(json.loads(line)["player"] for line in f)
+    assert players == [f"P{i}" for i in range(5)]
+
+
+def test_server_flushes_answer_log_off_the_event_loop(tmp_path, monkeypatch):
+    """Test that answers are logged without flushing on the event loop thread."""
+    import threading
+    from game.answer_log import HEADER, RECORD, AnswerLog
+
+    temp_leaderboard = tmp_path / "test_leaderboard.jsonl"
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": temp_leaderboard
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.answer_log.FLUSH_BYTES", 1)  # every answer fills the buffer
+
+    flush_threads = []
+    flush = AnswerLog.flush
+
+    def tracked_flush(self):
+        flush_threads.append(threading.current_thread())
+        return flush(self)
+
+    monkeypatch.setattr(AnswerLog, "flush", tracked_flush)
+    log_path = tmp_path / "answers.bin"
+    server = QuizServer(QuestionBank(make_questions(3)), limit=3, answer_log=AnswerLog(log_path))
+
+    async def play(port, name):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{name}\n1\n2\n1\n".encode())
+        await writer.drain()
+        await reader.read()
+        writer.close()
+
+    async def main():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            await asyncio.gather(*(play(port, f"P{i}") for i in range(3)))
+
+    asyncio.run(main())
+
+    assert flush_threads
+    assert threading.main_thread() not in flush_threads
+    assert (log_path.stat().st_size - HEADER.size) // RECORD.size == 9
+
+
+def test_server_times_out_slow_answers(tmp_path, monkeypatch):
+    """Test that timed pacing misses a question without blocking the server."""
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    server = QuizServer(QuestionBank(make_questions(3)), limit=3, pacing=Pacing("timed", 0.0, 0.5))
+
+    async def main():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"Slow\n1\n")
+            await writer.drain()
+            # Let question 2 time out, then answer question 3 in time
+            await asyncio.sleep(0.75)
+            writer.write(b"1\n")
+            await writer.drain()
+            output = (await reader.read()).decode()
+            writer.close()
+            return output
+
+    output = asyncio.run(main())
+    assert "You have 0.5 seconds per question." in output
+    assert output.count("Time's up!") == 1
+    assert "Score: 2.0/3" in output
+
+
+def test_server_checks_compaction_off_the_event_loop(tmp_path, monkeypatch):
+    """Test that the compaction check, not just the compaction, runs in the executor."""
+    import threading
+    from game.segments import SegmentedLeaderboard
+
+    def mock_load_config():
+        return {
+            "data_folder": Path("data"),
+            "leaderboard_path": tmp_path / "test_leaderboard.jsonl"
+        }
+
+    monkeypatch.setattr("game.io_manager.load_config", mock_load_config)
+    monkeypatch.setattr("game.leaderboard.load_config", mock_load_config)
+    monkeypatch.setattr("game.server.load_config", mock_load_config)
+
+    check_threads = []
+    monkeypatch.setattr(SegmentedLeaderboard, "needs_compaction",
+                        lambda self: check_threads.append(threading.current_thread()) or False)
+    server = QuizServer(QuestionBank(make_questions(1)), limit=1)
+
+    async def main():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"Player\n1\n")
+            await writer.drain()
+            await reader.read()
+            writer.close()
+        await server._compaction
+
+    asyncio.run(main())
+    assert check_threads and threading.main_thread() not in check_threads
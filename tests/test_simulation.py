@@ -0,0 +1,91 @@
+"""Unit tests for headless quiz simulation."""
+
+import pytest
+from game.models import Question
+from engine.session import QuizSession
+from engine.simulation import AnswerPolicy, make_policy, score_sessions, simulate_chunk, run_simulation
+
+np = pytest.importorskip("numpy")
+
+
+def make_questions(count):
+    """Build questions with varying correct answers."""
+    return [
+        Question(f"Q{i}", "test", "easy", f"Question {i}?", ["A", "B", "C", "D"], i % 4, "hint")
+        for i in range(count)
+    ]
+
+
+def reference_session(questions, choices, hints):
+    """Play one session through QuizSession, the scalar reference."""
+    session = QuizSession(questions, hints_enabled=True)
+    for choice, hint_used in zip(choices, hints):
+        if hint_used:
+            session.request_hint()
+        session.submit_answer(int(choice))
+    result = session.finish()
+    return result.score, result.streak_max, result.hints_used
+
+
+def test_score_sessions_matches_quiz_session():
+    """Test that vectorized sessions score exactly like QuizSession."""
+    questions = make_questions(10)
+    policy = make_policy("accuracy", accuracy=0.6, hint_rate=0.3)
+    correct_index = np.tile([q.answer_index for q in questions], (200, 1))
+    chosen, hints = policy.choose_batch(correct_index, np.full_like(correct_index, 4), np.random.default_rng(3))
+
+    scores, streaks, hints_used = score_sessions(chosen, correct_index, hints)
+    for row in range(200):
+        expected = reference_session(questions, chosen[row], hints[row])
+        assert (scores[row], streaks[row], hints_used[row]) == expected
+
+
+def test_policies():
+    """Test the always-correct, random and hint-rate policies."""
+    questions = make_questions(20)
+
+    stats = simulate_chunk(questions, make_policy("correct"), sessions=100, limit=5, seed=1)
+    assert stats.summary()["mean_score"] == 5.0
+    assert stats.perfect_sessions == 100
+
+    stats = simulate_chunk(questions, make_policy("correct", hint_rate=1.0), sessions=100, limit=5, seed=1)
+    assert stats.total_score == 250.0
+    assert stats.hints_used == 500
+
+    stats = simulate_chunk(questions, make_policy("random"), sessions=2000, limit=5, seed=1)
+    assert 0.2 < stats.total_score / stats.questions < 0.3
+
+    stats = simulate_chunk(questions, AnswerPolicy(accuracy=0.0), sessions=100, limit=5, seed=1)
+    assert stats.total_score == 0.0
+
+    with pytest.raises(ValueError):
+        make_policy("psychic")
+
+
+def test_accuracy_policy_single_choice_questions():
+    """Test that a question with one choice is always answered with that choice."""
+    questions = [Question(f"Q{i}", "test", "easy", f"Question {i}?", ["Only"], 0, "hint") for i in range(5)]
+    questions.append(Question("Q5", "test", "easy", "Question 5?", ["A", "B"], 1, "hint"))
+
+    correct_index = np.array([[q.answer_index for q in questions]] * 500)
+    num_choices = np.array([[len(q.choices) for q in questions]] * 500)
+    chosen, _ = AnswerPolicy(accuracy=0.0).choose_batch(correct_index, num_choices, np.random.default_rng(5))
+    assert (chosen[:, :5] == 0).all()
+    assert (chosen[:, 5] == 0).all()  # the only wrong choice
+
+    stats = simulate_chunk(questions[:5], AnswerPolicy(accuracy=0.0), sessions=100, limit=3, seed=1)
+    assert stats.total_score == 300.0
+
+
+def test_run_simulation_merges_chunks():
+    """Test that chunked and pooled runs aggregate every session."""
+    questions = make_questions(30)
+    policy = make_policy("accuracy", accuracy=0.5)
+
+    serial = run_simulation(questions, policy, sessions=1000, limit=10, seed=7, chunk_size=300)
+    pooled = run_simulation(questions, policy, sessions=1000, limit=10, workers=2, seed=7, chunk_size=300)
+
+    assert serial.sessions == 1000
+    assert serial.questions == 10000
+    assert sum(serial.score_counts.values()) == 1000
+    assert pooled.summary() == serial.summary()
@@ -0,0 +1,66 @@
+"""Inter-process file locking utilities."""
+
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock(fd: int) -> None:
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after ~10 seconds; keep waiting
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Context manager holding an exclusive lock on a lock file.
+
+    The lock excludes other processes and other threads that open their own
+    FileLock on the same path. It is not reentrant: do not nest two locks on
+    the same path in one thread.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the lock.
+
+        Args:
+            path: Path of the lock file; created if missing.
+        """
+        self.path = Path(path)
+        self._fd = None
+
+    def __enter__(self):
+        """Block until the lock is acquired."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Release the lock."""
+        try:
+            _unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+        return False
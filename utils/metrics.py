@@ -0,0 +1,260 @@
+"""Lightweight metrics and profiling hooks.
+
+The module-level ``registry`` collects named counters and latency
+histograms. Code under measurement uses::
+
+    with span("questions.load"):
+        ...
+    inc("questions.cache_hits")
+
+Metrics are off by default. While disabled, ``span`` returns a shared no-op
+context manager and ``inc``/``observe`` return immediately, so the calls can
+stay in hot paths. ``instrument`` turns metrics and/or cProfile on for a
+block and writes the results when it ends; the CLI enables it with
+``--metrics PATH`` / ``--profile PATH`` or the ``QUIZ_METRICS`` /
+``QUIZ_PROFILE`` environment variables.
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+from utils.timers import Timer
+
+METRICS_ENV = "QUIZ_METRICS"
+PROFILE_ENV = "QUIZ_PROFILE"
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values (seconds)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            bounds: Ascending upper bounds; a final +Inf bucket is implied.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> Iterator[tuple]:
+        """Yield (upper bound, values at or below it), ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+    def to_dict(self) -> dict:
+        """Return the histogram as a JSON-serializable dictionary."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "buckets": {("+Inf" if b == float("inf") else repr(b)): n for b, n in self.cumulative()},
+        }
+
+
+class _Span:
+    """Times a block and records it in the registry on exit."""
+
+    __slots__ = ("registry", "name", "timer")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+        self.timer = Timer()
+
+    def __enter__(self) -> Timer:
+        return self.timer.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.timer.__exit__(exc_type, exc_val, exc_tb)
+        self.registry.observe(self.name, self.timer.elapsed)
+        return False
+
+
+class _NullSpan:
+    """Shared no-op span returned while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class MetricsRegistry:
+    """Named counters and latency histograms, safe to update from threads."""
+
+    def __init__(self):
+        """Initialize an empty, disabled registry."""
+        self.enabled = False
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        """Turn collection on or off."""
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """Drop all collected values."""
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        """Add ``amount`` to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in a histogram."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def span(self, name: str):
+        """Return a context manager timing its block into histogram ``name``.
+
+        The block receives a Timer (or None while metrics are disabled).
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def snapshot(self) -> dict:
+        """Return all metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "histograms": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+            }
+
+    def to_prometheus(self, prefix: str = "quiz") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        snapshot = self.snapshot()
+        for name, value in snapshot["counters"].items():
+            metric = _metric_name(prefix, name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            for name, histogram in histograms:
+                metric = _metric_name(prefix, name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{le="{le}"}} {count}')
+                lines += [f"{metric}_sum {histogram.sum!r}", f"{metric}_count {histogram.count}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Path) -> None:
+        """Write the metrics to a file.
+
+        Files ending in ``.prom`` or ``.txt`` get the Prometheus text format,
+        anything else JSON.
+        """
+        path = Path(path)
+        if path.suffix in (".prom", ".txt"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=2) + "\n"
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    """Turn a dotted metric name into a valid Prometheus metric name."""
+    return f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+
+registry = MetricsRegistry()
+span = registry.span
+inc = registry.inc
+observe = registry.observe
+
+
+@contextlib.contextmanager
+def profiling(path: Path):
+    """Run the block under cProfile and save the statistics.
+
+    Args:
+        path: Output file. ``.txt`` gets a report sorted by cumulative time;
+            anything else gets binary stats for ``pstats``/snakeviz.
+    """
+    import cProfile
+    import pstats
+
+    path = Path(path)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path.suffix == ".txt":
+            with open(path, "w") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(50)
+        else:
+            profiler.dump_stats(path)
+
+
+@contextlib.contextmanager
+def instrument(metrics_path: Optional[Path] = None, profile_path: Optional[Path] = None):
+    """Enable metrics and/or profiling for a block, writing results at the end.
+
+    Args:
+        metrics_path: Export metrics here when the block ends (None: off).
+        profile_path: Profile the block and save the stats here (None: off).
+    """
+    with contextlib.ExitStack() as stack:
+        if profile_path:
+            stack.enter_context(profiling(profile_path))
+        if metrics_path:
+            registry.enable()
+            stack.callback(registry.export, Path(metrics_path))
+            stack.callback(registry.enable, False)
+        yield
+
+
+def instrument_from_env():
+    """Return ``instrument`` configured from QUIZ_METRICS / QUIZ_PROFILE."""
+    return instrument(os.environ.get(METRICS_ENV) or None, os.environ.get(PROFILE_ENV) or None)
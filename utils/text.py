@@ -1,6 +1,11 @@
 """Text formatting utilities."""
 
+import re
 import textwrap
+import unicodedata
+from typing import Set
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
 
 
 def wrap(s: str, width: int = 80) -> str:
@@ -14,3 +19,41 @@ def wrap(s: str, width: int = 80) -> str:
         The wrapped text as a single string.
     """
     return textwrap.fill(s, width=width)
+
+
+def normalize_text(s: str) -> str:
+    """Normalize text for duplicate detection.
+
+    Applies Unicode compatibility decomposition and drops accents, case-folds,
+    removes punctuation and collapses whitespace, so ``"What's  the café?"``
+    and ``"whats the cafe"`` normalize to the same string.
+
+    Args:
+        s: The string to normalize.
+
+    Returns:
+        The normalized string.
+    """
+    decomposed = unicodedata.normalize("NFKD", s)
+    if not decomposed.isascii():  # ASCII text has no combining marks to drop
+        decomposed = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_PUNCTUATION.sub("", decomposed.casefold()).split())
+
+
+def shingles(s: str, k: int = 4) -> Set[bytes]:
+    """Return the set of UTF-8 byte k-grams of a string.
+
+    Bytes rather than characters, so that a k-gram can be read directly as
+    an integer (see ``engine.dedup.minhash_signatures``); for ASCII text they
+    are the character k-grams.
+
+    Args:
+        s: The (normally already normalized) string.
+        k: Shingle length in bytes (default: 4).
+
+    Returns:
+        Every k-byte substring of the encoded string, padded with spaces to
+        at least k bytes.
+    """
+    data = s.encode().ljust(k)
+    return {data[i:i + k] for i in range(len(data) - k + 1)}
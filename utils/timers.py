@@ -5,22 +5,33 @@ from typing import Optional
 
 
 class Timer:
-    """Context manager for measuring elapsed time."""
+    """Context manager for measuring elapsed time.
+
+    Uses the monotonic ``time.perf_counter_ns`` clock, so measurements are
+    unaffected by system clock changes. ``elapsed`` is in seconds and
+    ``elapsed_ns`` in nanoseconds.
+    """
+
+    __slots__ = ("start_ns", "end_ns", "elapsed_ns")
 
     def __init__(self):
         """Initialize the timer."""
-        self.start_time: Optional[float] = None
-        self.end_time: Optional[float] = None
-        self.elapsed: float = 0.0
+        self.start_ns: Optional[int] = None
+        self.end_ns: Optional[int] = None
+        self.elapsed_ns: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        """Elapsed time in seconds."""
+        return self.elapsed_ns / 1e9
 
     def __enter__(self):
         """Start the timer."""
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Stop the timer."""
-        self.end_time = time.time()
-        if self.start_time:
-            self.elapsed = self.end_time - self.start_time
+        self.end_ns = time.perf_counter_ns()
+        self.elapsed_ns = self.end_ns - self.start_ns
         return False